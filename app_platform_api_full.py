@@ -56,7 +56,7 @@ async def startup_event():
     try:
         # Initialize database
         db_path = os.getenv("DATABASE_PATH", "/app/data/trading_data.duckdb")
-        db_handler = DuckDBHandler(db_path)
+        db_handler = DuckDBHandler(db_path, archive_dir=os.getenv("ARCHIVE_DIR"))
         logger.info(f"✅ Database initialized: {db_path}")
         
         # Initialize backtesting engine
@@ -94,7 +94,7 @@ async def health_check():
     try:
         # Test database connection
         if db_handler:
-            count = db_handler.execute_query("SELECT COUNT(*) as count FROM price_bars").iloc[0]['count']
+            count = db_handler.execute_query("SELECT COUNT(*) as count FROM price_bars").iloc[0]['count'].item()
             return {
                 "status": "healthy",
                 "timestamp": datetime.utcnow().isoformat(),
@@ -117,15 +117,15 @@ async def get_status():
             # Get data statistics
             stats["symbols"] = db_handler.execute_query(
                 "SELECT COUNT(DISTINCT symbol) as count FROM price_bars"
-            ).iloc[0]['count'] if db_handler else 0
+            ).iloc[0]['count'].item() if db_handler else 0
             
             stats["timeframes"] = db_handler.execute_query(
                 "SELECT COUNT(DISTINCT timeframe) as count FROM price_bars"
-            ).iloc[0]['count'] if db_handler else 0
+            ).iloc[0]['count'].item() if db_handler else 0
             
             stats["total_bars"] = db_handler.execute_query(
                 "SELECT COUNT(*) as count FROM price_bars"
-            ).iloc[0]['count'] if db_handler else 0
+            ).iloc[0]['count'].item() if db_handler else 0
         
         return {
             "status": "active",
@@ -185,7 +185,7 @@ async def get_backtest_results():
         
         # Get recent backtest results
         results = db_handler.execute_query("""
-            SELECT strategy_name, symbol, timeframe, 
+            SELECT id, strategy_name, symbol, timeframe, 
                    total_return, win_rate, sharpe_ratio, max_drawdown,
                    created_at
             FROM backtest_results 
@@ -197,7 +197,7 @@ async def get_backtest_results():
             return {"results": [], "message": "No backtest results found"}
         
         return {
-            "results": results.to_dict('records'),
+            "results": results.astype(object).where(results.notna(), None).to_dict('records'),
             "count": len(results),
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -205,6 +205,32 @@ async def get_backtest_results():
         logger.error(f"Failed to get results: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/backtest/results/{result_id}/equity")
+async def get_backtest_equity(result_id: int, points: int = 500):
+    """Get a downsampled equity and drawdown curve for one backtest"""
+    try:
+        if not db_handler:
+            raise HTTPException(status_code=503, detail="Database not ready")
+        if points < 2 or points > 100000:
+            raise HTTPException(status_code=400, detail="points must be between 2 and 100000")
+
+        curve = db_handler.get_equity_curve(result_id, max_points=points)
+
+        return {
+            "result_id": result_id,
+            "timestamps": [ts.isoformat() for ts in curve.index],
+            "curves": {name: curve[name].round(6).tolist() for name in curve.columns},
+            "points": len(curve),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except HTTPException:
+        raise
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to get equity curve: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/strategies/top")
 async def get_top_strategies(limit: int = 10):
     """Get top performing strategies"""
@@ -213,17 +239,17 @@ async def get_top_strategies(limit: int = 10):
             raise HTTPException(status_code=503, detail="Database not ready")
         
         # Get top strategies by Sharpe ratio
-        top_strategies = db_handler.execute_query(f"""
+        top_strategies = db_handler.execute_query("""
             SELECT strategy_name, symbol, timeframe,
                    total_return, win_rate, sharpe_ratio, max_drawdown
             FROM backtest_results 
             WHERE sharpe_ratio > 1.0 AND total_return > 0.05
             ORDER BY sharpe_ratio DESC 
-            LIMIT {limit}
-        """)
+            LIMIT ?
+        """, [int(limit)])
         
         return {
-            "strategies": top_strategies.to_dict('records') if not top_strategies.empty else [],
+            "strategies": top_strategies.astype(object).where(top_strategies.notna(), None).to_dict('records') if not top_strategies.empty else [],
             "count": len(top_strategies),
             "criteria": "Sharpe Ratio > 1.0, Total Return > 5%",
             "timestamp": datetime.utcnow().isoformat()
@@ -1,14 +1,26 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, replace
+import itertools
+import heapq
 import logging
 from datetime import datetime, timedelta
 import json
 from enum import Enum
+from functools import cached_property
 
 from ..data_engine.duckdb_handler import DuckDBHandler
+from ..data_engine.curve_codec import encode_curves
 from ..ta_engine.unified_strategy_engine import UnifiedStrategyEngine, UnifiedStrategyConfig, ConfluenceSignal
+from ..ta_engine.analysis_cache import AnalysisCache, StageCache
+from ..ta_engine.config_fingerprint import fingerprint, apply_overrides, resolve_parameter_path
+from .trade_ledger import TradeLedger, PatternVocabulary, ExitReason
+from .batch_simulator import BATCH_PARAMETERS, prepare_signal_arrays, simulate_batch, exit_price_arrays, resolve_exits
+from .streaming_metrics import StreamingMetrics
+from ..telemetry import stage, timed
+from .monte_carlo import MonteCarloConfig, MonteCarloResult, run_monte_carlo, trade_returns_from_ledger
+from ..optimization.search import SearchConfig, create_search_strategy, data_slice_length
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +62,8 @@ class BacktestConfig:
     take_profit_pct: float = 0.04  # 4% take profit
     trailing_stop: bool = False
     trailing_stop_pct: float = 0.01  # 1% trailing stop
+    intrabar_exits: bool = True  # Check stops/targets against bar high/low instead of the close
+    intrabar_tie_break: str = "stop"  # stop, target or open: which level fills when one bar hits both
     
     # Signal filtering
     min_signal_strength: float = 0.6
@@ -83,7 +97,7 @@ class BacktestResult:
     max_consecutive_losses: int
     
     # Trade details
-    trades: List[Trade]
+    ledger: TradeLedger
     equity_curve: pd.Series
     drawdown_curve: pd.Series
     
@@ -94,21 +108,41 @@ class BacktestResult:
     start_date: datetime
     end_date: datetime
     parameters: Dict[str, Any]
+    
+    @cached_property
+    def trades(self) -> List[Trade]:
+        """Trade objects materialized from the ledger on first access"""
+        return self.ledger.to_trades()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Results cross process boundaries as the ledger alone
+        state = self.__dict__.copy()
+        state.pop('trades', None)
+        return state
 
 class BacktestEngine:
     """Comprehensive backtesting engine with advanced features"""
     
-    def __init__(self, db_handler: DuckDBHandler, config: BacktestConfig = None):
+    def __init__(self, 
+                 db_handler: DuckDBHandler, 
+                 config: BacktestConfig = None,
+                 analysis_cache: Optional[AnalysisCache] = None):
         self.db_handler = db_handler
         self.config = config or BacktestConfig()
+        self.analysis_cache = analysis_cache
         self.logger = logger
         
+        # Drop cached analyses whenever new bars are written through this handler
+        if self.analysis_cache is not None and self.db_handler is not None:
+            self.analysis_cache.attach(self.db_handler)
+        
     def run_backtest(self, 
                     symbol: str, 
                     timeframe: str, 
                     start_date: datetime, 
                     end_date: datetime,
-                    strategy_config: UnifiedStrategyConfig = None) -> BacktestResult:
+                    strategy_config: UnifiedStrategyConfig = None,
+                    store_results: bool = True) -> BacktestResult:
         """Run comprehensive backtest"""
         
         self.logger.info(f"Starting backtest for {symbol} {timeframe} from {start_date} to {end_date}")
@@ -119,22 +153,73 @@ class BacktestEngine:
             raise ValueError(f"No data found for {symbol} {timeframe}")
         
         # Initialize strategy engine
-        strategy_engine = UnifiedStrategyEngine(strategy_config)
+        strategy_config = strategy_config or UnifiedStrategyConfig()
+        strategy_engine = UnifiedStrategyEngine(strategy_config, cache=self.analysis_cache)
         
         # Run strategy analysis
-        analysis_results = strategy_engine.run_comprehensive_analysis(data)
+        analysis_results = strategy_engine.run_comprehensive_analysis(data, symbol, timeframe)
         
         # Generate signals
         signals = self._generate_trading_signals(data, analysis_results)
         
+        result = self._backtest_signals(data, signals, symbol, timeframe, start_date, end_date, strategy_config)
+        
+        # Store results in database
+        if store_results:
+            self._store_backtest_result(result, analysis_results)
+        
+        self.logger.info(f"Backtest completed: {result.total_trades} trades, {result.win_rate:.2%} win rate, {result.total_return:.2%} total return")
+        
+        return result
+    
+    def run_backtest_on_data(self,
+                             data: pd.DataFrame,
+                             symbol: str,
+                             timeframe: str,
+                             strategy_config: UnifiedStrategyConfig = None,
+                             trade_start: Optional[datetime] = None,
+                             stop_loss_pct: Optional[float] = None,
+                             take_profit_pct: Optional[float] = None,
+                             stage_cache: Optional[StageCache] = None) -> BacktestResult:
+        """Backtest preloaded bars without touching the database.
+        
+        Bars before ``trade_start`` only provide history for the analysis.
+        ``stop_loss_pct``/``take_profit_pct`` replace signal levels with levels
+        derived from the entry price, as in optimization.
+        """
+        strategy_config = strategy_config or UnifiedStrategyConfig()
+        strategy_engine = UnifiedStrategyEngine(strategy_config, cache=self.analysis_cache, stage_cache=stage_cache)
+        analysis_results = strategy_engine.run_comprehensive_analysis(data, symbol, timeframe)
+        
+        signals = self._generate_trading_signals(data, analysis_results)
+        if stop_loss_pct is not None or take_profit_pct is not None:
+            signals = self._with_risk_levels(signals, stop_loss_pct, take_profit_pct)
+        
+        trade_data = data if trade_start is None else data[data.index >= trade_start]
+        if trade_data.empty:
+            raise ValueError(f"No bars to trade for {symbol} {timeframe} after {trade_start}")
+        
+        return self._backtest_signals(trade_data, signals, symbol, timeframe,
+                                      trade_data.index[0], trade_data.index[-1], strategy_config)
+    
+    @timed('backtest')
+    def _backtest_signals(self, 
+                          data: pd.DataFrame, 
+                          signals: List[Dict[str, Any]], 
+                          symbol: str, 
+                          timeframe: str, 
+                          start_date: datetime, 
+                          end_date: datetime,
+                          strategy_config: UnifiedStrategyConfig) -> BacktestResult:
+        """Simulate trades for prepared signals and assemble the result"""
         # Execute backtest
-        trades, equity_curve = self._execute_trades(data, signals)
+        ledger, equity_curve = self._execute_trades(data, signals)
         
         # Calculate performance metrics
-        performance_metrics = self._calculate_performance_metrics(trades, equity_curve)
+        performance_metrics = self._calculate_performance_metrics(ledger, equity_curve)
         
         # Create result object
-        result = BacktestResult(
+        return BacktestResult(
             total_trades=performance_metrics['total_trades'],
             winning_trades=performance_metrics['winning_trades'],
             losing_trades=performance_metrics['losing_trades'],
@@ -147,7 +232,7 @@ class BacktestEngine:
             volatility=performance_metrics['volatility'],
             var_95=performance_metrics['var_95'],
             max_consecutive_losses=performance_metrics['max_consecutive_losses'],
-            trades=trades,
+            ledger=ledger,
             equity_curve=equity_curve,
             drawdown_curve=performance_metrics['drawdown_curve'],
             strategy_name="Unified Strategy",
@@ -155,23 +240,25 @@ class BacktestEngine:
             timeframe=timeframe,
             start_date=start_date,
             end_date=end_date,
-            parameters=self.config.__dict__
+            parameters={
+                **asdict(self.config),
+                'strategy_fingerprint': fingerprint(strategy_config).digest
+            }
         )
-        
-        # Store results in database
-        self._store_backtest_result(result, analysis_results)
-        
-        self.logger.info(f"Backtest completed: {result.total_trades} trades, {result.win_rate:.2%} win rate, {result.total_return:.2%} total return")
-        
-        return result
     
-    def _generate_trading_signals(self, data: pd.DataFrame, analysis_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    @timed('signals')
+    def _generate_trading_signals(self, 
+                                  data: pd.DataFrame, 
+                                  analysis_results: Dict[str, Any],
+                                  min_strength: Optional[float] = None) -> List[Dict[str, Any]]:
         """Generate trading signals from analysis results"""
         signals = []
+        if min_strength is None:
+            min_strength = self.config.min_signal_strength
         
         # Process confluence signals
         for confluence_signal in analysis_results['confluence']:
-            if confluence_signal.strength >= self.config.min_signal_strength:
+            if confluence_signal.strength >= min_strength:
                 signal = {
                     'timestamp': confluence_signal.timestamp,
                     'signal_type': SignalType.BULLISH if confluence_signal.signal_type == 'bullish' else SignalType.BEARISH,
@@ -179,6 +266,7 @@ class BacktestEngine:
                     'entry_price': confluence_signal.entry_price,
                     'stop_loss': confluence_signal.stop_loss,
                     'take_profit': confluence_signal.take_profit,
+                    'pattern_type': 'CONFLUENCE',
                     'metadata': {
                         'confluence_signals': confluence_signal.signals,
                         'signal_count': len(confluence_signal.signals)
@@ -189,7 +277,7 @@ class BacktestEngine:
         # Process individual pattern signals
         for pattern_type, patterns in analysis_results['patterns'].items():
             for pattern in patterns:
-                if pattern.confidence >= self.config.min_signal_strength:
+                if pattern.confidence >= min_strength:
                     signal_type = self._classify_signal_type(pattern.pattern_type)
                     signal = {
                         'timestamp': pattern.timestamp,
@@ -198,6 +286,7 @@ class BacktestEngine:
                         'entry_price': pattern.entry_price,
                         'stop_loss': pattern.stop_loss,
                         'take_profit': pattern.take_profit,
+                        'pattern_type': pattern.pattern_type,
                         'metadata': {
                             'pattern_type': pattern.pattern_type,
                             'pattern_category': pattern_type
@@ -208,7 +297,7 @@ class BacktestEngine:
         # Process divergence signals
         for divergence_type, divergences in analysis_results['divergences'].items():
             for divergence in divergences:
-                if divergence.confidence >= self.config.min_signal_strength:
+                if divergence.confidence >= min_strength:
                     signal_type = self._classify_signal_type(divergence.pattern_type)
                     signal = {
                         'timestamp': divergence.timestamp,
@@ -217,6 +306,7 @@ class BacktestEngine:
                         'entry_price': divergence.entry_price,
                         'stop_loss': divergence.stop_loss,
                         'take_profit': divergence.take_profit,
+                        'pattern_type': divergence.pattern_type,
                         'metadata': {
                             'divergence_type': divergence.pattern_type,
                             'divergence_category': divergence_type
@@ -230,124 +320,134 @@ class BacktestEngine:
         self.logger.info(f"Generated {len(signals)} trading signals")
         return signals
     
-    def _execute_trades(self, data: pd.DataFrame, signals: List[Dict[str, Any]]) -> Tuple[List[Trade], pd.Series]:
-        """Execute trades based on signals"""
-        trades = []
-        equity_curve = pd.Series(index=data.index, dtype=float)
-        equity_curve.iloc[0] = self.config.initial_capital
+    def _execute_trades(self, data: pd.DataFrame, signals: List[Dict[str, Any]]) -> Tuple[TradeLedger, pd.Series]:
+        """Execute trades based on signals with a bar-indexed event loop.
+        
+        Exits come from ``resolve_exits`` as a single-combo batch, so the
+        intrabar, tie-break and gap rules are shared with ``simulate_batch``.
+        """
+        prices = exit_price_arrays(data, self.config.intrabar_exits)
+        close = prices['close']
+        
+        # Bucket signals by bar position; only signals on an actual bar can fire
+        signal_arrays = prepare_signal_arrays(data.index, signals)
+        
+        # Array-backed trade state, one slot per potential trade
+        n_slots = len(signal_arrays['bar'])
+        columns = {
+            'entry_idx': np.zeros(n_slots, dtype=np.int64),
+            'exit_idx': np.zeros(n_slots, dtype=np.int64),
+            'entry_price': np.zeros(n_slots),
+            'exit_price': np.zeros(n_slots),
+            'stop_loss': np.zeros(n_slots),
+            'take_profit': np.zeros(n_slots),
+            'side': np.zeros(n_slots, dtype=np.int8),
+            'size': np.zeros(n_slots),
+            'strength': np.zeros(n_slots),
+            'pnl': np.zeros(n_slots),
+            'exit_reason': np.zeros(n_slots, dtype=np.int8),
+            'pattern_code': np.zeros(n_slots, dtype=np.int32)
+        }
+        vocabulary = PatternVocabulary()
+        pnl = columns['pnl']
+        n_trades = 0
         
-        current_capital = self.config.initial_capital
-        open_positions = []
+        if n_slots:
+            max_hold = np.array([max(self.config.max_hold_period, 1)])
+            exit_bars, fills, reasons, exit_stops = (values[0] for values in resolve_exits(
+                prices, signal_arrays, max_hold, None, None, self.config, with_stops=True
+            ))
         
-        for i, (timestamp, row) in enumerate(data.iterrows()):
-            # Update open positions
-            open_positions = self._update_positions(open_positions, row, timestamp)
-            
-            # Check for new signals
-            for signal in signals:
-                if signal['timestamp'] == timestamp and len(open_positions) < self.config.max_positions:
-                    # Calculate position size
-                    position_size = current_capital * self.config.position_size_pct
-                    
-                    # Create trade
-                    trade = Trade(
-                        entry_time=timestamp,
-                        exit_time=None,
-                        entry_price=signal['entry_price'],
-                        exit_price=None,
-                        signal_type=signal['signal_type'],
-                        signal_strength=signal['strength'],
-                        stop_loss=signal['stop_loss'],
-                        take_profit=signal['take_profit'],
-                        position_size=position_size,
-                        metadata=signal['metadata']
-                    )
-                    
-                    open_positions.append(trade)
-                    trades.append(trade)
-            
-            # Update equity curve
-            total_pnl = sum(trade.pnl or 0 for trade in open_positions)
-            equity_curve.iloc[i] = current_capital + total_pnl
-        
-        # Close remaining positions at end
-        for trade in open_positions:
-            trade.exit_time = data.index[-1]
-            trade.exit_price = data['Close'].iloc[-1]
-            trade.pnl = (trade.exit_price - trade.entry_price) * (1 if trade.signal_type == SignalType.BULLISH else -1)
-            trade.pnl_pct = trade.pnl / trade.entry_price
-        
-        return trades, equity_curve
-    
-    def _update_positions(self, open_positions: List[Trade], current_bar: pd.Series, timestamp: datetime) -> List[Trade]:
-        """Update open positions based on current price action"""
-        updated_positions = []
+        current_capital = self.config.initial_capital
+        open_heap = []  # (exit bar, slot) of open positions
         
-        for trade in open_positions:
-            current_price = current_bar['Close']
+        for j, (k, i) in enumerate(zip(signal_arrays['signal_index'], signal_arrays['bar'].tolist())):
             
-            # Check stop loss
-            if trade.signal_type == SignalType.BULLISH:
-                if current_price <= trade.stop_loss:
-                    trade.exit_time = timestamp
-                    trade.exit_price = trade.stop_loss
-                    trade.pnl = (trade.exit_price - trade.entry_price) * trade.position_size
-                    trade.pnl_pct = trade.pnl / (trade.entry_price * trade.position_size)
-                    continue
-                
-                # Check take profit
-                if current_price >= trade.take_profit:
-                    trade.exit_time = timestamp
-                    trade.exit_price = trade.take_profit
-                    trade.pnl = (trade.exit_price - trade.entry_price) * trade.position_size
-                    trade.pnl_pct = trade.pnl / (trade.entry_price * trade.position_size)
-                    continue
-                
-                # Update trailing stop if enabled
-                if self.config.trailing_stop:
-                    new_stop = current_price * (1 - self.config.trailing_stop_pct)
-                    if new_stop > trade.stop_loss:
-                        trade.stop_loss = new_stop
+            # Positions exiting on or before this bar close first
+            while open_heap and open_heap[0][0] <= i:
+                _, slot = heapq.heappop(open_heap)
+                current_capital += pnl[slot]
             
-            elif trade.signal_type == SignalType.BEARISH:
-                if current_price >= trade.stop_loss:
-                    trade.exit_time = timestamp
-                    trade.exit_price = trade.stop_loss
-                    trade.pnl = (trade.entry_price - trade.exit_price) * trade.position_size
-                    trade.pnl_pct = trade.pnl / (trade.entry_price * trade.position_size)
-                    continue
-                
-                # Check take profit
-                if current_price <= trade.take_profit:
-                    trade.exit_time = timestamp
-                    trade.exit_price = trade.take_profit
-                    trade.pnl = (trade.entry_price - trade.exit_price) * trade.position_size
-                    trade.pnl_pct = trade.pnl / (trade.entry_price * trade.position_size)
-                    continue
-                
-                # Update trailing stop if enabled
-                if self.config.trailing_stop:
-                    new_stop = current_price * (1 + self.config.trailing_stop_pct)
-                    if new_stop < trade.stop_loss:
-                        trade.stop_loss = new_stop
+            if len(open_heap) >= self.config.max_positions:
+                continue
             
-            # Check max hold period
-            if trade.exit_time is None:
-                bars_held = len([t for t in open_positions if t.entry_time <= trade.entry_time])
-                if bars_held >= self.config.max_hold_period:
-                    trade.exit_time = timestamp
-                    trade.exit_price = current_price
-                    trade.pnl = (trade.exit_price - trade.entry_price) * (1 if trade.signal_type == SignalType.BULLISH else -1) * trade.position_size
-                    trade.pnl_pct = trade.pnl / (trade.entry_price * trade.position_size)
-                    continue
+            signal = signals[k]
+            direction = int(signal_arrays['side'][j])
+            exit_bar = int(exit_bars[j])
             
-            updated_positions.append(trade)
+            t = n_trades
+            position_size = current_capital * self.config.position_size_pct
+            columns['entry_idx'][t] = i
+            columns['exit_idx'][t] = exit_bar
+            columns['entry_price'][t] = signal['entry_price']
+            columns['exit_price'][t] = fills[j]
+            columns['stop_loss'][t] = exit_stops[j]
+            columns['take_profit'][t] = signal['take_profit']
+            columns['side'][t] = direction
+            columns['size'][t] = position_size
+            columns['strength'][t] = signal['strength']
+            columns['exit_reason'][t] = reasons[j]
+            columns['pattern_code'][t] = vocabulary.intern(signal.get('pattern_type', 'UNKNOWN'))
+            pnl[t] = self._position_pnl(signal['entry_price'], fills[j], direction, position_size)
+            heapq.heappush(open_heap, (exit_bar, t))
+            n_trades += 1
+        
+        columns = {name: values[:n_trades] for name, values in columns.items()}
+        columns['pnl_pct'] = (columns['exit_price'] - columns['entry_price']) * columns['side'] / columns['entry_price']
+        ledger = TradeLedger.from_columns(data.index, vocabulary, **columns)
+        
+        equity_curve = pd.Series(
+            self._build_equity(close, columns['entry_idx'], columns['exit_idx'], columns['entry_price'],
+                               columns['side'], columns['size'], columns['pnl']),
+            index=data.index
+        )
         
-        return updated_positions
+        return ledger, equity_curve
+    
+    def _build_equity(self, 
+                      close: np.ndarray, 
+                      entry_idx: np.ndarray, 
+                      exit_idx: np.ndarray, 
+                      entry_price: np.ndarray,
+                      side: np.ndarray, 
+                      size: np.ndarray, 
+                      pnl: np.ndarray) -> np.ndarray:
+        """Mark-to-market equity from difference arrays over open intervals [entry, exit)"""
+        n_bars = len(close)
+        units = side * size / entry_price
+        
+        # Open positions contribute units * close - side * size while open
+        unit_diff = np.zeros(n_bars + 1)
+        cost_diff = np.zeros(n_bars + 1)
+        np.add.at(unit_diff, entry_idx, units)
+        np.add.at(unit_diff, exit_idx, -units)
+        np.add.at(cost_diff, entry_idx, side * size)
+        np.add.at(cost_diff, exit_idx, -side * size)
+        
+        # Realized PnL lands on the exit bar
+        realized = np.zeros(n_bars)
+        np.add.at(realized, exit_idx, pnl)
+        
+        open_units = np.cumsum(unit_diff[:-1])
+        open_cost = np.cumsum(cost_diff[:-1])
+        return self.config.initial_capital + np.cumsum(realized) + open_units * close - open_cost
+    
+    @staticmethod
+    def _position_pnl(entry_price, exit_price, side, size):
+        """Dollar PnL of positions sized in notional dollars"""
+        return (exit_price - entry_price) * side * size / entry_price
     
-    def _calculate_performance_metrics(self, trades: List[Trade], equity_curve: pd.Series) -> Dict[str, float]:
-        """Calculate comprehensive performance metrics"""
-        if not trades:
+    @staticmethod
+    def _price_array(data: pd.DataFrame, column: str) -> np.ndarray:
+        """Fetch a price column as float array regardless of column case"""
+        for name in data.columns:
+            if name.lower() == column:
+                return data[name].to_numpy(dtype=float)
+        raise KeyError(f"Data has no '{column}' column")
+    
+    def _calculate_performance_metrics(self, ledger: TradeLedger, equity_curve: pd.Series) -> Dict[str, float]:
+        """Calculate comprehensive performance metrics with vectorized reductions over the ledger"""
+        if len(ledger) == 0:
             return {
                 'total_trades': 0,
                 'winning_trades': 0,
@@ -364,64 +464,25 @@ class BacktestEngine:
                 'drawdown_curve': pd.Series(dtype=float)
             }
         
-        # Basic metrics
-        completed_trades = [t for t in trades if t.exit_time is not None]
-        winning_trades = [t for t in completed_trades if t.pnl and t.pnl > 0]
-        losing_trades = [t for t in completed_trades if t.pnl and t.pnl < 0]
-        
-        total_trades = len(completed_trades)
-        win_rate = len(winning_trades) / total_trades if total_trades > 0 else 0
-        
-        # Return metrics
-        returns = [t.pnl_pct for t in completed_trades if t.pnl_pct is not None]
-        avg_return = np.mean(returns) if returns else 0
-        total_return = (equity_curve.iloc[-1] - equity_curve.iloc[0]) / equity_curve.iloc[0]
-        
-        # Risk metrics
-        returns_series = pd.Series(returns)
-        volatility = returns_series.std() if len(returns_series) > 0 else 0
-        
-        # Drawdown calculation
-        peak = equity_curve.expanding().max()
-        drawdown_curve = (equity_curve - peak) / peak
-        max_drawdown = drawdown_curve.min()
-        
-        # Sharpe ratio (assuming 0% risk-free rate)
-        sharpe_ratio = avg_return / volatility if volatility > 0 else 0
-        
-        # Sortino ratio (using downside deviation)
-        downside_returns = returns_series[returns_series < 0]
-        downside_deviation = downside_returns.std() if len(downside_returns) > 0 else 0
-        sortino_ratio = avg_return / downside_deviation if downside_deviation > 0 else 0
-        
-        # Value at Risk (95%)
-        var_95 = np.percentile(returns, 5) if len(returns) > 0 else 0
-        
-        # Consecutive losses
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        for trade in completed_trades:
-            if trade.pnl and trade.pnl < 0:
-                consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-            else:
-                consecutive_losses = 0
+        completed = ledger.completed
+        equity = equity_curve.to_numpy(dtype=float)
         
-        return {
-            'total_trades': total_trades,
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': win_rate,
-            'avg_return': avg_return,
-            'total_return': total_return,
-            'max_drawdown': max_drawdown,
-            'sharpe_ratio': sharpe_ratio,
-            'sortino_ratio': sortino_ratio,
-            'volatility': volatility,
-            'var_95': var_95,
-            'max_consecutive_losses': max_consecutive_losses,
-            'drawdown_curve': drawdown_curve
-        }
+        # Same accumulator as streaming consumers; the quantile stays exact for in-memory ledgers
+        accumulator = StreamingMetrics(exact_quantile_size=len(completed) + 1)
+        accumulator.update_equity_many(equity)
+        accumulator.add_trades(completed['pnl'], completed['pnl_pct'])
+        metrics = accumulator.metrics()
+        
+        # Drawdown curve for reporting
+        peak = np.maximum.accumulate(equity)
+        metrics['drawdown_curve'] = pd.Series((equity - peak) / peak, index=equity_curve.index)
+        return metrics
+    
+    def run_monte_carlo(self, result: BacktestResult, config: MonteCarloConfig = None) -> MonteCarloResult:
+        """Resample a backtest's trade sequence into return and drawdown distributions"""
+        config = config or MonteCarloConfig(initial_capital=self.config.initial_capital)
+        trade_returns = trade_returns_from_ledger(result.ledger, self.config.initial_capital)
+        return run_monte_carlo(trade_returns, config)
     
     def _classify_signal_type(self, pattern_type: str) -> SignalType:
         """Classify pattern type as bullish, bearish, or neutral"""
@@ -440,85 +501,210 @@ class BacktestEngine:
         
         return SignalType.NEUTRAL
     
+    @timed('store')
     def _store_backtest_result(self, result: BacktestResult, analysis_results: Dict[str, Any]):
         """Store backtest result in database"""
         try:
-            backtest_data = {
-                'strategy_name': result.strategy_name,
-                'symbol': result.symbol,
-                'timeframe': result.timeframe,
-                'start_date': result.start_date,
-                'end_date': result.end_date,
-                'total_trades': result.total_trades,
-                'winning_trades': result.winning_trades,
-                'losing_trades': result.losing_trades,
-                'win_rate': result.win_rate,
-                'avg_return': result.avg_return,
-                'total_return': result.total_return,
-                'max_drawdown': result.max_drawdown,
-                'sharpe_ratio': result.sharpe_ratio,
-                'parameters': result.parameters,
-                'equity_curve': result.equity_curve.to_dict()
-            }
-            
-            self.db_handler.store_backtest_result(backtest_data)
+            self.db_handler.store_backtest_result(self._result_row(result))
             self.logger.info("Backtest result stored in database")
             
         except Exception as e:
             self.logger.error(f"Error storing backtest result: {str(e)}")
     
+    @classmethod
+    def _result_row(cls, result: BacktestResult) -> Dict[str, Any]:
+        """backtest_results row for a result, with its encoded equity and drawdown curves"""
+        row = cls._result_record(result)
+        row['equity_blob'] = encode_curves({
+            'equity': result.equity_curve,
+            'drawdown': result.drawdown_curve.reindex(result.equity_curve.index)
+        })
+        return row
+    
+    @staticmethod
+    def _result_record(result: BacktestResult) -> Dict[str, Any]:
+        """backtest_results row for a result"""
+        return {
+            'strategy_name': result.strategy_name,
+            'symbol': result.symbol,
+            'timeframe': result.timeframe,
+            'start_date': result.start_date,
+            'end_date': result.end_date,
+            'total_trades': result.total_trades,
+            'winning_trades': result.winning_trades,
+            'losing_trades': result.losing_trades,
+            'win_rate': result.win_rate,
+            'avg_return': result.avg_return,
+            'total_return': result.total_return,
+            'max_drawdown': result.max_drawdown,
+            'sharpe_ratio': result.sharpe_ratio,
+            'parameters': result.parameters
+        }
+    
+    @staticmethod
+    def _with_risk_levels(signals: List[Dict[str, Any]], 
+                          stop_loss_pct: Optional[float] = None, 
+                          take_profit_pct: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Copies of signals with stop/target levels derived from the entry price"""
+        adjusted = []
+        for signal in signals:
+            signal = dict(signal)
+            side = 1 if signal['signal_type'] == SignalType.BULLISH else -1
+            if stop_loss_pct is not None:
+                signal['stop_loss'] = signal['entry_price'] * (1 - side * stop_loss_pct)
+            if take_profit_pct is not None:
+                signal['take_profit'] = signal['entry_price'] * (1 + side * take_profit_pct)
+            adjusted.append(signal)
+        return adjusted
+    
     def run_optimization(self, 
                         symbol: str, 
                         timeframe: str, 
                         start_date: datetime, 
                         end_date: datetime,
-                        param_ranges: Dict[str, List[Any]]) -> Dict[str, Any]:
-        """Run parameter optimization"""
-        self.logger.info(f"Starting optimization for {symbol} {timeframe}")
-        
-        best_result = None
-        best_params = None
-        best_score = float('-inf')
+                        param_ranges: Dict[str, List[Any]],
+                        search: Optional[SearchConfig] = None,
+                        data: Optional[pd.DataFrame] = None,
+                        stage_cache: Optional[StageCache] = None,
+                        store_results: bool = True) -> Dict[str, Any]:
+        """Run parameter optimization.
+        
+        Bars are loaded once (or taken from ``data``). Strategy parameters are
+        explored by the search strategy in ``search`` (exhaustive grid by
+        default), rerunning the analysis once per distinct config, while
+        risk/exit parameters (BATCH_PARAMETERS) are evaluated for every combo in
+        one batched simulation over the same signals. Full-data results are
+        written in a single bulk insert at the end unless ``store_results`` is off.
+        """
+        search = search or SearchConfig()
+        self.logger.info(f"Starting {search.method} optimization for {symbol} {timeframe}")
+        
+        if data is None:
+            data = self.db_handler.get_bars(symbol, timeframe, start_date, end_date)
+        if data.empty:
+            raise ValueError(f"No data found for {symbol} {timeframe}")
+        prices = exit_price_arrays(data, self.config.intrabar_exits)
         
-        # Generate parameter combinations
+        # Split the grid into analysis parameters and batch-simulated risk parameters
         param_names = list(param_ranges.keys())
-        param_values = list(param_ranges.values())
-        
-        total_combinations = np.prod([len(vals) for vals in param_values])
-        self.logger.info(f"Testing {total_combinations} parameter combinations")
-        
-        for i, param_combo in enumerate(np.array(np.meshgrid(*param_values)).T.reshape(-1, len(param_names))):
-            # Create config with current parameters
-            config_dict = dict(zip(param_names, param_combo))
+        risk_names = [name for name in param_names if name in BATCH_PARAMETERS]
+        strategy_space = {name: param_ranges[name] for name in param_names if name not in BATCH_PARAMETERS}
+        
+        total_combinations = int(np.prod([len(vals) for vals in param_ranges.values()]))
+        self.logger.info(f"Search space has {total_combinations} parameter combinations")
+        
+        risk_grid = list(itertools.product(*(param_ranges[name] for name in risk_names)))
+        risk_columns = {name: np.array([combo[k] for combo in risk_grid]) for k, name in enumerate(risk_names)}
+        
+        # Generate signals once at the loosest strength filter; combos filter further
+        min_strength = (float(risk_columns['min_signal_strength'].min())
+                        if 'min_signal_strength' in risk_columns else self.config.min_signal_strength)
+        
+        base_config = UnifiedStrategyConfig()
+        # Unknown or ambiguous parameter names fail before any analysis runs
+        for name in strategy_space:
+            resolve_parameter_path(base_config, name)
+        seen_fingerprints = set()
+        scores_by_input = {}
+        records = []
+        best = {'score': float('-inf'), 'params': None, 'run': None}
+        
+        # Stage outputs are shared by every combo whose inputs to that stage match
+        stage_cache = stage_cache if stage_cache is not None else StageCache()
+        
+        def objective(strategy_params: Dict[str, Any], fraction: float) -> float:
+            """Best risk-combo score for a strategy config on the leading data fraction"""
+            # Create config with current parameters (dotted paths reach nested sections)
+            strategy_config = apply_overrides(base_config, strategy_params)
+            
+            # Configs that canonicalize to an already tested one reuse its score
+            config_fingerprint = fingerprint(strategy_config)
+            n_rows = data_slice_length(len(data), fraction)
+            memo_key = (config_fingerprint.digest, n_rows)
+            if memo_key in scores_by_input:
+                return scores_by_input[memo_key]
+            seen_fingerprints.add(config_fingerprint.digest)
+            
+            full_data = n_rows == len(data)
+            window = data if full_data else data.iloc[:n_rows]
+            
+            strategy_engine = UnifiedStrategyEngine(
+                strategy_config,
+                cache=self.analysis_cache if full_data else None,
+                stage_cache=stage_cache
+            )
+            analysis_results = strategy_engine.run_comprehensive_analysis(window, symbol, timeframe)
+            signals = self._generate_trading_signals(window, analysis_results, min_strength)
+            
+            window_prices = {name: values[:n_rows] if values is not None else None for name, values in prices.items()}
+            with stage('backtest'):
+                metrics = simulate_batch(window_prices, prepare_signal_arrays(window.index, signals), risk_columns, self.config)
+            
+            # Calculate optimization score (Sharpe ratio * total return)
+            scores = (metrics['sharpe_ratio'] * metrics['total_return']).to_numpy()
+            j = int(np.argmax(scores))
+            score = float(scores[j])
+            scores_by_input[memo_key] = score
+            
+            if not full_data:
+                return score
             
-            # Create strategy config
-            strategy_config = UnifiedStrategyConfig()
-            for key, value in config_dict.items():
-                if hasattr(strategy_config, key):
-                    setattr(strategy_config, key, value)
+            if score > best['score']:
+                risk_params = {name: risk_columns[name][j].item() for name in risk_names}
+                best.update(score=score,
+                            params={**strategy_params, **risk_params},
+                            run=(strategy_config, signals, risk_params))
             
+            for row in metrics.to_dict('records'):
+                risk_params = {name: row.pop(name) for name in risk_names}
+                records.append({
+                    'strategy_name': "Unified Strategy",
+                    'symbol': symbol,
+                    'timeframe': timeframe,
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    **row,
+                    'parameters': {
+                        **asdict(replace(self.config, **risk_params)),
+                        'strategy_fingerprint': config_fingerprint.digest,
+                        'strategy_params': strategy_params
+                    }
+                })
+            
+            if len(records) % (10 * len(metrics)) == 0:
+                self.logger.info(f"Completed {len(records)} combinations")
+            return score
+        
+        search_result = create_search_strategy(search).run(strategy_space, objective)
+        self.logger.info(f"Stage cache usage: {stage_cache.stats()}")
+        
+        # Rebuild the winning combo in full (ledger and equity curve)
+        best_result = None
+        if best['run'] is not None:
+            strategy_config, signals, risk_params = best['run']
+            engine = BacktestEngine(self.db_handler, replace(self.config, **risk_params))
+            signals = [s for s in signals if s['strength'] >= engine.config.min_signal_strength]
+            if 'stop_loss_pct' in risk_params or 'take_profit_pct' in risk_params:
+                signals = self._with_risk_levels(signals, risk_params.get('stop_loss_pct'), risk_params.get('take_profit_pct'))
+            best_result = engine._backtest_signals(data, signals, symbol, timeframe, start_date, end_date, strategy_config)
+        
+        # Single bulk write for every combination evaluated on the full data
+        if records and store_results:
             try:
-                # Run backtest with current parameters
-                result = self.run_backtest(symbol, timeframe, start_date, end_date, strategy_config)
-                
-                # Calculate optimization score (Sharpe ratio * total return)
-                score = result.sharpe_ratio * result.total_return
-                
-                if score > best_score:
-                    best_score = score
-                    best_result = result
-                    best_params = config_dict
-                
-                if (i + 1) % 10 == 0:
-                    self.logger.info(f"Completed {i + 1}/{total_combinations} combinations")
-                    
+                self.db_handler.store_backtest_results(records)
+                self.logger.info(f"Stored {len(records)} optimization results")
             except Exception as e:
-                self.logger.warning(f"Error with parameters {config_dict}: {str(e)}")
-                continue
+                self.logger.error(f"Error storing optimization results: {str(e)}")
         
         return {
-            'best_params': best_params,
+            'best_params': best['params'],
             'best_result': best_result,
-            'best_score': best_score,
-            'total_combinations': total_combinations
-        } 
\ No newline at end of file
+            'best_score': best['score'],
+            'total_combinations': total_combinations,
+            'distinct_configs': len(seen_fingerprints),
+            'evaluated_combinations': len(records),
+            'search_method': search.method,
+            'search_evaluations': search_result.n_evaluations,
+            'stopped_early': search_result.stopped_early,
+            'stage_cache_stats': stage_cache.stats()
+        }
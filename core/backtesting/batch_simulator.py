@@ -0,0 +1,425 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Any, Sequence
+import logging
+
+from .trade_ledger import ExitReason, max_run_length
+
+logger = logging.getLogger(__name__)
+
+# BacktestConfig fields that can vary across combos within one simulation
+BATCH_PARAMETERS = (
+    'stop_loss_pct',
+    'take_profit_pct',
+    'max_hold_period',
+    'min_signal_strength',
+    'position_size_pct',
+    'max_positions'
+)
+
+# Upper bound on elements of the (combos x signals x horizon) exit scan per chunk
+_SCAN_BUDGET = 4_000_000
+# Upper bound on elements of the (combos x bars) equity matrix per chunk
+_EQUITY_BUDGET = 4_000_000
+
+def prepare_signal_arrays(index: pd.Index, signals: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Flatten trading signals into chronologically sorted arrays on bar positions.
+
+    Only bullish/bearish signals whose timestamp is a bar of ``index`` are kept.
+    ``signal_index`` maps each row back to its position in ``signals``.
+    """
+    kinds = [getattr(s['signal_type'], 'value', s['signal_type']) for s in signals]
+    directional = np.array([kind in ('bullish', 'bearish') for kind in kinds], dtype=bool)
+    candidates = np.flatnonzero(directional)
+
+    bars = (index.get_indexer(pd.Index([signals[k]['timestamp'] for k in candidates]))
+            if len(candidates) else np.empty(0, dtype=np.int64))
+    on_bar = bars >= 0
+    candidates, bars = candidates[on_bar], bars[on_bar]
+
+    order = np.argsort(bars, kind='stable')
+    candidates, bars = candidates[order], bars[order]
+
+    return {
+        'signal_index': candidates.astype(np.int64),
+        'bar': bars.astype(np.int64),
+        'side': np.array([1 if kinds[k] == 'bullish' else -1 for k in candidates], dtype=np.int8),
+        'strength': np.array([signals[k]['strength'] for k in candidates], dtype=float),
+        'entry_price': np.array([signals[k]['entry_price'] for k in candidates], dtype=float),
+        'stop_loss': np.array([signals[k]['stop_loss'] for k in candidates], dtype=float),
+        'take_profit': np.array([signals[k]['take_profit'] for k in candidates], dtype=float)
+    }
+
+def _combo_column(combos: Dict[str, Sequence], name: str, default: Any, n_combos: int, dtype) -> np.ndarray:
+    if name in combos:
+        return np.asarray(combos[name], dtype=dtype)
+    return np.full(n_combos, default, dtype=dtype)
+
+def simulate_batch(prices,
+                   signals: Dict[str, np.ndarray],
+                   combos: Dict[str, Sequence],
+                   config: Any) -> pd.DataFrame:
+    """Evaluate many risk/exit parameter combos over the same bars and signals.
+
+    ``combos`` maps names from BATCH_PARAMETERS to equal-length value arrays
+    (one entry per combo); missing names fall back to ``config``. When
+    ``stop_loss_pct``/``take_profit_pct`` are given, levels are derived from the
+    signal entry price, otherwise the signal's own levels are used. Trading
+    rules mirror ``BacktestEngine._execute_trades`` so a single combo
+    reproduces a regular backtest. ``prices`` is a close array or an
+    ``exit_price_arrays`` dict. Returns one metrics row per combo.
+    """
+    prices = _as_exit_prices(prices)
+    close = prices['close']
+    n_combos = len(next(iter(combos.values()))) if combos else 1
+
+    params = {
+        'max_hold_period': np.maximum(_combo_column(combos, 'max_hold_period', config.max_hold_period, n_combos, np.int64), 1),
+        'min_signal_strength': _combo_column(combos, 'min_signal_strength', config.min_signal_strength, n_combos, float),
+        'position_size_pct': _combo_column(combos, 'position_size_pct', config.position_size_pct, n_combos, float),
+        'max_positions': _combo_column(combos, 'max_positions', config.max_positions, n_combos, np.int64)
+    }
+    stop_pct = np.asarray(combos['stop_loss_pct'], dtype=float) if 'stop_loss_pct' in combos else None
+    target_pct = np.asarray(combos['take_profit_pct'], dtype=float) if 'take_profit_pct' in combos else None
+
+    # resolve_exits splits signals to fit the scan budget; combo chunks bound the per-signal scan,
+    # the (combos x signals) trade state and the equity matrix
+    n_signals = len(signals['bar'])
+    horizon = _scan_horizon(params['max_hold_period'], len(close))
+    chunk = max(1, min(_SCAN_BUDGET // horizon,
+                       _SCAN_BUDGET // max(n_signals, 1),
+                       _EQUITY_BUDGET // max(len(close), 1)))
+
+    frames = []
+    for start in range(0, n_combos, chunk):
+        rows = slice(start, min(start + chunk, n_combos))
+        frames.append(_simulate_chunk(
+            prices, signals,
+            {name: values[rows] for name, values in params.items()},
+            stop_pct[rows] if stop_pct is not None else None,
+            target_pct[rows] if target_pct is not None else None,
+            config
+        ))
+
+    metrics = pd.concat(frames, ignore_index=True)
+    grid = pd.DataFrame({name: np.asarray(values) for name, values in combos.items()}, index=metrics.index)
+    return pd.concat([grid, metrics], axis=1)
+
+def exit_price_arrays(data: pd.DataFrame, intrabar: bool = True) -> Dict[str, Optional[np.ndarray]]:
+    """Close/high/low/open arrays used to resolve exits.
+
+    Without intrabar resolution (or without high/low columns) high and low
+    are the close, so stops and targets are checked against closes only.
+    """
+    columns = {name.lower(): name for name in data.columns}
+    close = data[columns['close']].to_numpy(dtype=float)
+    prices = {'close': close, 'high': close, 'low': close, 'open': None}
+
+    if intrabar and 'high' in columns and 'low' in columns:
+        prices['high'] = data[columns['high']].to_numpy(dtype=float)
+        prices['low'] = data[columns['low']].to_numpy(dtype=float)
+        if 'open' in columns:
+            prices['open'] = data[columns['open']].to_numpy(dtype=float)
+    return prices
+
+def _as_exit_prices(prices) -> Dict[str, Optional[np.ndarray]]:
+    if isinstance(prices, dict):
+        return prices
+    close = np.asarray(prices, dtype=float)
+    return {'close': close, 'high': close, 'low': close, 'open': None}
+
+def resolve_exits(prices,
+                  signals: Dict[str, np.ndarray],
+                  max_hold: np.ndarray,
+                  stop_pct: Optional[np.ndarray],
+                  target_pct: Optional[np.ndarray],
+                  config: Any,
+                  with_stops: bool = False):
+    """First-hit exit bar, fill price and reason for every (combo, signal) pair.
+
+    ``prices`` is a close array or an ``exit_price_arrays`` dict. Longs stop
+    out when the low reaches the stop and take profit when the high reaches
+    the target (mirrored for shorts); when both happen in one bar
+    ``config.intrabar_tie_break`` decides. Bars that open through a level
+    fill at the open. With ``with_stops`` the stop in force on the exit bar
+    (after trailing) is returned as a fourth array. Signals are scanned in
+    blocks that keep the (combos x signals x horizon) arrays within
+    ``_SCAN_BUDGET`` elements.
+    """
+    prices = _as_exit_prices(prices)
+    n_signals = len(signals['bar'])
+    horizon = _scan_horizon(max_hold, len(prices['close']))
+    block = max(1, _SCAN_BUDGET // (len(max_hold) * horizon))
+    if n_signals <= block:
+        return _resolve_exit_block(prices, signals, max_hold, stop_pct, target_pct, config, with_stops, horizon)
+
+    parts = [
+        _resolve_exit_block(prices, {name: values[start:start + block] for name, values in signals.items()},
+                            max_hold, stop_pct, target_pct, config, with_stops, horizon)
+        for start in range(0, n_signals, block)
+    ]
+    return tuple(np.concatenate(arrays, axis=1) for arrays in zip(*parts))
+
+def _scan_horizon(max_hold: np.ndarray, n_bars: int) -> int:
+    """Bars scanned after each entry: the longest hold, but never past the end of the data"""
+    return int(max(min(int(np.max(max_hold)), n_bars - 1), 1))
+
+def _resolve_exit_block(prices: Dict[str, Optional[np.ndarray]],
+                        signals: Dict[str, np.ndarray],
+                        max_hold: np.ndarray,
+                        stop_pct: Optional[np.ndarray],
+                        target_pct: Optional[np.ndarray],
+                        config: Any,
+                        with_stops: bool,
+                        H: int):
+    """``resolve_exits`` for one block of signals, scanning ``H`` bars after each entry"""
+    close = prices['close']
+    n_bars = len(close)
+    last_bar = n_bars - 1
+    bars = signals['bar']
+    side = signals['side'].astype(float)
+    entry = signals['entry_price']
+    n_combos = len(max_hold)
+
+    # (signals x horizon) windows of bars after each entry, NaN past the end of data
+    offsets = np.arange(1, H + 1)
+    window_idx = bars[:, None] + offsets[None, :]
+    in_data = window_idx <= last_bar
+    clipped = np.minimum(window_idx, last_bar)
+
+    def window(values: np.ndarray) -> np.ndarray:
+        return np.where(in_data, values[clipped], np.nan)
+
+    is_long = (side > 0)[:, None]
+    high, low = window(prices['high']), window(prices['low'])
+    adverse = np.where(is_long, low, high)[None, :, :]
+    favorable = np.where(is_long, high, low)[None, :, :]
+    bar_open = window(prices['open'])[None, :, :] if prices['open'] is not None else None
+
+    # Per-combo stop/target levels (combos x signals)
+    if stop_pct is not None:
+        stops0 = entry[None, :] * (1 - side[None, :] * stop_pct[:, None])
+    else:
+        stops0 = np.broadcast_to(signals['stop_loss'], (n_combos, len(bars)))
+    if target_pct is not None:
+        targets = entry[None, :] * (1 + side[None, :] * target_pct[:, None])
+    else:
+        targets = np.broadcast_to(signals['take_profit'], (n_combos, len(bars)))
+
+    is_long = is_long[None, :, :]
+    stops = np.broadcast_to(stops0[:, :, None], (n_combos, len(bars), H))
+
+    if config.trailing_stop:
+        # Trail from the best price of the previous bars
+        with np.errstate(invalid='ignore'):
+            long_trail = np.fmax.accumulate(high * (1 - config.trailing_stop_pct), axis=1)
+            short_trail = np.fmin.accumulate(low * (1 + config.trailing_stop_pct), axis=1)
+        trail = np.where(is_long[0], long_trail, short_trail)
+        prior_trail = np.concatenate((np.full((len(bars), 1), np.nan), trail[:, :-1]), axis=1)[None, :, :]
+        stops = np.where(is_long,
+                         np.fmax(stops, prior_trail),
+                         np.fmin(stops, prior_trail))
+
+    # Bars inside each combo's holding horizon
+    horizon_bar = np.minimum(bars[None, :] + max_hold[:, None], last_bar)
+    active = window_idx[None, :, :] <= horizon_bar[:, :, None]
+
+    with np.errstate(invalid='ignore'):
+        stop_hit = np.where(is_long, adverse <= stops, adverse >= stops) & active
+        target_hit = np.where(is_long, favorable >= targets[:, :, None], favorable <= targets[:, :, None]) & active
+    hit = stop_hit | target_hit
+
+    any_hit = hit.any(axis=2)
+    first = hit.argmax(axis=2)[:, :, None]
+
+    def at_first(values: np.ndarray) -> np.ndarray:
+        return np.take_along_axis(np.broadcast_to(values, hit.shape), first, axis=2)[:, :, 0]
+
+    first_level = at_first(stops)
+    first_stop = at_first(stop_hit)
+    first_target = at_first(target_hit)
+    long_rows = np.broadcast_to(side > 0, first_level.shape)
+    opened = at_first(bar_open) if bar_open is not None else None
+
+    # Resolve bars that hit both levels
+    both = first_stop & first_target
+    if config.intrabar_tie_break == 'target':
+        stop_first = first_stop & ~both
+    elif config.intrabar_tie_break == 'open' and opened is not None:
+        with np.errstate(invalid='ignore'):
+            through_stop = np.where(long_rows, opened <= first_level, opened >= first_level)
+            through_target = np.where(long_rows, opened >= targets, opened <= targets)
+            nearer_stop = np.abs(opened - first_level) <= np.abs(opened - targets)
+        stop_first = first_stop & (~both | through_stop | (~through_target & nearer_stop))
+    else:
+        stop_first = first_stop
+
+    # Fill at the level, or at the open when the bar gapped through it
+    stop_fill = first_level
+    target_fill = targets
+    if opened is not None:
+        with np.errstate(invalid='ignore'):
+            stop_fill = np.where(np.where(long_rows, opened < first_level, opened > first_level), opened, first_level)
+            target_fill = np.where(np.where(long_rows, opened > targets, opened < targets), opened, targets)
+
+    exit_bar = np.where(any_hit, bars[None, :] + first[:, :, 0] + 1, horizon_bar)
+    exit_price = np.where(any_hit,
+                          np.where(stop_first, stop_fill, target_fill),
+                          close[horizon_bar])
+
+    timed_out = np.where(horizon_bar == bars[None, :] + max_hold[:, None], ExitReason.MAX_HOLD, ExitReason.END_OF_DATA)
+    exit_reason = np.where(any_hit,
+                           np.where(stop_first, ExitReason.STOP_LOSS, ExitReason.TAKE_PROFIT),
+                           timed_out).astype(np.int8)
+
+    # Signals on the last bar exit immediately at the close
+    at_end = bars[None, :] >= last_bar
+    exit_bar = np.where(at_end, last_bar, exit_bar)
+    exit_price = np.where(at_end, close[last_bar], exit_price)
+    exit_reason = np.where(at_end, ExitReason.END_OF_DATA, exit_reason).astype(np.int8)
+
+    if not with_stops:
+        return exit_bar.astype(np.int64), exit_price, exit_reason
+
+    # Stop on the horizon bar for timed-out trades, the initial stop for entries on the last bar
+    horizon_offset = np.maximum(horizon_bar - bars[None, :] - 1, 0)[:, :, None]
+    horizon_level = np.take_along_axis(np.broadcast_to(stops, hit.shape), horizon_offset, axis=2)[:, :, 0]
+    exit_stop = np.where(at_end, stops0, np.where(any_hit, first_level, horizon_level))
+    return exit_bar.astype(np.int64), exit_price, exit_reason, exit_stop
+
+def _simulate_chunk(prices: Dict[str, Optional[np.ndarray]],
+                    signals: Dict[str, np.ndarray],
+                    params: Dict[str, np.ndarray],
+                    stop_pct: Optional[np.ndarray],
+                    target_pct: Optional[np.ndarray],
+                    config: Any) -> pd.DataFrame:
+    """Simulate one block of combos in lock-step over the signal sequence"""
+    n_combos = len(params['max_hold_period'])
+    n_signals = len(signals['bar'])
+    bars = signals['bar']
+    side = signals['side'].astype(float)
+    entry = signals['entry_price']
+
+    taken = np.zeros((n_combos, n_signals), dtype=bool)
+    sizes = np.zeros((n_combos, n_signals))
+    pnls = np.zeros((n_combos, n_signals))
+
+    if n_signals:
+        exit_bar, exit_price, _ = resolve_exits(prices, signals, params['max_hold_period'], stop_pct, target_pct, config)
+
+        # Capacity and capital bookkeeping, vectorized across combos
+        max_slots = int(params['max_positions'].max())
+        slot_exit = np.full((n_combos, max(max_slots, 1)), -1, dtype=np.int64)
+        slot_pnl = np.zeros((n_combos, max(max_slots, 1)))
+        capital = np.full(n_combos, float(config.initial_capital))
+        strong_enough = signals['strength'][None, :] >= params['min_signal_strength'][:, None]
+
+        for j in range(n_signals):
+            i = bars[j]
+
+            releasing = (slot_exit >= 0) & (slot_exit <= i)
+            if releasing.any():
+                capital += np.where(releasing, slot_pnl, 0.0).sum(axis=1)
+                slot_exit[releasing] = -1
+
+            occupied = slot_exit >= 0
+            can_enter = strong_enough[:, j] & (occupied.sum(axis=1) < params['max_positions'])
+            if not can_enter.any():
+                continue
+
+            rows = np.flatnonzero(can_enter)
+            free_slot = np.argmax(~occupied[rows], axis=1)
+            size = capital[rows] * params['position_size_pct'][rows]
+            pnl = (exit_price[rows, j] - entry[j]) * side[j] * size / entry[j]
+
+            slot_exit[rows, free_slot] = exit_bar[rows, j]
+            slot_pnl[rows, free_slot] = pnl
+            taken[rows, j] = True
+            sizes[rows, j] = size
+            pnls[rows, j] = pnl
+
+        returns = np.where(taken, (exit_price - entry[None, :]) * side[None, :] / entry[None, :], np.nan)
+    else:
+        exit_bar = np.zeros((n_combos, 0), dtype=np.int64)
+        returns = np.full((n_combos, 0), np.nan)
+
+    equity = _equity_matrix(prices['close'], bars, exit_bar, entry, side, sizes, pnls, taken, config.initial_capital)
+    return _batch_metrics(equity, returns, pnls, taken)
+
+def _equity_matrix(close, bars, exit_bar, entry, side, sizes, pnls, taken, initial_capital) -> np.ndarray:
+    """Mark-to-market equity per combo (combos x bars) from difference arrays"""
+    n_combos = taken.shape[0]
+    n_bars = len(close)
+    width = n_bars + 1
+
+    combo_idx, signal_idx = np.nonzero(taken)
+    entry_flat = combo_idx * width + bars[signal_idx]
+    exit_flat = combo_idx * width + exit_bar[combo_idx, signal_idx]
+
+    units = side[signal_idx] * sizes[combo_idx, signal_idx] / entry[signal_idx]
+    cost = side[signal_idx] * sizes[combo_idx, signal_idx]
+
+    unit_diff = np.zeros(n_combos * width)
+    cost_diff = np.zeros(n_combos * width)
+    realized = np.zeros(n_combos * width)
+    np.add.at(unit_diff, entry_flat, units)
+    np.add.at(unit_diff, exit_flat, -units)
+    np.add.at(cost_diff, entry_flat, cost)
+    np.add.at(cost_diff, exit_flat, -cost)
+    np.add.at(realized, exit_flat, pnls[combo_idx, signal_idx])
+
+    open_units = np.cumsum(unit_diff.reshape(n_combos, width), axis=1)[:, :-1]
+    open_cost = np.cumsum(cost_diff.reshape(n_combos, width), axis=1)[:, :-1]
+    realized = np.cumsum(realized.reshape(n_combos, width), axis=1)[:, :-1]
+    return initial_capital + realized + open_units * close[None, :] - open_cost
+
+def _batch_metrics(equity: np.ndarray, returns: np.ndarray, pnls: np.ndarray, taken: np.ndarray) -> pd.DataFrame:
+    """Per-combo performance metrics matching BacktestEngine._calculate_performance_metrics"""
+    total_trades = taken.sum(axis=1)
+    winning = (taken & (pnls > 0)).sum(axis=1)
+    losing = (taken & (pnls < 0)).sum(axis=1)
+    has_trades = total_trades > 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        counts = np.sum(~np.isnan(returns), axis=1)
+        avg_return = np.where(counts > 0, np.nansum(returns, axis=1) / np.maximum(counts, 1), 0.0)
+        deviations = np.where(np.isnan(returns), 0.0, returns - avg_return[:, None])
+        volatility = np.where(counts > 1, np.sqrt((deviations ** 2).sum(axis=1) / np.maximum(counts - 1, 1)), 0.0)
+
+        downside = np.where(returns < 0, returns, np.nan)
+        down_counts = np.sum(~np.isnan(downside), axis=1)
+        down_mean = np.where(down_counts > 0, np.nansum(downside, axis=1) / np.maximum(down_counts, 1), 0.0)
+        down_dev = np.where(np.isnan(downside), 0.0, downside - down_mean[:, None])
+        downside_deviation = np.where(down_counts > 1,
+                                      np.sqrt((down_dev ** 2).sum(axis=1) / np.maximum(down_counts - 1, 1)), 0.0)
+
+        var_95 = np.zeros(len(counts))
+        traded = counts > 0
+        if traded.any():
+            var_95[traded] = np.nanpercentile(returns[traded], 5, axis=1)
+
+        peak = np.maximum.accumulate(equity, axis=1)
+        max_drawdown = ((equity - peak) / peak).min(axis=1)
+        total_return = (equity[:, -1] - equity[:, 0]) / equity[:, 0]
+
+        sharpe = np.where(volatility > 0, avg_return / np.where(volatility > 0, volatility, 1.0), 0.0)
+        sortino = np.where(downside_deviation > 0, avg_return / np.where(downside_deviation > 0, downside_deviation, 1.0), 0.0)
+
+    max_consecutive_losses = np.array([
+        max_run_length(pnls[c][taken[c]] < 0) for c in range(taken.shape[0])
+    ], dtype=np.int64)
+
+    return pd.DataFrame({
+        'total_trades': total_trades,
+        'winning_trades': winning,
+        'losing_trades': losing,
+        'win_rate': np.where(has_trades, winning / np.maximum(total_trades, 1), 0.0),
+        'avg_return': np.where(has_trades, avg_return, 0.0),
+        'total_return': np.where(has_trades, total_return, 0.0),
+        'max_drawdown': np.where(has_trades, max_drawdown, 0.0),
+        'sharpe_ratio': np.where(has_trades, sharpe, 0.0),
+        'sortino_ratio': np.where(has_trades, sortino, 0.0),
+        'volatility': np.where(has_trades, volatility, 0.0),
+        'var_95': np.where(has_trades, var_95, 0.0),
+        'max_consecutive_losses': max_consecutive_losses
+    })
@@ -0,0 +1,145 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
+import logging
+
+from .trade_ledger import TradeLedger
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class MonteCarloConfig:
+    """Configuration for Monte Carlo trade-sequence resampling"""
+    n_paths: int = 10000
+    method: str = "bootstrap"  # bootstrap (with replacement) or shuffle (permutation)
+    seed: Optional[int] = None
+    percentiles: Tuple[float, ...] = (5, 25, 50, 75, 95)
+    max_memory_mb: float = 256.0  # Budget for the per-chunk working arrays
+    band_points: int = 200  # Trade steps kept for equity percentile bands
+    initial_capital: float = 100000.0
+
+@dataclass
+class MonteCarloResult:
+    """Distributions over resampled trade sequences"""
+    n_paths: int
+    n_trades: int
+    method: str
+    equity_bands: pd.DataFrame  # Rows: trade number, columns: percentile
+    final_returns: np.ndarray
+    max_drawdowns: np.ndarray
+    time_to_recovery: np.ndarray  # Longest underwater stretch per path, in trades
+    percentiles: Tuple[float, ...] = field(default_factory=tuple)
+
+    def summary(self) -> Dict[str, Any]:
+        """Percentiles of the per-path statistics plus loss probabilities"""
+        def bands(values: np.ndarray) -> Dict[str, float]:
+            if len(values) == 0:
+                return {f"p{p:g}": 0.0 for p in self.percentiles}
+            return {f"p{p:g}": float(v) for p, v in zip(self.percentiles, np.percentile(values, self.percentiles))}
+
+        return {
+            'n_paths': self.n_paths,
+            'n_trades': self.n_trades,
+            'method': self.method,
+            'final_return': bands(self.final_returns),
+            'max_drawdown': bands(self.max_drawdowns),
+            'time_to_recovery': bands(self.time_to_recovery),
+            'probability_of_loss': float(np.mean(self.final_returns < 0)) if self.n_paths else 0.0,
+            'expected_return': float(np.mean(self.final_returns)) if self.n_paths else 0.0
+        }
+
+def trade_returns_from_ledger(ledger: TradeLedger, initial_capital: float) -> np.ndarray:
+    """Per-trade returns on account equity, realized in exit order"""
+    completed = ledger.completed
+    if len(completed) == 0:
+        return np.zeros(0)
+
+    order = np.argsort(completed['exit_idx'], kind='stable')
+    pnl = completed['pnl'][order]
+    equity_before = initial_capital + np.concatenate(([0.0], np.cumsum(pnl)[:-1]))
+    return pnl / equity_before
+
+def run_monte_carlo(trade_returns: np.ndarray, config: MonteCarloConfig = None) -> MonteCarloResult:
+    """Resample a trade return sequence into many equity paths.
+
+    Paths are generated as (paths x trades) index matrices and evaluated in
+    chunks sized to ``max_memory_mb``; only per-path statistics and the
+    equity at ``band_points`` checkpoints are retained.
+    """
+    config = config or MonteCarloConfig()
+    if config.method not in ('bootstrap', 'shuffle'):
+        raise ValueError(f"Unknown resampling method '{config.method}'")
+
+    returns = np.asarray(trade_returns, dtype=float)
+    returns = returns[~np.isnan(returns)]
+    n_trades = len(returns)
+    n_paths = int(config.n_paths)
+    rng = np.random.default_rng(config.seed)
+
+    if n_trades == 0 or n_paths <= 0:
+        return MonteCarloResult(
+            n_paths=max(n_paths, 0), n_trades=0, method=config.method,
+            equity_bands=pd.DataFrame(columns=list(config.percentiles), dtype=float),
+            final_returns=np.zeros(max(n_paths, 0)),
+            max_drawdowns=np.zeros(max(n_paths, 0)),
+            time_to_recovery=np.zeros(max(n_paths, 0), dtype=np.int64),
+            percentiles=tuple(config.percentiles)
+        )
+
+    # Trade steps kept for the bands (always including the last trade)
+    checkpoints = np.unique(np.linspace(0, n_trades - 1, min(config.band_points, n_trades)).round().astype(np.int64))
+
+    # About five float64/int64 (chunk x trades) arrays are alive at once
+    bytes_per_path = n_trades * 8 * 5
+    chunk = int(max(1, min(n_paths, config.max_memory_mb * 1024 * 1024 // bytes_per_path)))
+
+    log_growth = np.log1p(np.maximum(returns, -1 + 1e-12))
+    final_returns = np.empty(n_paths)
+    max_drawdowns = np.empty(n_paths)
+    time_to_recovery = np.empty(n_paths, dtype=np.int64)
+    band_equity = np.empty((n_paths, len(checkpoints)), dtype=np.float32)
+    steps = np.arange(1, n_trades + 1)
+
+    for start in range(0, n_paths, chunk):
+        stop = min(start + chunk, n_paths)
+        rows = stop - start
+
+        if config.method == 'bootstrap':
+            picks = rng.integers(0, n_trades, size=(rows, n_trades))
+        else:
+            picks = rng.permuted(np.broadcast_to(np.arange(n_trades), (rows, n_trades)), axis=1)
+
+        # Equity relative to initial capital after each trade
+        growth = np.exp(np.cumsum(log_growth[picks], axis=1))
+        del picks
+
+        # Drawdowns against the running peak (initial capital counts as a peak)
+        peak = np.maximum(np.maximum.accumulate(growth, axis=1), 1.0)
+        max_drawdowns[start:stop] = ((growth - peak) / peak).min(axis=1)
+
+        # Longest stretch since the last peak, counting an unrecovered tail
+        at_peak = growth >= peak
+        last_peak = np.maximum.accumulate(np.where(at_peak, steps, 0), axis=1)
+        time_to_recovery[start:stop] = (steps - last_peak).max(axis=1)
+        del peak, at_peak, last_peak
+
+        final_returns[start:stop] = growth[:, -1] - 1.0
+        band_equity[start:stop] = growth[:, checkpoints]
+        del growth
+
+    bands = np.percentile(band_equity, config.percentiles, axis=0).T * config.initial_capital
+    equity_bands = pd.DataFrame(bands, index=pd.Index(checkpoints + 1, name='trade'), columns=list(config.percentiles))
+
+    logger.debug(f"Monte Carlo: {n_paths} {config.method} paths over {n_trades} trades in chunks of {chunk}")
+
+    return MonteCarloResult(
+        n_paths=n_paths,
+        n_trades=n_trades,
+        method=config.method,
+        equity_bands=equity_bands,
+        final_returns=final_returns,
+        max_drawdowns=max_drawdowns,
+        time_to_recovery=time_to_recovery,
+        percentiles=tuple(config.percentiles)
+    )
@@ -0,0 +1,233 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
+import heapq
+import logging
+from datetime import datetime
+
+from ..data_engine.duckdb_handler import DuckDBHandler
+from ..ta_engine.unified_strategy_engine import UnifiedStrategyEngine, UnifiedStrategyConfig
+from ..ta_engine.analysis_cache import AnalysisCache
+from .backtest_engine import BacktestEngine, BacktestConfig
+from .batch_simulator import prepare_signal_arrays, resolve_exits, exit_price_arrays
+from .trade_ledger import TradeLedger, PatternVocabulary
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PortfolioResult:
+    """Results of a shared-capital multi-symbol backtest"""
+    symbols: List[str]
+    timeframe: str
+    ledger: TradeLedger  # Bar positions index into the common time axis
+    trade_symbols: np.ndarray  # Position in ``symbols`` per ledger row
+    equity_curve: pd.Series
+    metrics: Dict[str, Any]
+    per_symbol: pd.DataFrame
+
+class PortfolioBacktester:
+    """Backtests a symbol universe against one capital pool.
+
+    Signals from every symbol are merged onto the union of their timestamps
+    and walked once in time order; ``max_positions`` and position sizing
+    apply to the whole portfolio. Exits are resolved on each symbol's own
+    bars with the same rules as ``BacktestEngine._execute_trades``.
+    """
+
+    def __init__(self,
+                 db_handler: DuckDBHandler,
+                 config: BacktestConfig = None,
+                 analysis_cache: Optional[AnalysisCache] = None):
+        self.db_handler = db_handler
+        self.config = config or BacktestConfig()
+        self.analysis_cache = analysis_cache
+        self.engine = BacktestEngine(db_handler, self.config, analysis_cache)
+        self.logger = logger
+
+    def run(self,
+            symbols: List[str],
+            timeframe: str,
+            start_date: datetime,
+            end_date: datetime,
+            strategy_config: UnifiedStrategyConfig = None) -> PortfolioResult:
+        """Load bars, generate signals per symbol and simulate the portfolio"""
+        strategy_config = strategy_config or UnifiedStrategyConfig()
+        strategy_engine = UnifiedStrategyEngine(strategy_config, cache=self.analysis_cache)
+
+        bars_by_symbol = {}
+        signals_by_symbol = {}
+        loaded = self.db_handler.get_bars_many(symbols, timeframe, start_date, end_date)
+        for symbol in symbols:
+            if symbol not in loaded:
+                self.logger.warning(f"No data found for {symbol} {timeframe}, skipping")
+                continue
+            columns = loaded[symbol]
+            data = pd.DataFrame({name: values for name, values in columns.items() if name != 'timestamp'},
+                                index=pd.DatetimeIndex(columns['timestamp'], name='timestamp'), copy=False)
+            try:
+                analysis_results = strategy_engine.run_comprehensive_analysis(data, symbol, timeframe)
+                signals_by_symbol[symbol] = self.engine._generate_trading_signals(data, analysis_results)
+                bars_by_symbol[symbol] = data
+            except Exception as e:
+                self.logger.warning(f"Error generating signals for {symbol}: {str(e)}")
+
+        return self.run_on_signals(bars_by_symbol, signals_by_symbol, timeframe)
+
+    def run_on_signals(self,
+                       bars_by_symbol: Dict[str, pd.DataFrame],
+                       signals_by_symbol: Dict[str, List[Dict[str, Any]]],
+                       timeframe: str) -> PortfolioResult:
+        """Simulate the portfolio from preloaded bars and precomputed signals"""
+        symbols = [s for s in bars_by_symbol if not bars_by_symbol[s].empty]
+        if not symbols:
+            raise ValueError("No bars to backtest")
+
+        # Common time axis and aligned close matrix (bars x symbols)
+        closes = {s: pd.Series(BacktestEngine._price_array(bars_by_symbol[s], 'close'), index=bars_by_symbol[s].index)
+                  for s in symbols}
+        aligned = pd.concat(closes, axis=1, sort=True)
+        axis = aligned.index
+        close_matrix = aligned.ffill().to_numpy(dtype=float)
+
+        columns, trade_symbols, vocabulary = self._collect_signals(axis, symbols, bars_by_symbol, signals_by_symbol)
+        columns, trade_symbols = self._allocate(columns, trade_symbols)
+
+        columns['pnl_pct'] = (columns['exit_price'] - columns['entry_price']) * columns['side'] / columns['entry_price']
+        ledger = TradeLedger.from_columns(axis, vocabulary, **columns)
+
+        equity_curve = pd.Series(self._build_equity(close_matrix, columns, trade_symbols), index=axis)
+        metrics = self.engine._calculate_performance_metrics(ledger, equity_curve)
+
+        per_symbol = pd.DataFrame({
+            'trades': np.bincount(trade_symbols, minlength=len(symbols)),
+            'pnl': np.bincount(trade_symbols, weights=columns['pnl'], minlength=len(symbols)),
+            'wins': np.bincount(trade_symbols, weights=columns['pnl'] > 0, minlength=len(symbols)).astype(np.int64)
+        }, index=pd.Index(symbols, name='symbol'))
+
+        self.logger.info(f"Portfolio backtest over {len(symbols)} symbols: {len(ledger)} trades, "
+                         f"{metrics['total_return']:.2%} total return")
+
+        return PortfolioResult(
+            symbols=symbols,
+            timeframe=timeframe,
+            ledger=ledger,
+            trade_symbols=trade_symbols,
+            equity_curve=equity_curve,
+            metrics=metrics,
+            per_symbol=per_symbol
+        )
+
+    def _collect_signals(self,
+                         axis: pd.Index,
+                         symbols: List[str],
+                         bars_by_symbol: Dict[str, pd.DataFrame],
+                         signals_by_symbol: Dict[str, List[Dict[str, Any]]]) -> Tuple[Dict[str, np.ndarray], np.ndarray, PatternVocabulary]:
+        """Flatten every symbol's signals, resolving exits on that symbol's own bars"""
+        vocabulary = PatternVocabulary()
+        parts = []
+        max_hold = np.array([max(self.config.max_hold_period, 1)])
+
+        for code, symbol in enumerate(symbols):
+            signals = signals_by_symbol.get(symbol, [])
+            bars = bars_by_symbol[symbol]
+            arrays = prepare_signal_arrays(bars.index, signals)
+            if len(arrays['bar']) == 0:
+                continue
+
+            exit_bar, exit_price, exit_reason = resolve_exits(exit_price_arrays(bars, self.config.intrabar_exits),
+                                                            arrays, max_hold, None, None, self.config)
+
+            # Symbol-local bar positions -> common axis positions
+            to_axis = axis.get_indexer(bars.index)
+            parts.append({
+                'entry_idx': to_axis[arrays['bar']],
+                'exit_idx': to_axis[exit_bar[0]],
+                'entry_price': arrays['entry_price'],
+                'exit_price': exit_price[0],
+                'stop_loss': arrays['stop_loss'],
+                'take_profit': arrays['take_profit'],
+                'side': arrays['side'],
+                'strength': arrays['strength'],
+                'exit_reason': exit_reason[0],
+                'pattern_code': np.array([vocabulary.intern(signals[k].get('pattern_type', 'UNKNOWN'))
+                                          for k in arrays['signal_index']], dtype=np.int32),
+                'symbol': np.full(len(arrays['bar']), code, dtype=np.int32)
+            })
+
+        if not parts:
+            empty = {name: np.zeros(0) for name in ('entry_idx', 'exit_idx', 'entry_price', 'exit_price', 'stop_loss',
+                                                   'take_profit', 'side', 'strength', 'exit_reason', 'pattern_code')}
+            empty['entry_idx'] = empty['entry_idx'].astype(np.int64)
+            empty['exit_idx'] = empty['exit_idx'].astype(np.int64)
+            return empty, np.zeros(0, dtype=np.int32), vocabulary
+
+        merged = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+        # Time order; simultaneous signals compete for capacity by strength
+        order = np.lexsort((-merged['strength'], merged['entry_idx']))
+        merged = {name: values[order] for name, values in merged.items()}
+        return merged, merged.pop('symbol'), vocabulary
+
+    def _allocate(self,
+                  columns: Dict[str, np.ndarray],
+                  trade_symbols: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Single pass over merged signals enforcing capacity against shared capital"""
+        n_signals = len(columns['entry_idx'])
+        taken = np.zeros(n_signals, dtype=bool)
+        size = np.zeros(n_signals)
+        pnl = np.zeros(n_signals)
+
+        entry_idx = columns['entry_idx'].tolist()
+        exit_idx = columns['exit_idx'].tolist()
+        trade_pnl = BacktestEngine._position_pnl(columns['entry_price'], columns['exit_price'],
+                                                 columns['side'].astype(float), 1.0)
+
+        capital = self.config.initial_capital
+        open_heap = []  # (exit position, signal) of open positions
+
+        for k in range(n_signals):
+            i = entry_idx[k]
+
+            # Positions exiting on or before this bar close first
+            while open_heap and open_heap[0][0] <= i:
+                _, j = heapq.heappop(open_heap)
+                capital += pnl[j]
+
+            if len(open_heap) >= self.config.max_positions:
+                continue
+
+            size[k] = capital * self.config.position_size_pct
+            pnl[k] = trade_pnl[k] * size[k]
+            taken[k] = True
+            heapq.heappush(open_heap, (exit_idx[k], k))
+
+        columns = {name: values[taken] for name, values in columns.items()}
+        columns['size'] = size[taken]
+        columns['pnl'] = pnl[taken]
+        return columns, trade_symbols[taken]
+
+    def _build_equity(self,
+                      close_matrix: np.ndarray,
+                      columns: Dict[str, np.ndarray],
+                      trade_symbols: np.ndarray) -> np.ndarray:
+        """Mark-to-market portfolio equity from per-symbol difference arrays"""
+        n_bars, n_symbols = close_matrix.shape
+        side = columns['side'].astype(float)
+        units = side * columns['size'] / columns['entry_price']
+        cost = side * columns['size']
+
+        unit_diff = np.zeros((n_bars + 1, n_symbols))
+        np.add.at(unit_diff, (columns['entry_idx'], trade_symbols), units)
+        np.add.at(unit_diff, (columns['exit_idx'], trade_symbols), -units)
+
+        cost_diff = np.zeros(n_bars + 1)
+        np.add.at(cost_diff, columns['entry_idx'], cost)
+        np.add.at(cost_diff, columns['exit_idx'], -cost)
+
+        realized = np.zeros(n_bars)
+        np.add.at(realized, columns['exit_idx'], columns['pnl'])
+
+        open_units = np.cumsum(unit_diff[:-1], axis=0)
+        market_value = np.where(open_units != 0, open_units * np.nan_to_num(close_matrix), 0.0).sum(axis=1)
+        return self.config.initial_capital + np.cumsum(realized) + market_value - np.cumsum(cost_diff[:-1])
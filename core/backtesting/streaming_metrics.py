@@ -0,0 +1,251 @@
+import numpy as np
+from typing import Dict, List, Optional, Any
+import math
+import logging
+
+from .trade_ledger import max_run_length
+
+logger = logging.getLogger(__name__)
+
+class QuantileSketch:
+    """Single-quantile estimator with constant memory.
+
+    Observations are kept exactly until ``exact_size`` is reached (so small
+    samples match ``np.percentile``); after that the P-square algorithm
+    tracks the quantile with five markers seeded from the buffered sample.
+    """
+
+    def __init__(self, quantile: float = 0.05, exact_size: int = 1024):
+        if not 0.0 < quantile < 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        self.quantile = quantile
+        self.exact_size = max(int(exact_size), 5)
+        self.count = 0
+        self._buffer: Optional[List[float]] = []
+        self._heights: List[float] = []
+        self._positions: List[float] = []
+        self._desired: List[float] = []
+        self._increments = [0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0]
+
+    def update(self, value: float):
+        """Add one observation"""
+        self.count += 1
+        if self._buffer is not None:
+            self._buffer.append(float(value))
+            if len(self._buffer) >= self.exact_size:
+                self._start_markers()
+            return
+        self._update_markers(float(value))
+
+    def update_many(self, values: np.ndarray):
+        """Add a batch of observations"""
+        values = np.asarray(values, dtype=float).tolist()
+        if self._buffer is not None:
+            room = self.exact_size - len(self._buffer)
+            self._buffer.extend(values[:room])
+            self.count += min(room, len(values))
+            values = values[room:]
+            if len(self._buffer) >= self.exact_size:
+                self._start_markers()
+        for value in values:
+            self.update(value)
+
+    def value(self) -> float:
+        """Current quantile estimate (0.0 before any observation)"""
+        if self._buffer is not None:
+            return float(np.percentile(self._buffer, self.quantile * 100)) if self._buffer else 0.0
+        return self._heights[2]
+
+    def _start_markers(self):
+        """Seed the five P-square markers from the buffered sample"""
+        ordered = np.sort(np.array(self._buffer))
+        n = len(ordered)
+        self._desired = [1 + (n - 1) * dn for dn in self._increments]
+        # Rounding can put neighbouring markers on one position for small samples; keep them strictly increasing
+        positions = [int(p) for p in np.round(self._desired)]
+        for i in range(1, 5):
+            positions[i] = max(positions[i], positions[i - 1] + 1)
+        for i in range(4, -1, -1):
+            positions[i] = min(positions[i], n - 4 + i)
+        self._positions = [float(p) for p in positions]
+        self._heights = [float(ordered[int(p) - 1]) for p in self._positions]
+        self._buffer = None
+
+    def _update_markers(self, x: float):
+        q, n, nd = self._heights, self._positions, self._desired
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            nd[i] += self._increments[i]
+
+        # Move the middle markers toward their desired positions
+        for i in range(1, 4):
+            d = nd[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1.0 if d > 0 else -1.0
+                parabolic = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < parabolic < q[i + 1]:
+                    q[i] = parabolic
+                else:
+                    j = i + int(step)
+                    q[i] = q[i] + step * (q[j] - q[i]) / (n[j] - n[i])
+                n[i] += step
+
+class StreamingMetrics:
+    """Online performance metrics over equity observations and closed trades.
+
+    Keeps O(1) state: running peak and worst drawdown of the equity curve,
+    Welford moments of trade returns (all and downside), win/loss counts,
+    the current and longest losing streak, and a quantile sketch for VaR.
+    ``metrics()`` returns the same keys as
+    ``BacktestEngine._calculate_performance_metrics`` (without the curve).
+    """
+
+    def __init__(self, var_quantile: float = 0.05, exact_quantile_size: int = 1024):
+        self.var_sketch = QuantileSketch(var_quantile, exact_quantile_size)
+
+        # Equity curve
+        self.n_equity = 0
+        self.first_equity: Optional[float] = None
+        self.last_equity: Optional[float] = None
+        self.peak = -math.inf
+        self.max_drawdown = 0.0
+
+        # Trades
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.loss_streak = 0
+        self.max_consecutive_losses = 0
+        self._returns = [0, 0.0, 0.0]  # count, mean, M2
+        self._downside = [0, 0.0, 0.0]
+
+    def update_equity(self, value: float):
+        """Add one equity observation"""
+        value = float(value)
+        if self.first_equity is None:
+            self.first_equity = value
+        self.last_equity = value
+        self.n_equity += 1
+        self.peak = max(self.peak, value)
+        self.max_drawdown = min(self.max_drawdown, (value - self.peak) / self.peak)
+
+    def update_equity_many(self, values: np.ndarray):
+        """Add a chunk of equity observations with vectorized peak tracking"""
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return
+        if self.first_equity is None:
+            self.first_equity = float(values[0])
+        self.last_equity = float(values[-1])
+        self.n_equity += len(values)
+
+        peak = np.maximum.accumulate(np.maximum(values, self.peak))
+        self.max_drawdown = min(self.max_drawdown, float(((values - peak) / peak).min()))
+        self.peak = float(peak[-1])
+
+    def add_trade(self, pnl: float, pnl_pct: float):
+        """Record one closed trade (trades arrive in entry order)"""
+        self.add_trades(np.array([pnl], dtype=float), np.array([pnl_pct], dtype=float))
+
+    def add_trades(self, pnl: np.ndarray, pnl_pct: np.ndarray):
+        """Record a chunk of closed trades"""
+        pnl = np.asarray(pnl, dtype=float)
+        returns = np.asarray(pnl_pct, dtype=float)
+        if len(pnl) == 0:
+            return
+
+        losses = pnl < 0
+        self.total_trades += len(pnl)
+        self.winning_trades += int((pnl > 0).sum())
+        self.losing_trades += int(losses.sum())
+
+        # Losing streaks, carrying the open streak across chunks
+        if losses.all():
+            self.loss_streak += len(losses)
+            self.max_consecutive_losses = max(self.max_consecutive_losses, self.loss_streak)
+        else:
+            leading = int(np.argmin(losses))
+            trailing = int(np.argmin(losses[::-1]))
+            self.max_consecutive_losses = max(self.max_consecutive_losses, self.loss_streak + leading,
+                                              max_run_length(losses))
+            self.loss_streak = trailing
+
+        returns = returns[~np.isnan(returns)]
+        self._merge_moments(self._returns, returns)
+        self._merge_moments(self._downside, returns[returns < 0])
+        self.var_sketch.update_many(returns)
+
+    @staticmethod
+    def _merge_moments(state: List[float], values: np.ndarray):
+        """Chan et al. parallel update of (count, mean, M2)"""
+        m = len(values)
+        if m == 0:
+            return
+        n, mean, m2 = state
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        total = n + m
+        delta = chunk_mean - mean
+        state[0] = total
+        state[1] = mean + delta * m / total
+        state[2] = m2 + chunk_m2 + delta * delta * n * m / total
+
+    @staticmethod
+    def _std(state: List[float]) -> float:
+        n, _, m2 = state
+        return math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current metric values"""
+        if self.total_trades == 0:
+            return {
+                'total_trades': 0,
+                'winning_trades': 0,
+                'losing_trades': 0,
+                'win_rate': 0.0,
+                'avg_return': 0.0,
+                'total_return': 0.0,
+                'max_drawdown': 0.0,
+                'sharpe_ratio': 0.0,
+                'sortino_ratio': 0.0,
+                'volatility': 0.0,
+                'var_95': 0.0,
+                'max_consecutive_losses': 0
+            }
+
+        avg_return = self._returns[1] if self._returns[0] else 0.0
+        volatility = self._std(self._returns)
+        downside_deviation = self._std(self._downside)
+        total_return = ((self.last_equity - self.first_equity) / self.first_equity
+                        if self.first_equity else 0.0)
+
+        return {
+            'total_trades': self.total_trades,
+            'winning_trades': self.winning_trades,
+            'losing_trades': self.losing_trades,
+            'win_rate': self.winning_trades / self.total_trades,
+            'avg_return': avg_return,
+            'total_return': total_return,
+            'max_drawdown': self.max_drawdown,
+            'sharpe_ratio': avg_return / volatility if volatility > 0 else 0,
+            'sortino_ratio': avg_return / downside_deviation if downside_deviation > 0 else 0,
+            'volatility': volatility,
+            'var_95': self.var_sketch.value(),
+            'max_consecutive_losses': self.max_consecutive_losses
+        }
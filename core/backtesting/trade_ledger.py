@@ -0,0 +1,149 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Any
+from enum import IntEnum
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ExitReason(IntEnum):
+    OPEN = 0
+    STOP_LOSS = 1
+    TAKE_PROFIT = 2
+    MAX_HOLD = 3
+    END_OF_DATA = 4
+
+# One fixed-width record per trade; bar positions index into the backtest data
+TRADE_DTYPE = np.dtype([
+    ('entry_idx', np.int64),
+    ('exit_idx', np.int64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('stop_loss', np.float64),
+    ('take_profit', np.float64),
+    ('side', np.int8),          # +1 long, -1 short
+    ('size', np.float64),       # Notional dollars at entry
+    ('strength', np.float64),
+    ('pnl', np.float64),
+    ('pnl_pct', np.float64),
+    ('exit_reason', np.int8),
+    ('pattern_code', np.int32)
+])
+
+class PatternVocabulary:
+    """Interns pattern type labels to small integer codes"""
+
+    def __init__(self, labels: Optional[List[str]] = None):
+        self.labels: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for label in labels or []:
+            self.intern(label)
+
+    def intern(self, label: str) -> int:
+        """Return the code for a label, assigning a new one if needed"""
+        code = self._codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self._codes[label] = code
+            self.labels.append(label)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+class TradeLedger:
+    """Columnar trade ledger backed by a NumPy structured array"""
+
+    def __init__(self,
+                 records: np.ndarray,
+                 index: pd.Index,
+                 vocabulary: Optional[PatternVocabulary] = None):
+        self.records = records
+        self.index = index
+        self.vocabulary = vocabulary or PatternVocabulary()
+
+    @classmethod
+    def from_columns(cls,
+                     index: pd.Index,
+                     vocabulary: PatternVocabulary,
+                     **columns: np.ndarray) -> 'TradeLedger':
+        """Build a ledger from equal-length column arrays"""
+        n = len(next(iter(columns.values()))) if columns else 0
+        records = np.zeros(n, dtype=TRADE_DTYPE)
+        for name, values in columns.items():
+            records[name] = values
+        return cls(records, index, vocabulary)
+
+    @classmethod
+    def empty(cls, index: pd.Index) -> 'TradeLedger':
+        return cls(np.zeros(0, dtype=TRADE_DTYPE), index)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.records[field]
+
+    @property
+    def completed(self) -> np.ndarray:
+        """Records of trades that have exited"""
+        return self.records[self.records['exit_reason'] != ExitReason.OPEN]
+
+    @property
+    def nbytes(self) -> int:
+        return self.records.nbytes
+
+    def pattern_types(self) -> np.ndarray:
+        """Pattern label per trade"""
+        labels = np.array(self.vocabulary.labels + [''], dtype=object)
+        return labels[self.records['pattern_code']]
+
+    def to_trades(self) -> List[Any]:
+        """Materialize Trade objects (for API output and reports)"""
+        from .backtest_engine import Trade, SignalType
+
+        trades = []
+        labels = self.vocabulary.labels
+        for record in self.records:
+            is_open = record['exit_reason'] == ExitReason.OPEN
+            trades.append(Trade(
+                entry_time=self.index[record['entry_idx']],
+                exit_time=None if is_open else self.index[record['exit_idx']],
+                entry_price=float(record['entry_price']),
+                exit_price=None if is_open else float(record['exit_price']),
+                signal_type=SignalType.BULLISH if record['side'] > 0 else SignalType.BEARISH,
+                signal_strength=float(record['strength']),
+                stop_loss=float(record['stop_loss']),
+                take_profit=float(record['take_profit']),
+                position_size=float(record['size']),
+                pnl=None if is_open else float(record['pnl']),
+                pnl_pct=None if is_open else float(record['pnl_pct']),
+                metadata={
+                    'pattern_type': labels[record['pattern_code']] if record['pattern_code'] < len(labels) else None,
+                    'exit_reason': ExitReason(int(record['exit_reason'])).name.lower()
+                }
+            ))
+        return trades
+
+    def to_frame(self) -> pd.DataFrame:
+        """Ledger as a DataFrame with timestamps and labels resolved"""
+        frame = pd.DataFrame(self.records)
+        if len(frame):
+            frame['entry_time'] = self.index[frame['entry_idx'].to_numpy()]
+            frame['exit_time'] = self.index[frame['exit_idx'].to_numpy()]
+        else:
+            frame['entry_time'] = pd.Series(dtype=object)
+            frame['exit_time'] = pd.Series(dtype=object)
+        frame['pattern_type'] = self.pattern_types()
+        frame['exit_reason'] = [ExitReason(int(code)).name.lower() for code in self.records['exit_reason']]
+        return frame
+
+def max_run_length(mask: np.ndarray) -> int:
+    """Length of the longest run of True values"""
+    if len(mask) == 0 or not mask.any():
+        return 0
+    padded = np.concatenate(([False], mask.astype(bool), [False])).astype(np.int8)
+    edges = np.diff(padded)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return int((ends - starts).max())
@@ -0,0 +1,138 @@
+import duckdb
+import asyncio
+import itertools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Dict, List, Any, Callable
+import logging
+
+logger = logging.getLogger(__name__)
+
+class _CursorSlot:
+    """Holds one thread's cursor in its thread-local storage"""
+
+    def __init__(self, cursor: duckdb.DuckDBPyConnection):
+        self.cursor = cursor
+
+def _release_cursor(cursors: Dict[int, duckdb.DuckDBPyConnection], lock: threading.Lock, slot_id: int):
+    """Close and forget the cursor of a thread that has exited"""
+    with lock:
+        cursor = cursors.pop(slot_id, None)
+    if cursor is not None:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+class ConnectionManager:
+    """One DuckDB database instance shared by many threads.
+
+    A DuckDB connection must not be used by two threads at once, so every
+    thread other than the creator gets its own cursor (a connection to the
+    same database instance, sharing its cache and catalog). Writers are
+    serialized by one lock so concurrent writes never hit transaction
+    conflicts; readers run concurrently. A thread's cursor is closed when
+    the thread exits.
+    """
+
+    def __init__(self, db_path: str, read_only: bool = False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.logger = logger
+        self.root = duckdb.connect(db_path, read_only=read_only)
+        self._owner = threading.get_ident()
+        self._local = threading.local()
+        self._cursors: Dict[int, duckdb.DuckDBPyConnection] = {}
+        self._cursors_lock = threading.Lock()
+        self._slot_ids = itertools.count()
+        self._write_lock = threading.RLock()
+        self._closed = False
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """Connection for the calling thread"""
+        if self._closed:
+            raise duckdb.ConnectionException("Connection already closed")
+        if threading.get_ident() == self._owner:
+            return self.root
+        slot = getattr(self._local, 'slot', None)
+        if slot is None:
+            slot = _CursorSlot(self.root.cursor())
+            slot_id = next(self._slot_ids)
+            with self._cursors_lock:
+                self._cursors[slot_id] = slot.cursor
+            # Thread-locals are dropped when the thread exits, which closes its cursor
+            weakref.finalize(slot, _release_cursor, self._cursors, self._cursors_lock, slot_id)
+            self._local.slot = slot
+            self.logger.debug(f"Opened DuckDB cursor for thread {threading.current_thread().name}")
+        return slot.cursor
+
+    @contextmanager
+    def writer(self):
+        """Hold the write lock and yield the calling thread's cursor"""
+        with self._write_lock:
+            yield self.cursor()
+
+    @property
+    def open_cursors(self) -> int:
+        with self._cursors_lock:
+            return len(self._cursors)
+
+    def close(self):
+        """Close every cursor, then the database instance"""
+        if self._closed:
+            return
+        self._closed = True
+        with self._cursors_lock:
+            cursors = list(self._cursors.values())
+            self._cursors.clear()
+        for cursor in cursors:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self.root.close()
+
+class AsyncDuckDBHandler:
+    """Async facade over a DuckDBHandler.
+
+    Reads run on a bounded thread pool, each thread holding its own cursor,
+    so up to ``max_readers`` queries proceed in parallel. Writes go through
+    a single-thread queue and complete in submission order.
+    """
+
+    def __init__(self, handler: Any, max_readers: int = 4):
+        self.handler = handler
+        self.logger = logger
+        self._readers = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix='duckdb-reader')
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='duckdb-writer')
+
+    async def read(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a read-only handler call on the reader pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._readers, partial(func, *args, **kwargs))
+
+    async def write(self, func: Callable, *args, **kwargs) -> Any:
+        """Queue a handler call on the serialized writer"""
+        return await asyncio.get_running_loop().run_in_executor(self._writer, partial(func, *args, **kwargs))
+
+    async def get_bars(self, *args, **kwargs):
+        return await self.read(self.handler.get_bars, *args, **kwargs)
+
+    async def get_available_symbols(self) -> List[str]:
+        return await self.read(self.handler.get_available_symbols)
+
+    async def get_available_timeframes(self, symbol: str) -> List[str]:
+        return await self.read(self.handler.get_available_timeframes, symbol)
+
+    async def store_bars(self, *args, **kwargs):
+        return await self.write(self.handler.store_bars, *args, **kwargs)
+
+    async def store_pattern_match(self, pattern_match: Dict[str, Any]):
+        return await self.write(self.handler.store_pattern_match, pattern_match)
+
+    def close(self):
+        """Finish queued writes and stop the pools"""
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
@@ -0,0 +1,122 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Any
+import json
+import struct
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Blob layout: MAGIC | uint32 header length | JSON header | sections
+MAGIC = b"EQC1"
+OVERVIEW_POINTS = 512
+
+def encode_curves(curves: Dict[str, pd.Series], overview_points: int = OVERVIEW_POINTS) -> bytes:
+    """Pack same-indexed curves into a compact binary blob.
+
+    Values are stored as byte-shuffled, zlib-compressed float32. A regular
+    DatetimeIndex is kept as start + step; an irregular one as compressed
+    int64 deltas. Each curve also carries an uncompressed ``overview_points``
+    sample so downsampled reads never touch the full payload.
+    """
+    if not curves:
+        raise ValueError("No curves to encode")
+    names = list(curves)
+    index = curves[names[0]].index
+    n = len(index)
+
+    sections = {}
+    header: Dict[str, Any] = {'version': 1, 'n': n, 'channels': names, 'start': None, 'step': None,
+                              'tz': str(index.tz) if getattr(index, 'tz', None) is not None else None}
+
+    if n:
+        stamps = pd.DatetimeIndex(index).as_unit('ns').asi8
+        header['start'] = int(stamps[0])
+        deltas = np.diff(stamps)
+        if n > 1 and (deltas == deltas[0]).all():
+            header['step'] = int(deltas[0])
+        elif n > 1:
+            sections['index'] = zlib.compress(deltas.astype('<i8').tobytes())
+        else:
+            header['step'] = 0
+
+    positions = np.unique(np.linspace(0, n - 1, min(overview_points, n)).round().astype(np.int64)) if n else np.zeros(0, dtype=np.int64)
+    sections['overview_index'] = positions.astype('<i4').tobytes()
+
+    for name in names:
+        values = curves[name].reindex(index).to_numpy(dtype='<f4')
+        sections[name] = zlib.compress(_shuffle(values))
+        sections[f"{name}_overview"] = values[positions].tobytes()
+
+    offset = 0
+    layout = {}
+    for key, payload in sections.items():
+        layout[key] = [offset, len(payload)]
+        offset += len(payload)
+    header['sections'] = layout
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    return MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes + b''.join(sections.values())
+
+def decode_curves(blob: bytes, max_points: Optional[int] = None) -> pd.DataFrame:
+    """Curves from ``encode_curves`` as a DataFrame (one column per curve).
+
+    With ``max_points`` at or below the stored overview size only the
+    overview sample is read; larger requests decode and stride the full data.
+    """
+    header, body = _read_header(blob)
+    n = header['n']
+    names = header['channels']
+
+    if max_points is not None and n > max_points:
+        overview = np.frombuffer(_section(header, body, 'overview_index'), dtype='<i4').astype(np.int64)
+        if max_points <= len(overview):
+            keep = np.unique(np.linspace(0, len(overview) - 1, max_points).round().astype(np.int64))
+            positions = overview[keep]
+            columns = {name: np.frombuffer(_section(header, body, f"{name}_overview"), dtype='<f4')[keep].astype(float)
+                       for name in names}
+            return pd.DataFrame(columns, index=_index_at(header, body, positions))
+
+    columns = {name: _unshuffle(zlib.decompress(_section(header, body, name))) for name in names}
+    positions = np.arange(n)
+    if max_points is not None and n > max_points:
+        positions = np.unique(np.linspace(0, n - 1, max_points).round().astype(np.int64))
+        columns = {name: values[positions] for name, values in columns.items()}
+    return pd.DataFrame(columns, index=_index_at(header, body, positions))
+
+def is_curve_blob(blob: Any) -> bool:
+    """True for blobs written by ``encode_curves``"""
+    return isinstance(blob, (bytes, bytearray, memoryview)) and bytes(blob[:4]) == MAGIC
+
+def _read_header(blob: bytes):
+    blob = bytes(blob)
+    if blob[:4] != MAGIC:
+        raise ValueError("Not an encoded curve blob")
+    (header_len,) = struct.unpack('<I', blob[4:8])
+    header = json.loads(blob[8:8 + header_len].decode('utf-8'))
+    return header, memoryview(blob)[8 + header_len:]
+
+def _section(header: Dict[str, Any], body: memoryview, key: str) -> bytes:
+    offset, length = header['sections'][key]
+    return body[offset:offset + length]
+
+def _index_at(header: Dict[str, Any], body: memoryview, positions: np.ndarray) -> pd.DatetimeIndex:
+    """Timestamps at the given positions"""
+    if header['n'] == 0:
+        return pd.DatetimeIndex([], dtype='datetime64[ns]')
+    if header['step'] is not None:
+        stamps = header['start'] + positions * header['step']
+    else:
+        deltas = np.frombuffer(zlib.decompress(_section(header, body, 'index')), dtype='<i8')
+        stamps = (header['start'] + np.concatenate(([0], np.cumsum(deltas))))[positions]
+    index = pd.DatetimeIndex(stamps.astype('datetime64[ns]'))
+    return index.tz_localize('UTC').tz_convert(header['tz']) if header.get('tz') else index
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """Group bytes by significance so float32 sequences compress well"""
+    return values.view(np.uint8).reshape(-1, 4).T.tobytes()
+
+def _unshuffle(payload: bytes) -> np.ndarray:
+    planes = np.frombuffer(payload, dtype=np.uint8).reshape(4, -1)
+    return np.ascontiguousarray(planes.T).view('<f4').reshape(-1).astype(float)
@@ -1,34 +1,100 @@
 import duckdb
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict, Any, List, Iterator
+from typing import Optional, Dict, Any, List, Iterator, Iterable, Callable, Tuple
 import logging
 from pathlib import Path
 from datetime import datetime, timezone
+from functools import wraps
 import json
+import os
+import shutil
+import uuid
+
+from .curve_codec import decode_curves
+from .connection_pool import ConnectionManager, AsyncDuckDBHandler
+from ..telemetry import stage, record_load
 
 logger = logging.getLogger(__name__)
 
+PRICE_BARS_SCHEMA = """
+    timestamp TIMESTAMP NOT NULL,
+    symbol VARCHAR(10) NOT NULL,
+    timeframe VARCHAR(5) NOT NULL,
+    open DOUBLE NOT NULL,
+    high DOUBLE NOT NULL,
+    low DOUBLE NOT NULL,
+    close DOUBLE NOT NULL,
+    volume BIGINT NOT NULL,
+    PRIMARY KEY (timestamp, symbol, timeframe)
+"""
+
+PRICE_BARS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_price_bars_symbol_timeframe ON price_bars(symbol, timeframe)",
+    "CREATE INDEX IF NOT EXISTS idx_price_bars_timestamp ON price_bars(timestamp)"
+]
+
+# Hot table plus the Parquet archive, for reads that may reach archived months
+ARCHIVE_VIEW = 'price_bars_all'
+
+def _serialized(func):
+    """Run a write method under the connection manager's writer lock"""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._pool.writer():
+            return func(self, *args, **kwargs)
+    return wrapper
+
+def _utc(value: datetime) -> pd.Timestamp:
+    """Naive UTC timestamp, the way bars are stored"""
+    value = pd.Timestamp(value)
+    return value.tz_convert('UTC').tz_localize(None) if value.tzinfo is not None else value
+
 class DuckDBHandler:
     """High-performance database handler using DuckDB for trading data"""
     
-    def __init__(self, db_path: str = "trading_data.duckdb"):
+    def __init__(self, db_path: str = "trading_data.duckdb", read_only: bool = False, threads: int = 4,
+                 archive_dir: Optional[str] = None):
         self.db_path = db_path
+        self.read_only = read_only
+        self.threads = threads
+        self.archive_dir = Path(archive_dir).resolve() if archive_dir else None
         self.logger = logger
-        self.conn = None
+        self._pool: Optional[ConnectionManager] = None
+        self._async: Optional[AsyncDuckDBHandler] = None
+        self._write_listeners: List[Callable[[str, str], Any]] = []
+        self.bars_source = 'price_bars'
         self._verify_db_file()
         self.connect()
-        self._ensure_tables_exist()
+        if not read_only:
+            self._ensure_tables_exist()
+            self._refresh_archive_view()
         
     def connect(self):
         """Establish connection to DuckDB database"""
         self.logger.debug(f"Establishing DuckDB connection to {self.db_path}")
-        self.conn = duckdb.connect(self.db_path)
+        self._pool = ConnectionManager(self.db_path, read_only=self.read_only)
         # Enable parallel processing
         self.conn.execute("SET enable_progress_bar=true")
-        self.conn.execute("SET threads=4")
+        self.conn.execute(f"SET threads={int(self.threads)}")
+        # Read through the archive view once one exists
+        has_view = self.conn.execute(
+            "SELECT COUNT(*) FROM duckdb_views() WHERE view_name = ? AND NOT internal", [ARCHIVE_VIEW]
+        ).fetchone()[0]
+        self.bars_source = ARCHIVE_VIEW if has_view else 'price_bars'
         self.logger.debug("DuckDB connection established")
 
+    @property
+    def conn(self) -> Optional[duckdb.DuckDBPyConnection]:
+        """Connection for the calling thread (a cursor on the shared database)"""
+        return self._pool.cursor() if self._pool is not None else None
+
+    def async_api(self, max_readers: int = 4) -> AsyncDuckDBHandler:
+        """Shared async wrapper: pooled readers and one serialized writer"""
+        if self._async is None:
+            self._async = AsyncDuckDBHandler(self, max_readers=max_readers)
+        return self._async
+
     def _verify_db_file(self):
         """Check if database file exists and is accessible"""
         if self.db_path == ':memory:':
@@ -47,19 +113,7 @@ class DuckDBHandler:
         """Create tables if they don't exist"""
         try:
             # Create price bars table with optimized schema
-            self.conn.execute("""
-                CREATE TABLE IF NOT EXISTS price_bars (
-                    timestamp TIMESTAMP NOT NULL,
-                    symbol VARCHAR(10) NOT NULL,
-                    timeframe VARCHAR(5) NOT NULL,
-                    open DOUBLE NOT NULL,
-                    high DOUBLE NOT NULL,
-                    low DOUBLE NOT NULL,
-                    close DOUBLE NOT NULL,
-                    volume BIGINT NOT NULL,
-                    PRIMARY KEY (timestamp, symbol, timeframe)
-                )
-            """)
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS price_bars ({PRICE_BARS_SCHEMA})")
             
             # Create indicators table for computed technical indicators
             self.conn.execute("""
@@ -90,10 +144,11 @@ class DuckDBHandler:
                 )
             """)
             
-            # Create backtest results table
+            # Create backtest results table (ids come from a sequence)
+            self.conn.execute("CREATE SEQUENCE IF NOT EXISTS backtest_results_id_seq")
             self.conn.execute("""
                 CREATE TABLE IF NOT EXISTS backtest_results (
-                    id BIGINT PRIMARY KEY,
+                    id BIGINT PRIMARY KEY DEFAULT nextval('backtest_results_id_seq'),
                     strategy_name VARCHAR(100) NOT NULL,
                     symbol VARCHAR(10) NOT NULL,
                     timeframe VARCHAR(5) NOT NULL,
@@ -109,13 +164,16 @@ class DuckDBHandler:
                     sharpe_ratio DOUBLE,
                     parameters JSON,
                     equity_curve JSON,
+                    equity_blob BLOB,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            # Databases created before binary curve storage
+            self.conn.execute("ALTER TABLE backtest_results ADD COLUMN IF NOT EXISTS equity_blob BLOB")
             
             # Create indices for faster querying
-            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_price_bars_symbol_timeframe ON price_bars(symbol, timeframe)")
-            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_price_bars_timestamp ON price_bars(timestamp)")
+            for statement in PRICE_BARS_INDEXES:
+                self.conn.execute(statement)
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_indicators_symbol_timeframe ON indicators(symbol, timeframe)")
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pattern_matches_symbol_timeframe ON pattern_matches(symbol, timeframe)")
             
@@ -125,118 +183,181 @@ class DuckDBHandler:
             self.logger.error(f"Failed to create/verify tables: {str(e)}")
             raise
 
-    def store_bars(self, symbol: str, timeframe: str, bars: pd.DataFrame, upsert: bool = True):
-        """Store price bars in database with high performance"""
-        if bars.empty:
+    @_serialized
+    def store_bars(self, symbol: str, timeframe: str, bars: Any, upsert: bool = True):
+        """Store price bars with one set-based insert.
+
+        ``bars`` is a DataFrame (timestamps in a ``timestamp`` column or the
+        index; naive values are taken as UTC) or an Arrow table with a
+        ``timestamp`` column. DuckDB scans it in place; with ``upsert``
+        existing keys are updated, otherwise a conflict raises.
+        """
+        if len(bars) == 0:
             self.logger.warning(f"No data to store for {symbol} {timeframe}")
             return
             
         try:
-            # Ensure timestamp is in UTC
-            if 'timestamp' in bars.columns:
-                bars = bars.copy()
-                bars['timestamp'] = pd.to_datetime(bars['timestamp']).dt.tz_localize('UTC')
-            else:
-                bars = bars.copy()
-                bars['timestamp'] = pd.to_datetime(bars.index).tz_localize('UTC')
-            
-            # Add symbol and timeframe columns
-            bars['symbol'] = symbol
-            bars['timeframe'] = timeframe
-            
-            # Select and rename columns to match schema
-            columns_map = {
-                'open': 'open',
-                'high': 'high', 
-                'low': 'low',
-                'close': 'close',
-                'volume': 'volume'
-            }
-            
-            # Handle case-insensitive column names
-            available_columns = {col.lower(): col for col in bars.columns}
-            selected_columns = ['timestamp', 'symbol', 'timeframe']
-            
-            for target_col, source_col in columns_map.items():
-                if source_col in available_columns:
-                    selected_columns.append(available_columns[source_col])
-                else:
-                    self.logger.warning(f"Column {source_col} not found in data for {symbol} {timeframe}")
-            
-            bars_to_store = bars[selected_columns].copy()
-            
-            # Convert DataFrame to list of tuples for insertion
-            data_to_insert = []
-            for _, row in bars_to_store.iterrows():
-                # Handle case-insensitive column names
-                open_col = 'open' if 'open' in row else 'Open'
-                high_col = 'high' if 'high' in row else 'High'
-                low_col = 'low' if 'low' in row else 'Low'
-                close_col = 'close' if 'close' in row else 'Close'
-                volume_col = 'volume' if 'volume' in row else 'Volume'
-                
-                data_to_insert.append((
-                    row['timestamp'],
-                    row['symbol'],
-                    row['timeframe'],
-                    row[open_col],
-                    row[high_col],
-                    row[low_col],
-                    row[close_col],
-                    row[volume_col]
-                ))
-            
-            # Use executemany for batch insertion
-            if upsert:
-                # Use DuckDB's efficient upsert
-                self.conn.executemany("""
-                    INSERT INTO price_bars (timestamp, symbol, timeframe, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT (timestamp, symbol, timeframe) DO UPDATE SET
-                        open = EXCLUDED.open,
-                        high = EXCLUDED.high,
-                        low = EXCLUDED.low,
-                        close = EXCLUDED.close,
-                        volume = EXCLUDED.volume
-                """, data_to_insert)
-            else:
-                # Simple insert
-                self.conn.executemany("""
-                    INSERT INTO price_bars (timestamp, symbol, timeframe, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, data_to_insert)
-            
+            conflict = """
+                ON CONFLICT (timestamp, symbol, timeframe) DO UPDATE SET
+                    open = EXCLUDED.open,
+                    high = EXCLUDED.high,
+                    low = EXCLUDED.low,
+                    close = EXCLUDED.close,
+                    volume = EXCLUDED.volume
+            """ if upsert else ""
+            stored = self._insert_bars('price_bars', symbol, timeframe, bars, conflict)
             self.conn.commit()
-            self.logger.info(f"Stored {len(bars_to_store)} bars for {symbol} {timeframe}")
+            self.logger.info(f"Stored {stored} bars for {symbol} {timeframe}")
             
         except Exception as e:
             self.logger.error(f"Failed to store bars for {symbol} {timeframe}: {str(e)}")
             raise
+        
+        self._notify_write(symbol, timeframe)
+
+    @_serialized
+    def bulk_load_bars(self, batches: Iterable[Tuple[str, str, Any]], upsert: bool = True) -> int:
+        """Load many (symbol, timeframe, bars) batches through a staging table.
+
+        Batches are appended to an unindexed temporary table, deduplicated
+        once (later batches win) and merged with a single INSERT ... ON
+        CONFLICT: existing keys are updated, or kept as they are without
+        ``upsert``. Returns the number of staged rows.
+        """
+        self.conn.execute("""
+            CREATE OR REPLACE TEMP TABLE price_bars_staging AS
+            SELECT *, 0 AS batch_no FROM price_bars LIMIT 0
+        """)
+        series = set()
+        staged = 0
+        try:
+            for batch_no, (symbol, timeframe, bars) in enumerate(batches):
+                if len(bars) == 0:
+                    continue
+                staged += self._insert_bars('price_bars_staging', symbol, timeframe, bars, batch_no=batch_no)
+                series.add((symbol, timeframe))
+            
+            # Resolve repeated keys once, in key order to keep index inserts local
+            self.conn.execute("""
+                CREATE OR REPLACE TEMP TABLE price_bars_merge AS
+                SELECT timestamp, symbol, timeframe, open, high, low, close, volume
+                FROM price_bars_staging
+                QUALIFY row_number() OVER (PARTITION BY timestamp, symbol, timeframe ORDER BY batch_no DESC) = 1
+                ORDER BY symbol, timeframe, timestamp
+            """)
+            self.conn.execute("DROP TABLE price_bars_staging")
+            # Keys are unique now, so one ON CONFLICT pass merges everything
+            action = """DO UPDATE SET
+                    open = EXCLUDED.open,
+                    high = EXCLUDED.high,
+                    low = EXCLUDED.low,
+                    close = EXCLUDED.close,
+                    volume = EXCLUDED.volume""" if upsert else "DO NOTHING"
+            self.conn.execute(f"""
+                INSERT INTO price_bars SELECT * FROM price_bars_merge
+                ON CONFLICT (timestamp, symbol, timeframe) {action}
+            """)
+            self.conn.commit()
+            self.logger.info(f"Bulk loaded {staged} bars for {len(series)} series")
+            
+        except Exception as e:
+            self.logger.error(f"Bulk load failed: {str(e)}")
+            raise
+        finally:
+            self.conn.execute("DROP TABLE IF EXISTS price_bars_staging")
+            self.conn.execute("DROP TABLE IF EXISTS price_bars_merge")
+        
+        for symbol, timeframe in sorted(series):
+            self._notify_write(symbol, timeframe)
+        return staged
+
+    def _insert_bars(self, table: str, symbol: str, timeframe: str, bars: Any,
+                     conflict: str = "", batch_no: Optional[int] = None) -> int:
+        """Insert one series into ``table`` straight from the registered frame"""
+        source = self._prepare_bars(bars)
+        columns = {str(col).lower(): str(col) for col in (source.columns if isinstance(source, pd.DataFrame) else source.column_names)}
+        missing = [col for col in ('timestamp', 'open', 'high', 'low', 'close', 'volume') if col not in columns]
+        if missing:
+            raise ValueError(f"Bars for {symbol} {timeframe} are missing columns: {missing}")
+        
+        self.conn.register('bars_batch', source)
+        try:
+            ts_type = next(row[1] for row in self.conn.execute("DESCRIBE bars_batch").fetchall()
+                           if row[0] == columns['timestamp'])
+            ts_expr = f'"{columns["timestamp"]}"'
+            if 'TIME ZONE' in ts_type:
+                ts_expr = f"timezone('UTC', {ts_expr})"
+            select = f"""
+                SELECT {ts_expr}, ?, ?,
+                       "{columns['open']}", "{columns['high']}", "{columns['low']}", "{columns['close']}",
+                       CAST("{columns['volume']}" AS BIGINT){', ' + str(int(batch_no)) if batch_no is not None else ''}
+                FROM bars_batch
+            """
+            self.conn.execute(f"INSERT INTO {table} {select} {conflict}", [symbol, timeframe])
+        finally:
+            self.conn.unregister('bars_batch')
+        return len(source)
+
+    @staticmethod
+    def _prepare_bars(bars: Any) -> Any:
+        """Expose the index as a timestamp column and drop repeated keys (last wins).
+
+        Column data is not copied; Arrow tables pass through untouched.
+        """
+        if not isinstance(bars, pd.DataFrame):
+            return bars
+        ts_col = next((col for col in bars.columns if str(col).lower() == 'timestamp'), None)
+        if ts_col is None:
+            bars = bars.reset_index(names='timestamp')
+            ts_col = 'timestamp'
+        if not pd.api.types.is_datetime64_any_dtype(bars[ts_col]):
+            bars = bars.assign(**{ts_col: pd.to_datetime(bars[ts_col])})
+        duplicated = bars[ts_col].duplicated(keep='last')
+        if duplicated.any():
+            bars = bars[~duplicated.to_numpy()]
+        return bars
+
+    def add_write_listener(self, callback: Callable[[str, str], Any]):
+        """Register a callback invoked with (symbol, timeframe) after bars are written"""
+        if callback not in self._write_listeners:
+            self._write_listeners.append(callback)
+
+    def remove_write_listener(self, callback: Callable[[str, str], Any]):
+        """Unregister a write listener"""
+        if callback in self._write_listeners:
+            self._write_listeners.remove(callback)
+
+    def _notify_write(self, symbol: str, timeframe: str):
+        """Tell listeners (e.g. analysis caches) that a series changed"""
+        for callback in list(self._write_listeners):
+            try:
+                callback(symbol, timeframe)
+            except Exception as e:
+                self.logger.warning(f"Write listener failed for {symbol} {timeframe}: {str(e)}")
 
     def get_bars(self, symbol: str, timeframe: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
         """Retrieve price bars with optional date filtering"""
         try:
-            query = """
+            query = f"""
                 SELECT timestamp, open, high, low, close, volume
-                FROM price_bars 
+                FROM {self.bars_source}
                 WHERE symbol = ? AND timeframe = ?
             """
             params = [symbol, timeframe]
             
-            if start:
-                query += " AND timestamp >= ?"
-                params.append(start)
-            if end:
-                query += " AND timestamp <= ?"
-                params.append(end)
+            range_filter, range_params = self._range_filter(start, end)
+            query += range_filter
+            params += range_params
                 
             query += " ORDER BY timestamp"
             
-            result = self.conn.execute(query, params).df()
-            
-            if not result.empty:
-                result.set_index('timestamp', inplace=True)
-                result.index = pd.to_datetime(result.index)
+            with stage('load'):
+                result = self.conn.execute(query, params).df()
+                
+                if not result.empty:
+                    result.set_index('timestamp', inplace=True)
+                    result.index = pd.to_datetime(result.index)
+            record_load(result)
             
             return result
             
@@ -244,6 +365,83 @@ class DuckDBHandler:
             self.logger.error(f"Failed to retrieve bars for {symbol} {timeframe}: {str(e)}")
             return pd.DataFrame()
 
+    def _range_filter(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[str, List[Any]]:
+        """Timestamp bounds; on the archive view also year bounds, which prune partitions"""
+        clause, params = "", []
+        if start:
+            clause += " AND timestamp >= ?"
+            params.append(start)
+        if end:
+            clause += " AND timestamp <= ?"
+            params.append(end)
+        if self.bars_source == ARCHIVE_VIEW:
+            if start:
+                clause += " AND year >= ?"
+                params.append(_utc(start).year)
+            if end:
+                clause += " AND year <= ?"
+                params.append(_utc(end).year)
+        return clause, params
+
+    def get_bars_many(self, symbols: List[str], timeframe: str, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None, panel: bool = False) -> Dict[str, Any]:
+        """Retrieve bars of many symbols with one query.
+
+        The result is fetched as NumPy columns sorted by (symbol, timestamp).
+        By default returns ``{symbol: {column: array}}`` where every array is
+        a view into those columns; symbols without bars are left out. With
+        ``panel`` returns ``{column: DataFrame}`` aligned time x symbol on the
+        union of timestamps, NaN where a symbol has no bar.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        try:
+            query = f"""
+                SELECT list_position(?, symbol)::INTEGER - 1 AS symbol_id, timestamp, open, high, low, close, volume
+                FROM {self.bars_source}
+                WHERE symbol IN ({', '.join('?' * len(symbols))}) AND timeframe = ?
+            """
+            params: List[Any] = [symbols] + symbols + [timeframe]
+
+            range_filter, range_params = self._range_filter(start, end)
+            query += range_filter
+            params += range_params
+
+            query += " ORDER BY symbol_id, timestamp"
+
+            with stage('load'):
+                columns = self.conn.execute(query, params).fetchnumpy()
+            symbol_ids = columns.pop('symbol_id')
+            record_load(columns)
+
+            if panel:
+                return self._bars_panel(symbols, symbol_ids, columns)
+
+            bounds = np.searchsorted(symbol_ids, np.arange(len(symbols) + 1))
+            return {symbol: {name: values[a:b] for name, values in columns.items()}
+                    for symbol, a, b in zip(symbols, bounds[:-1], bounds[1:]) if b > a}
+
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve bars for {len(symbols)} symbols {timeframe}: {str(e)}")
+            return {}
+
+    @staticmethod
+    def _bars_panel(symbols: List[str], symbol_ids: np.ndarray, columns: Dict[str, np.ndarray]) -> Dict[str, pd.DataFrame]:
+        """Scatter long-format columns into time x symbol frames"""
+        axis, rows = np.unique(columns['timestamp'], return_inverse=True)
+        index = pd.DatetimeIndex(axis, name='timestamp')
+        labels = pd.Index(symbols, name='symbol')
+        frames = {}
+        for name, values in columns.items():
+            if name == 'timestamp':
+                continue
+            matrix = np.full((len(axis), len(symbols)), np.nan)
+            matrix[rows, symbol_ids] = values
+            frames[name] = pd.DataFrame(matrix, index=index, columns=labels, copy=False)
+        return frames
+
+    @_serialized
     def store_indicator(self, symbol: str, timeframe: str, indicator_name: str, values: pd.Series):
         """Store computed indicator values"""
         try:
@@ -309,6 +507,7 @@ class DuckDBHandler:
             self.logger.error(f"Failed to retrieve indicator {indicator_name} for {symbol} {timeframe}: {str(e)}")
             return pd.Series(dtype=float)
 
+    @_serialized
     def store_pattern_match(self, pattern_match: Dict[str, Any]):
         """Store pattern match result"""
         try:
@@ -334,15 +533,16 @@ class DuckDBHandler:
             self.logger.error(f"Failed to store pattern match: {str(e)}")
             raise
 
+    @_serialized
     def store_backtest_result(self, backtest_result: Dict[str, Any]):
         """Store backtest result"""
         try:
             self.conn.execute("""
                 INSERT INTO backtest_results 
-                (strategy_name, symbol, timeframe, start_date, end_date, total_trades, 
+                (id, strategy_name, symbol, timeframe, start_date, end_date, total_trades, 
                  winning_trades, losing_trades, win_rate, avg_return, total_return, 
-                 max_drawdown, sharpe_ratio, parameters, equity_curve)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 max_drawdown, sharpe_ratio, parameters, equity_curve, equity_blob)
+                VALUES (nextval('backtest_results_id_seq'), ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 backtest_result['strategy_name'],
                 backtest_result['symbol'],
@@ -358,7 +558,8 @@ class DuckDBHandler:
                 backtest_result['max_drawdown'],
                 backtest_result.get('sharpe_ratio'),
                 json.dumps(backtest_result.get('parameters', {})),
-                json.dumps(backtest_result.get('equity_curve', []))
+                json.dumps(backtest_result['equity_curve']) if backtest_result.get('equity_curve') is not None else None,
+                backtest_result.get('equity_blob')
             ))
             
             self.conn.commit()
@@ -367,10 +568,93 @@ class DuckDBHandler:
             self.logger.error(f"Failed to store backtest result: {str(e)}")
             raise
 
+    @_serialized
+    def store_backtest_results(self, backtest_results: List[Dict[str, Any]]):
+        """Store many backtest results with a single set-based insert"""
+        if not backtest_results:
+            return
+        
+        try:
+            frame = pd.DataFrame({
+                'strategy_name': [r['strategy_name'] for r in backtest_results],
+                'symbol': [r['symbol'] for r in backtest_results],
+                'timeframe': [r['timeframe'] for r in backtest_results],
+                'start_date': pd.to_datetime([r['start_date'] for r in backtest_results]),
+                'end_date': pd.to_datetime([r['end_date'] for r in backtest_results]),
+                'total_trades': [int(r['total_trades']) for r in backtest_results],
+                'winning_trades': [int(r['winning_trades']) for r in backtest_results],
+                'losing_trades': [int(r['losing_trades']) for r in backtest_results],
+                'win_rate': [float(r['win_rate']) for r in backtest_results],
+                'avg_return': [float(r['avg_return']) for r in backtest_results],
+                'total_return': [float(r['total_return']) for r in backtest_results],
+                'max_drawdown': [float(r['max_drawdown']) for r in backtest_results],
+                'sharpe_ratio': [r.get('sharpe_ratio') for r in backtest_results],
+                'parameters': [json.dumps(r.get('parameters', {}), default=str) for r in backtest_results],
+                'equity_curve': [json.dumps(r['equity_curve']) if r.get('equity_curve') is not None else None
+                                 for r in backtest_results],
+                'equity_blob': [r.get('equity_blob') for r in backtest_results]
+            })
+            
+            self.conn.register('backtest_results_batch', frame)
+            try:
+                self.conn.execute("""
+                    INSERT INTO backtest_results 
+                    (id, strategy_name, symbol, timeframe, start_date, end_date, total_trades, 
+                     winning_trades, losing_trades, win_rate, avg_return, total_return, 
+                     max_drawdown, sharpe_ratio, parameters, equity_curve, equity_blob)
+                    SELECT nextval('backtest_results_id_seq'), strategy_name, symbol, timeframe, start_date, end_date,
+                           total_trades, winning_trades, losing_trades, win_rate, avg_return, total_return,
+                           max_drawdown, sharpe_ratio, CAST(parameters AS JSON), CAST(equity_curve AS JSON),
+                           CAST(equity_blob AS BLOB)
+                    FROM backtest_results_batch
+                """)
+            finally:
+                self.conn.unregister('backtest_results_batch')
+            
+            self.conn.commit()
+            self.logger.debug(f"Stored {len(frame)} backtest results")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to store backtest results: {str(e)}")
+            raise
+
+    def get_equity_curve(self, result_id: int, max_points: Optional[int] = None) -> pd.DataFrame:
+        """Equity (and drawdown) curve of a stored backtest, optionally downsampled to ``max_points``"""
+        try:
+            row = self.conn.execute(
+                "SELECT equity_blob, equity_curve FROM backtest_results WHERE id = ?", (result_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"No backtest result with id {result_id}")
+            
+            blob, legacy = row
+            if blob is not None:
+                return decode_curves(blob, max_points)
+            
+            # Rows written before binary storage keep a timestamp-keyed JSON dict
+            values = json.loads(legacy) if legacy else {}
+            curve = pd.DataFrame({'equity': pd.Series(values, dtype=float)})
+            curve.index = pd.to_datetime(curve.index)
+            if max_points is not None and len(curve) > max_points:
+                curve = curve.iloc[np.unique(np.linspace(0, len(curve) - 1, max_points).round().astype(np.int64))]
+            return curve
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get equity curve for backtest {result_id}: {str(e)}")
+            raise
+
+    def execute_query(self, query: str, params: Optional[List[Any]] = None) -> pd.DataFrame:
+        """Run a read query on the calling thread's cursor and return the rows as a DataFrame"""
+        try:
+            return self.conn.execute(query, params or []).df()
+        except Exception as e:
+            self.logger.error(f"Query failed: {str(e)}")
+            raise
+
     def get_available_symbols(self) -> List[str]:
         """Get list of available symbols"""
         try:
-            result = self.conn.execute("SELECT DISTINCT symbol FROM price_bars ORDER BY symbol").df()
+            result = self.conn.execute(f"SELECT DISTINCT symbol FROM {self.bars_source} ORDER BY symbol").df()
             return result['symbol'].tolist()
         except Exception as e:
             self.logger.error(f"Failed to get available symbols: {str(e)}")
@@ -380,7 +664,7 @@ class DuckDBHandler:
         """Get list of available timeframes for a symbol"""
         try:
             result = self.conn.execute(
-                "SELECT DISTINCT timeframe FROM price_bars WHERE symbol = ? ORDER BY timeframe",
+                f"SELECT DISTINCT timeframe FROM {self.bars_source} WHERE symbol = ? ORDER BY timeframe",
                 [symbol]
             ).df()
             return result['timeframe'].tolist()
@@ -392,7 +676,7 @@ class DuckDBHandler:
         """Get number of rows for a symbol/timeframe combination"""
         try:
             result = self.conn.execute(
-                "SELECT COUNT(*) as count FROM price_bars WHERE symbol = ? AND timeframe = ?",
+                f"SELECT COUNT(*) as count FROM {self.bars_source} WHERE symbol = ? AND timeframe = ?",
                 [symbol, timeframe]
             ).df()
             return result['count'].iloc[0]
@@ -400,10 +684,174 @@ class DuckDBHandler:
             self.logger.error(f"Failed to get row count for {symbol} {timeframe}: {str(e)}")
             return 0
 
+    def get_row_counts(self, 
+                       symbols: List[str], 
+                       timeframes: List[str], 
+                       start: Optional[datetime] = None, 
+                       end: Optional[datetime] = None) -> Dict[tuple, int]:
+        """Row counts per (symbol, timeframe) in one grouped query"""
+        try:
+            query = f"""
+                SELECT symbol, timeframe, COUNT(*) AS count
+                FROM {self.bars_source}
+                WHERE symbol IN ({', '.join('?' * len(symbols))})
+                  AND timeframe IN ({', '.join('?' * len(timeframes))})
+            """
+            params = list(symbols) + list(timeframes)
+            range_filter, range_params = self._range_filter(start, end)
+            query += range_filter
+            params += range_params
+            query += " GROUP BY symbol, timeframe"
+            
+            return {(symbol, timeframe): int(count) 
+                    for symbol, timeframe, count in self.conn.execute(query, params).fetchall()}
+        except Exception as e:
+            self.logger.error(f"Failed to get row counts: {str(e)}")
+            return {}
+
+    def _refresh_archive_view(self):
+        """Point the archive view at the Parquet files, or drop it while there are none.
+
+        Bars re-stored for an archived month live in the hot table and shadow
+        the archived row with the same key.
+        """
+        if self.archive_dir is None:
+            return
+        if not any(self.archive_dir.glob('symbol=*/timeframe=*/year=*/*.parquet')):
+            self.conn.execute(f"DROP VIEW IF EXISTS {ARCHIVE_VIEW}")
+            self.bars_source = 'price_bars'
+            return
+        files = str(self.archive_dir / 'symbol=*' / 'timeframe=*' / 'year=*' / '*.parquet').replace("'", "''")
+        self.conn.execute(f"""
+            CREATE OR REPLACE VIEW {ARCHIVE_VIEW} AS
+            SELECT timestamp, symbol, timeframe, open, high, low, close, volume, year(timestamp)::INTEGER AS year
+            FROM price_bars
+            UNION ALL
+            SELECT timestamp, symbol, timeframe, open, high, low, close, volume, year
+            FROM read_parquet('{files}', hive_partitioning = true,
+                              hive_types = {{'symbol': VARCHAR, 'timeframe': VARCHAR, 'year': INTEGER}}) AS archived
+            WHERE NOT EXISTS (
+                SELECT 1 FROM price_bars AS hot
+                WHERE hot.symbol = archived.symbol AND hot.timeframe = archived.timeframe
+                  AND hot.timestamp = archived.timestamp
+            )
+        """)
+        self.bars_source = ARCHIVE_VIEW
+
+    @_serialized
+    def archive_bars(self, before: datetime) -> int:
+        """Move bars older than ``before`` from the hot table into the Parquet archive.
+
+        Every symbol/timeframe/year partition the rows fall into is rewritten
+        as ZSTD Parquet from its archived rows merged with the moved ones
+        (moved rows win on duplicate keys) into a staging directory. The new
+        files replace the partition's old ones in the same transaction that
+        rebuilds ``price_bars`` from the remaining rows (far cheaper than
+        deleting through its indexes). Reads go through the archive view
+        afterwards. Returns the number of bars moved.
+        """
+        if self.archive_dir is None:
+            raise ValueError("No archive directory configured")
+        cutoff = _utc(before)
+        count = self.conn.execute("SELECT COUNT(*) FROM price_bars WHERE timestamp < ?", [cutoff]).fetchone()[0]
+        if not count:
+            return 0
+
+        staging = self.archive_dir / f".staging-{uuid.uuid4().hex}"
+        placed: List[Path] = []
+        replaced: List[Tuple[Path, Path]] = []
+        try:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            partitions = self.conn.execute("""
+                SELECT DISTINCT symbol, timeframe, year(timestamp)::INTEGER
+                FROM price_bars WHERE timestamp < ?
+            """, [cutoff]).fetchall()
+            previous = [path for symbol, timeframe, year in partitions
+                        for path in self._archive_partition(symbol, timeframe, year).glob('*.parquet')]
+            
+            moved = f"""
+                SELECT *, year(timestamp)::INTEGER AS year, 0 AS priority
+                FROM price_bars
+                WHERE timestamp < TIMESTAMP '{cutoff.isoformat(sep=' ')}'
+            """
+            if previous:
+                files = ', '.join("'" + str(path).replace("'", "''") + "'" for path in previous)
+                moved += f"""
+                UNION ALL BY NAME
+                SELECT *, 1 AS priority
+                FROM read_parquet([{files}], hive_partitioning = true,
+                                  hive_types = {{'symbol': VARCHAR, 'timeframe': VARCHAR, 'year': INTEGER}})
+                """
+            self.conn.execute(f"""
+                COPY (
+                    SELECT * EXCLUDE (priority)
+                    FROM ({moved})
+                    QUALIFY row_number() OVER (PARTITION BY symbol, timeframe, timestamp ORDER BY priority) = 1
+                    ORDER BY symbol, timeframe, timestamp
+                ) TO '{str(staging).replace("'", "''")}'
+                (FORMAT PARQUET, COMPRESSION ZSTD, PARTITION_BY (symbol, timeframe, year))
+            """)
+            
+            self.conn.execute("BEGIN TRANSACTION")
+            try:
+                self.conn.execute(f"CREATE TABLE price_bars_hot ({PRICE_BARS_SCHEMA})")
+                self.conn.execute("""
+                    INSERT INTO price_bars_hot
+                    SELECT * FROM price_bars WHERE timestamp >= ?
+                    ORDER BY symbol, timeframe, timestamp
+                """, [cutoff])
+                self.conn.execute("DROP TABLE price_bars")
+                self.conn.execute("ALTER TABLE price_bars_hot RENAME TO price_bars")
+                for statement in PRICE_BARS_INDEXES:
+                    self.conn.execute(statement)
+                # Set the partitions' old files aside, then place the merged ones under fresh names
+                for path in previous:
+                    aside = path.with_name(path.name + '.replaced')
+                    os.replace(path, aside)
+                    replaced.append((path, aside))
+                for part in staging.rglob('*.parquet'):
+                    target = self.archive_dir / part.relative_to(staging).parent / f"bars-{uuid.uuid4().hex}.parquet"
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(part, target)
+                    placed.append(target)
+                self._refresh_archive_view()
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                for target in placed:
+                    target.unlink(missing_ok=True)
+                for path, aside in replaced:
+                    os.replace(aside, path)
+                self._refresh_archive_view()
+                raise
+            for _, aside in replaced:
+                aside.unlink(missing_ok=True)
+            
+            self.logger.info(f"Archived {count} bars before {cutoff} to {self.archive_dir}")
+            return count
+            
+        except Exception as e:
+            self.logger.error(f"Failed to archive bars before {cutoff}: {str(e)}")
+            raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _archive_partition(self, symbol: str, timeframe: str, year: int) -> Path:
+        return self.archive_dir / f"symbol={symbol}" / f"timeframe={timeframe}" / f"year={year}"
+
+    def archive_closed_months(self, keep_months: int = 1, now: Optional[datetime] = None) -> int:
+        """Archive closed months, keeping the current month and the last ``keep_months`` hot"""
+        current_month = _utc(now or datetime.now(timezone.utc)).to_period('M').to_timestamp()
+        return self.archive_bars(current_month - pd.DateOffset(months=keep_months))
+
     def close(self):
         """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        if getattr(self, '_async', None) is not None:
+            self._async.close()
+            self._async = None
+        if getattr(self, '_pool', None) is not None:
+            self._pool.close()
+            self._pool = None
             self.logger.debug("DuckDB connection closed")
 
     def __del__(self):
@@ -312,8 +312,7 @@ class AlpacaStreamHandler:
                     bars.reset_index(inplace=True)
                     
                     # Use existing store_bars method
-                    await asyncio.to_thread(
-                        self.db_handler.store_bars, 
+                    await self.db_handler.async_api().store_bars(
                         symbol, 
                         '1m', 
                         bars
@@ -337,8 +336,7 @@ class AlpacaStreamHandler:
             
             if not df.empty:
                 # Store in database
-                await asyncio.to_thread(
-                    self.db_handler.store_bars,
+                await self.db_handler.async_api().store_bars(
                     symbol,
                     '1m',  # Alpaca streams 1-minute bars
                     df
@@ -367,8 +365,7 @@ class AlpacaStreamHandler:
                 end_date = datetime.now(timezone.utc)
                 start_date = end_date - pd.Timedelta(days=1)
                 
-                data = await asyncio.to_thread(
-                    self.db_handler.get_bars,
+                data = await self.db_handler.async_api().get_bars(
                     symbol,
                     '1m',
                     start_date,
@@ -45,6 +45,10 @@ class UpdateConfig:
     # Cache settings
     cache_duration: int = 300  # seconds
     
+    # Archive settings (needs a handler with an archive_dir)
+    archive_keep_months: Optional[int] = None  # Closed months kept in the hot table; None disables archiving
+    archive_interval: int = 86400  # seconds
+    
     def __post_init__(self):
         if self.timeframe_frequencies is None:
             self.timeframe_frequencies = {
@@ -83,6 +87,7 @@ class DataUpdateScheduler:
         self.is_running = False
         self.update_task = None
         self.monitor_task = None
+        self.archive_task = None
         
         # Statistics
         self.stats = {
@@ -109,6 +114,10 @@ class DataUpdateScheduler:
             # Start monitor loop
             self.monitor_task = asyncio.create_task(self._monitor_loop())
             
+            # Start archive loop
+            if self.config.archive_keep_months is not None and self.db_handler.archive_dir:
+                self.archive_task = asyncio.create_task(self._archive_loop())
+            
             self.logger.info(f"Started update scheduler for {len(symbols)} symbols and {len(timeframes)} timeframes")
             
         except Exception as e:
@@ -125,6 +134,8 @@ class DataUpdateScheduler:
             self.update_task.cancel()
         if self.monitor_task:
             self.monitor_task.cancel()
+        if self.archive_task:
+            self.archive_task.cancel()
         
         # Save state
         self._save_state()
@@ -209,6 +220,26 @@ class DataUpdateScheduler:
             except Exception as e:
                 self.logger.error(f"Error in monitor loop: {str(e)}")
     
+    async def _archive_loop(self):
+        """Move closed months from the hot table to the Parquet archive"""
+        while self.is_running:
+            try:
+                # Queued behind other writes on the handler's serialized writer
+                moved = await self.db_handler.async_api().write(
+                    self.db_handler.archive_closed_months,
+                    self.config.archive_keep_months
+                )
+                if moved:
+                    self.logger.info(f"Archived {moved} bars from closed months")
+                
+                await asyncio.sleep(self.config.archive_interval)
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Error in archive loop: {str(e)}")
+                await asyncio.sleep(self.config.archive_interval)
+    
     async def _process_batch(self, tasks: List[UpdateTask]):
         """Process a batch of update tasks"""
         # Create coroutines for all tasks
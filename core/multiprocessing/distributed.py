@@ -0,0 +1,533 @@
+import multiprocessing as mp
+import socket
+import socketserver
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple, Callable
+import logging
+import argparse
+import hashlib
+import hmac
+import pickle
+import struct
+import zlib
+import time
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from core.multiprocessing.parallel_engine import (
+    ParallelTask, ParallelResult, _init_parallel_worker,
+    _screening_worker, _backtesting_worker, _optimization_worker
+)
+
+logger = logging.getLogger(__name__)
+
+# Message kinds
+HELLO, WELCOME, REQUEST, TASK, WAIT, DONE, RESULT, HEARTBEAT, ACK = range(9)
+
+# Frame: uint32 payload length | uint8 flags | HMAC-SHA256 | pickled (kind, payload)
+_FRAME = struct.Struct('<IB')
+_SEQUENCE = struct.Struct('<Q')
+_COMPRESSED = 0x01
+COMPRESS_MIN_BYTES = 1024
+DIGEST_BYTES = hashlib.sha256().digest_size
+NONCE_BYTES = 16
+HANDSHAKE_TIMEOUT = 10.0
+
+# Shared secret of coordinator and workers when none is passed explicitly
+AUTHKEY_ENV = 'PARALLEL_ENGINE_AUTHKEY'
+
+_WORKER_FUNCTIONS = {
+    'screening': _screening_worker,
+    'backtesting': _backtesting_worker,
+    'optimization': _optimization_worker
+}
+
+def resolve_authkey(authkey: Optional[Any] = None) -> Optional[bytes]:
+    """Explicit key, else the ``PARALLEL_ENGINE_AUTHKEY`` environment variable"""
+    if authkey is None:
+        authkey = os.environ.get(AUTHKEY_ENV) or None
+    if isinstance(authkey, str):
+        authkey = authkey.encode()
+    return authkey
+
+def _digest(key: bytes, *parts: bytes) -> bytes:
+    return hmac.new(key, b''.join(parts), hashlib.sha256).digest()
+
+def send_message(sock: socket.socket, kind: int, payload: Any, key: bytes, sequence: int = 0):
+    """Write one signed, length-prefixed frame; large payloads are zlib-compressed.
+
+    The HMAC covers the frame number, so frames cannot be forged, reordered
+    or replayed by anyone without ``key``.
+    """
+    body = pickle.dumps((kind, payload), protocol=pickle.HIGHEST_PROTOCOL)
+    flags = 0
+    if len(body) >= COMPRESS_MIN_BYTES:
+        packed = zlib.compress(body, 1)
+        if len(packed) < len(body):
+            body, flags = packed, _COMPRESSED
+    header = _FRAME.pack(len(body), flags)
+    sock.sendall(header + _digest(key, _SEQUENCE.pack(sequence), header, body) + body)
+
+def recv_message(sock: socket.socket, key: bytes, sequence: int = 0) -> Optional[Tuple[int, Any]]:
+    """Read and verify one frame, or None when the peer closed the connection.
+
+    Nothing is unpickled before the signature checks out.
+    """
+    header = _recv_exact(sock, _FRAME.size + DIGEST_BYTES)
+    if header is None:
+        return None
+    header, signature = header[:_FRAME.size], header[_FRAME.size:]
+    length, flags = _FRAME.unpack(header)
+    body = _recv_exact(sock, length)
+    if body is None:
+        raise ConnectionError("Connection closed mid-frame")
+    if not hmac.compare_digest(signature, _digest(key, _SEQUENCE.pack(sequence), header, body)):
+        raise mp.AuthenticationError("Frame signature mismatch")
+    if flags & _COMPRESSED:
+        body = zlib.decompress(body)
+    return pickle.loads(body)
+
+class Session:
+    """Authenticated connection: frames signed with a per-connection key and numbered per direction"""
+
+    def __init__(self, sock: socket.socket, key: bytes):
+        self.sock = sock
+        self.key = key
+        self._sent = 0
+        self._received = 0
+
+    def send(self, kind: int, payload: Any = None):
+        send_message(self.sock, kind, payload, self.key, self._sent)
+        self._sent += 1
+
+    def recv(self) -> Optional[Tuple[int, Any]]:
+        message = recv_message(self.sock, self.key, self._received)
+        self._received += 1
+        return message
+
+def accept_session(sock: socket.socket, authkey: bytes) -> Session:
+    """Coordinator side of the handshake: challenge the worker, then prove the key back"""
+    server_nonce = os.urandom(NONCE_BYTES)
+    sock.settimeout(HANDSHAKE_TIMEOUT)
+    try:
+        sock.sendall(server_nonce)
+        reply = _recv_exact(sock, NONCE_BYTES + DIGEST_BYTES)
+        if reply is None:
+            raise ConnectionError("Connection closed during handshake")
+        client_nonce, proof = reply[:NONCE_BYTES], reply[NONCE_BYTES:]
+        if not hmac.compare_digest(proof, _digest(authkey, b'worker', server_nonce, client_nonce)):
+            raise mp.AuthenticationError("Worker failed authentication")
+        sock.sendall(_digest(authkey, b'coordinator', client_nonce, server_nonce))
+    finally:
+        sock.settimeout(None)
+    return Session(sock, _digest(authkey, b'session', server_nonce, client_nonce))
+
+def open_session(sock: socket.socket, authkey: bytes) -> Session:
+    """Worker side of the handshake: answer the challenge and check the coordinator's proof"""
+    client_nonce = os.urandom(NONCE_BYTES)
+    sock.settimeout(HANDSHAKE_TIMEOUT)
+    try:
+        server_nonce = _recv_exact(sock, NONCE_BYTES)
+        if server_nonce is None:
+            raise ConnectionError("Connection closed during handshake")
+        sock.sendall(client_nonce + _digest(authkey, b'worker', server_nonce, client_nonce))
+        proof = _recv_exact(sock, DIGEST_BYTES)
+        if proof is None or not hmac.compare_digest(proof, _digest(authkey, b'coordinator', client_nonce, server_nonce)):
+            raise mp.AuthenticationError("Coordinator failed authentication")
+    finally:
+        sock.settimeout(None)
+    return Session(sock, _digest(authkey, b'session', server_nonce, client_nonce))
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+    chunks = bytearray()
+    while len(chunks) < n:
+        chunk = sock.recv(n - len(chunks))
+        if not chunk:
+            return None
+        chunks.extend(chunk)
+    return bytes(chunks)
+
+def parse_address(address: str) -> Tuple[int, Any]:
+    """'host:port' for TCP (loopback when host is empty); 'unix:/path' or a bare path for a Unix socket"""
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit():
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_UNIX, address
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+class TaskCoordinator:
+    """Serves ParallelTasks to pull-based workers over TCP or a Unix socket.
+
+    Each leased task carries a deadline of ``lease_seconds``. A worker that
+    disconnects, or sends nothing for ``heartbeat_timeout`` seconds, loses
+    its leases and the tasks are re-queued at the front; a task lost
+    ``max_attempts`` times is recorded as failed. The first result for a
+    task wins, so a slow worker finishing a re-queued task is harmless.
+
+    Workers must prove they hold ``authkey`` (default: ``PARALLEL_ENGINE_AUTHKEY``,
+    else a random key for local workers only) before any frame is unpickled.
+    """
+
+    def __init__(self,
+                 address: str,
+                 worker_config: Dict[str, Any],
+                 lease_seconds: float = 3600.0,
+                 heartbeat_timeout: float = 30.0,
+                 max_attempts: int = 3,
+                 poll_interval: float = 0.2,
+                 on_result: Optional[Callable[[ParallelTask, ParallelResult], None]] = None,
+                 authkey: Optional[Any] = None):
+        self.family, self.bind_address = parse_address(address)
+        self.authkey = resolve_authkey(authkey) or os.urandom(32)
+        self.worker_config = worker_config  # Sent to workers on connect: db_path, strategy_config, backtest_config
+        self.lease_seconds = lease_seconds
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.on_result = on_result
+        self.logger = logger
+
+        self._cond = threading.Condition()
+        self._deliver_lock = threading.Lock()  # Serializes on_result calls, made without holding _cond
+        self._outbox: deque = deque()  # Final results awaiting delivery
+        self._delivered = 0
+        self._tasks: Dict[str, ParallelTask] = {}
+        self._pending: deque = deque()
+        self._leases: Dict[str, Tuple[str, float]] = {}  # task_id -> (worker_id, deadline)
+        self._attempts: Dict[str, int] = {}
+        self._last_seen: Dict[str, float] = {}
+        self._done = set()
+        self._connections = 0
+        self._closing = False
+        self._stop = threading.Event()
+        self._server = None
+        self._threads: List[threading.Thread] = []
+
+        self.results: Dict[str, ParallelResult] = {}  # Kept only when no on_result callback is given
+        self.durations: List[float] = []
+        self.workers_seen = set()
+
+    def submit(self, tasks: List[ParallelTask]):
+        """Queue tasks in the given order"""
+        with self._cond:
+            for task in tasks:
+                self._tasks[task.task_id] = task
+                self._attempts.setdefault(task.task_id, 0)
+                self._pending.append(task)
+
+    @property
+    def remaining(self) -> int:
+        with self._cond:
+            return len(self._tasks) - len(self._done)
+
+    @property
+    def address(self) -> str:
+        """Address workers should connect to"""
+        if self.family == socket.AF_UNIX:
+            return f"unix:{self.bind_address}"
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self):
+        """Bind and serve in background threads"""
+        coordinator = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                coordinator._handle(self.request)
+
+        if self.family == socket.AF_UNIX:
+            if os.path.exists(self.bind_address):
+                os.unlink(self.bind_address)
+            self._server = _UnixServer(self.bind_address, Handler)
+        else:
+            self._server = _TCPServer(self.bind_address, Handler)
+
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._reap, daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self.logger.info(f"Coordinator serving {len(self._tasks)} tasks on {self.address}")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every task's result has been delivered; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._delivered == len(self._tasks), timeout)
+
+    def close(self, drain_seconds: float = 2.0):
+        """Tell connected workers the run is over, then stop serving"""
+        with self._cond:
+            self._closing = True
+            self._cond.wait_for(lambda: self._connections == 0, drain_seconds)
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if self.family == socket.AF_UNIX and os.path.exists(self.bind_address):
+                os.unlink(self.bind_address)
+
+    def _handle(self, conn: socket.socket):
+        """Request/response loop for one worker connection"""
+        worker_id = None
+        with self._cond:
+            self._connections += 1
+        try:
+            session = accept_session(conn, self.authkey)
+            while True:
+                message = session.recv()
+                if message is None:
+                    break
+                kind, payload = message
+                if kind == HELLO:
+                    worker_id = payload
+                    self._touch(worker_id)
+                    self.workers_seen.add(worker_id)
+                    session.send(WELCOME, self.worker_config)
+                elif kind == REQUEST:
+                    session.send(*self._lease(worker_id))
+                elif kind == RESULT:
+                    self._complete(worker_id, payload)
+                    session.send(ACK)
+                elif kind == HEARTBEAT:
+                    self._touch(worker_id)
+                    session.send(ACK)
+        except mp.AuthenticationError as e:
+            self.logger.warning(f"Rejected connection from worker {worker_id}: {str(e)}")
+        except (ConnectionError, OSError) as e:
+            self.logger.warning(f"Worker {worker_id} connection error: {str(e)}")
+        finally:
+            with self._cond:
+                self._connections -= 1
+                if worker_id is not None:
+                    self._release_worker(worker_id, 'disconnected')
+                self._cond.notify_all()
+            self._deliver()
+
+    def _touch(self, worker_id: str):
+        with self._cond:
+            self._last_seen[worker_id] = time.time()
+
+    def _lease(self, worker_id: str) -> Tuple[int, Any]:
+        with self._cond:
+            self._last_seen[worker_id] = time.time()
+            if self._closing:
+                return DONE, None
+            if not self._pending:
+                return WAIT, self.poll_interval
+            task = self._pending.popleft()
+            self._attempts[task.task_id] += 1
+            self._leases[task.task_id] = (worker_id, time.time() + self.lease_seconds)
+            return TASK, task
+
+    def _complete(self, worker_id: str, result: ParallelResult):
+        with self._cond:
+            self._last_seen[worker_id] = time.time()
+            task = self._tasks.get(result.task_id)
+            if task is None or result.task_id in self._done:
+                return
+            self._leases.pop(result.task_id, None)
+            if any(queued is task for queued in self._pending):
+                self._pending.remove(task)
+            self._record(task, result)
+        self._deliver()
+
+    def _record(self, task: ParallelTask, result: ParallelResult):
+        """Mark a task final and queue its result for delivery (caller holds the lock)"""
+        self._done.add(task.task_id)
+        self.durations.append(result.processing_time)
+        self._outbox.append((task, result))
+
+    def _deliver(self):
+        """Hand queued results to ``on_result`` one at a time, without holding the task lock"""
+        with self._deliver_lock:
+            while True:
+                with self._cond:
+                    if not self._outbox:
+                        return
+                    task, result = self._outbox.popleft()
+                try:
+                    if self.on_result is not None:
+                        self.on_result(task, result)
+                    else:
+                        self.results[task.task_id] = result
+                except Exception as e:
+                    self.logger.error(f"Error handling result of task {task.task_id}: {str(e)}")
+                finally:
+                    with self._cond:
+                        self._delivered += 1
+                        self._cond.notify_all()
+
+    def _release_worker(self, worker_id: str, reason: str):
+        """Re-queue every task leased to a worker (caller holds the lock)"""
+        for task_id, (owner, _) in list(self._leases.items()):
+            if owner == worker_id:
+                self._requeue(task_id, f"worker {worker_id} {reason}")
+
+    def _requeue(self, task_id: str, reason: str):
+        del self._leases[task_id]
+        task = self._tasks[task_id]
+        if self._attempts[task_id] >= self.max_attempts:
+            self.logger.error(f"Giving up on task {task_id} after {self._attempts[task_id]} attempts: {reason}")
+            self._record(task, ParallelResult(task_id=task_id, success=False, result=None,
+                                              error=f"Lease lost {self._attempts[task_id]} times ({reason})"))
+            return
+        self.logger.warning(f"Re-queueing task {task_id}: {reason}")
+        self._pending.appendleft(task)
+
+    def _reap(self):
+        """Expire leases of silent workers and of tasks past their deadline"""
+        interval = max(min(self.heartbeat_timeout / 2, 1.0), 0.05)
+        while not self._stop.wait(interval):
+            now = time.time()
+            with self._cond:
+                for task_id, (worker_id, deadline) in list(self._leases.items()):
+                    if now - self._last_seen.get(worker_id, 0) > self.heartbeat_timeout:
+                        self._requeue(task_id, f"worker {worker_id} missed heartbeats")
+                    elif now > deadline:
+                        self._requeue(task_id, "lease expired")
+            self._deliver()
+
+class _Channel:
+    """Worker side of a connection; the lock lets heartbeats share the session"""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.lock = threading.Lock()
+
+    def call(self, kind: int, payload: Any = None) -> Tuple[int, Any]:
+        with self.lock:
+            self.session.send(kind, payload)
+            reply = self.session.recv()
+        if reply is None:
+            raise ConnectionError("Coordinator closed the connection")
+        return reply
+
+def _connect(address: str, timeout: float) -> Optional[socket.socket]:
+    """Connect, retrying until ``timeout`` so workers may start before the coordinator"""
+    family, target = parse_address(address)
+    deadline = time.time() + timeout
+    while True:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(target)
+            return sock
+        except OSError:
+            sock.close()
+            if time.time() >= deadline:
+                return None
+            time.sleep(0.2)
+
+def _heartbeat(channel: _Channel, stop: threading.Event, interval: float):
+    while not stop.wait(interval):
+        try:
+            channel.call(HEARTBEAT)
+        except (ConnectionError, OSError):
+            return
+
+def _run_known_task(task: ParallelTask) -> ParallelResult:
+    return _WORKER_FUNCTIONS[task.task_type](task)
+
+def run_worker(address: str,
+               db_path: Optional[str] = None,
+               worker_id: Optional[str] = None,
+               heartbeat_interval: float = 5.0,
+               connect_timeout: float = 30.0,
+               persistent: bool = False,
+               task_runner: Optional[Callable[[ParallelTask], ParallelResult]] = None,
+               authkey: Optional[Any] = None) -> int:
+    """Pull tasks from a coordinator until the run ends; returns tasks completed.
+
+    ``db_path`` overrides the coordinator's path for hosts with their own
+    copy of the database. A ``persistent`` worker reconnects after each run
+    to join the next one. ``task_runner`` replaces the built-in worker
+    functions and their DuckDB setup. ``authkey`` defaults to the
+    ``PARALLEL_ENGINE_AUTHKEY`` environment variable.
+    """
+    authkey = resolve_authkey(authkey)
+    if authkey is None:
+        raise ValueError(f"No authkey given and {AUTHKEY_ENV} is not set")
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    completed = 0
+    while True:
+        sock = _connect(address, connect_timeout)
+        if sock is None:
+            break
+        try:
+            channel = _Channel(open_session(sock, authkey))
+            completed += _serve_connection(channel, worker_id, db_path, heartbeat_interval, task_runner)
+        except mp.AuthenticationError as e:
+            logger.error(f"Worker {worker_id} could not authenticate: {str(e)}")
+            break
+        except (ConnectionError, OSError) as e:
+            logger.warning(f"Worker {worker_id} lost coordinator: {str(e)}")
+        finally:
+            sock.close()
+        if not persistent:
+            break
+    return completed
+
+def _serve_connection(channel: _Channel,
+                      worker_id: str,
+                      db_path: Optional[str],
+                      heartbeat_interval: float,
+                      task_runner: Optional[Callable[[ParallelTask], ParallelResult]]) -> int:
+    _, config = channel.call(HELLO, worker_id)
+    if task_runner is None:
+        _init_parallel_worker(db_path or config['db_path'], config.get('strategy_config'), config.get('backtest_config'),
+                              payload_dir=config.get('payload_dir'), compact_results=config.get('compact_results', False))
+        task_runner = _run_known_task
+
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(channel, stop, heartbeat_interval), daemon=True).start()
+    completed = 0
+    try:
+        while True:
+            kind, payload = channel.call(REQUEST)
+            if kind == WAIT:
+                time.sleep(payload)
+                continue
+            if kind != TASK:
+                return completed
+            channel.call(RESULT, task_runner(payload))
+            completed += 1
+    finally:
+        stop.set()
+
+def main():
+    """Command line entry point for a worker process"""
+    parser = argparse.ArgumentParser(description='Distributed ParallelEngine worker')
+    parser.add_argument('--connect', required=True, help='Coordinator address (host:port or unix:/path)')
+    parser.add_argument('--db-path', help='Local database path (defaults to the coordinator\'s)')
+    parser.add_argument('--processes', type=int, default=1, help='Worker processes to start on this host')
+    parser.add_argument('--persistent', action='store_true', help='Stay connected across runs')
+    args = parser.parse_args()
+    if resolve_authkey() is None:
+        parser.error(f"set {AUTHKEY_ENV} to the coordinator's shared secret")
+
+    logging.basicConfig(level=logging.INFO)
+    processes = [mp.Process(target=run_worker, args=(args.connect, args.db_path),
+                            kwargs={'persistent': args.persistent})
+                 for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 import json
 import os
 import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 # Add project root to path for imports
@@ -17,7 +19,12 @@ sys.path.append(str(project_root))
 
 from core.data_engine.duckdb_handler import DuckDBHandler
 from core.ta_engine.unified_strategy_engine import UnifiedStrategyEngine, UnifiedStrategyConfig
-from core.backtesting.backtest_engine import BacktestEngine, BacktestConfig
+from core.backtesting.backtest_engine import BacktestEngine, BacktestConfig, BacktestResult
+from core.backtesting.portfolio import PortfolioBacktester, PortfolioResult
+from core.multiprocessing.shared_bars import SharedBarStore, SharedBarReader, SharedBarsHandle
+from core.multiprocessing.scheduling import plan_batches, schedule_report
+from core.multiprocessing.result_sink import ParquetResultSink, PayloadStore, summarize_result
+from core.telemetry import TaskTelemetry, stage, summarize_telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -44,13 +51,160 @@ class ParallelResult:
     result: Any
     error: Optional[str] = None
     processing_time: float = 0.0
+    payload_key: Optional[str] = None  # Full result in the PayloadStore when ``result`` is a summary
+    record: Optional[Dict[str, Any]] = None  # backtest_results row built in the worker, stored by the parent
+    telemetry: Optional[Dict[str, Any]] = None  # TaskTelemetry.as_dict(): CPU, RSS growth, bars loaded, stage times
+
+# Per-process state set by the pool initializer, so connections and engines are built once per worker
+_worker_state: Dict[str, Any] = {}
+
+def _init_parallel_worker(db_path: str,
+                          strategy_config: Optional[UnifiedStrategyConfig],
+                          backtest_config: Optional[BacktestConfig],
+                          shared_bars: Optional[SharedBarsHandle] = None,
+                          payload_dir: Optional[str] = None,
+                          compact_results: bool = False):
+    """Pool initializer: one bar source and one set of engines per worker process.
+
+    Bars come from shared memory when the parent published them, otherwise
+    from a read-only DuckDB connection. With ``compact_results`` tasks
+    return summaries, and full results are kept in ``payload_dir`` if given.
+    """
+    if shared_bars is not None:
+        db_handler = SharedBarReader(shared_bars)
+    else:
+        db_handler = DuckDBHandler(db_path, read_only=True, threads=1)
+    _worker_state['db_handler'] = db_handler
+    _worker_state['strategy_engine'] = UnifiedStrategyEngine(strategy_config or UnifiedStrategyConfig())
+    _worker_state['backtest_engine'] = BacktestEngine(db_handler, backtest_config)
+    _worker_state['compact_results'] = compact_results
+    _worker_state['payload_store'] = PayloadStore(payload_dir) if payload_dir and compact_results else None
+
+def _backtest_row(result: Any) -> Optional[Dict[str, Any]]:
+    """backtest_results row for a backtest or an optimization's best result"""
+    if isinstance(result, dict):
+        result = result.get('best_result')
+    if isinstance(result, BacktestResult):
+        return BacktestEngine._result_row(result)
+    return None
+
+def _run_task(task: ParallelTask, body: Callable[[ParallelTask], Any]) -> ParallelResult:
+    """Time a task body and wrap its outcome in a ParallelResult"""
+    start_time = time.time()
+    telemetry = TaskTelemetry()
+    try:
+        with telemetry:
+            result = body(task)
+            with stage('store'):
+                record = _backtest_row(result)
+            payload_key = None
+            if _worker_state.get('compact_results'):
+                # Only the summary and the row to persist cross the process boundary
+                payload_store = _worker_state.get('payload_store')
+                if payload_store is not None:
+                    with stage('store'):
+                        payload_key = payload_store.put(task.task_id, result)
+                result = summarize_result(result)
+        return ParallelResult(
+            task_id=task.task_id,
+            success=True,
+            result=result,
+            processing_time=time.time() - start_time,
+            payload_key=payload_key,
+            record=record,
+            telemetry=telemetry.as_dict()
+        )
+    except Exception as e:
+        return ParallelResult(
+            task_id=task.task_id,
+            success=False,
+            result=None,
+            error=str(e),
+            processing_time=time.time() - start_time,
+            telemetry=telemetry.as_dict()
+        )
+
+def _screening_body(task: ParallelTask) -> Dict[str, Any]:
+    strategy_engine = _worker_state['strategy_engine']
+    
+    # Load data
+    data = _worker_state['db_handler'].get_bars(task.symbol, task.timeframe, task.start_date, task.end_date)
+    if data.empty:
+        raise ValueError(f"No data found for {task.symbol} {task.timeframe}")
+    
+    # Run analysis
+    analysis_results = strategy_engine.run_comprehensive_analysis(data)
+    
+    # Get latest signals
+    latest_signals = strategy_engine.get_latest_signals(data, lookback_periods=10)
+    
+    return {
+        'symbol': task.symbol,
+        'timeframe': task.timeframe,
+        'analysis_results': analysis_results,
+        'latest_signals': latest_signals,
+        'data_points': len(data)
+    }
+
+def _backtesting_body(task: ParallelTask) -> BacktestResult:
+    return _worker_state['backtest_engine'].run_backtest(
+        task.symbol,
+        task.timeframe,
+        task.start_date,
+        task.end_date,
+        task.parameters.get('strategy_config'),
+        store_results=False
+    )
+
+def _optimization_body(task: ParallelTask) -> Dict[str, Any]:
+    return _worker_state['backtest_engine'].run_optimization(
+        task.symbol,
+        task.timeframe,
+        task.start_date,
+        task.end_date,
+        task.parameters.get('param_ranges', {}),
+        store_results=False
+    )
+
+def _screening_worker(task: ParallelTask) -> ParallelResult:
+    """Worker function for screening tasks"""
+    return _run_task(task, _screening_body)
+
+def _backtesting_worker(task: ParallelTask) -> ParallelResult:
+    """Worker function for backtesting tasks"""
+    return _run_task(task, _backtesting_body)
+
+def _optimization_worker(task: ParallelTask) -> ParallelResult:
+    """Worker function for optimization tasks"""
+    return _run_task(task, _optimization_body)
+
+def _batch_worker(worker_func: Callable[[ParallelTask], ParallelResult], tasks: List[ParallelTask]) -> List[ParallelResult]:
+    """Run several cheap tasks in one submission to amortize IPC"""
+    return [worker_func(task) for task in tasks]
 
 class ParallelEngine:
     """Multiprocessing engine for parallel trading analysis"""
     
-    def __init__(self, max_workers: int = None, db_path: str = "trading_data.duckdb"):
+    def __init__(self, 
+                 max_workers: int = None, 
+                 db_path: str = "trading_data.duckdb", 
+                 use_shared_memory: bool = False,
+                 batch_cost: float = 20000,
+                 coordinator_address: Optional[str] = None,
+                 local_workers: int = 0,
+                 compact_results: bool = True,
+                 payload_dir: Optional[str] = None,
+                 authkey: Optional[bytes] = None):
         self.max_workers = max_workers or min(mp.cpu_count(), 8)
         self.db_path = db_path
+        self.use_shared_memory = use_shared_memory  # Load bars once in the parent and share them with workers
+        self.batch_cost = batch_cost  # Tasks estimated below this many bar-evaluations are packed together
+        self.last_schedule: Optional[Dict[str, Any]] = None
+        self.coordinator_address = coordinator_address  # Serve tasks to socket workers (host:port or unix:/path) instead of a local pool
+        self.local_workers = local_workers  # Socket workers to start on this host alongside remote ones
+        self.authkey = authkey  # Coordinator secret; defaults to PARALLEL_ENGINE_AUTHKEY, or a random key for local workers
+        self.compact_results = compact_results  # Workers return summaries instead of full results
+        self.payload_dir = payload_dir  # Opt-in: compact runs keep full results here for load_payload; the caller owns it
         self.logger = logger
         
         # Initialize database handler
@@ -63,7 +217,8 @@ class ParallelEngine:
                              timeframes: List[str],
                              start_date: datetime,
                              end_date: datetime,
-                             strategy_config: UnifiedStrategyConfig = None) -> Dict[str, ParallelResult]:
+                             strategy_config: UnifiedStrategyConfig = None,
+                             result_sink: Optional[ParquetResultSink] = None) -> Dict[str, ParallelResult]:
         """Run parallel screening across multiple symbols and timeframes"""
         
         self.logger.info(f"Starting parallel screening for {len(symbols)} symbols across {len(timeframes)} timeframes")
@@ -85,9 +240,9 @@ class ParallelEngine:
                 tasks.append(task)
         
         # Run parallel processing
-        results = self._run_parallel_tasks(tasks, self._screening_worker)
+        results = self._run_parallel_tasks(tasks, _screening_worker, strategy_config, result_sink=result_sink)
         
-        self.logger.info(f"Parallel screening completed: {len([r for r in results.values() if r.success])} successful tasks")
+        self.logger.info(f"Parallel screening completed: {self._successful_tasks(results, result_sink)} successful tasks")
         return results
     
     def run_parallel_backtesting(self,
@@ -96,7 +251,8 @@ class ParallelEngine:
                                start_date: datetime,
                                end_date: datetime,
                                strategy_config: UnifiedStrategyConfig = None,
-                               backtest_config: BacktestConfig = None) -> Dict[str, ParallelResult]:
+                               backtest_config: BacktestConfig = None,
+                               result_sink: Optional[ParquetResultSink] = None) -> Dict[str, ParallelResult]:
         """Run parallel backtesting across multiple symbols and timeframes"""
         
         self.logger.info(f"Starting parallel backtesting for {len(symbols)} symbols across {len(timeframes)} timeframes")
@@ -121,18 +277,32 @@ class ParallelEngine:
                 tasks.append(task)
         
         # Run parallel processing
-        results = self._run_parallel_tasks(tasks, self._backtesting_worker)
+        results = self._run_parallel_tasks(tasks, _backtesting_worker, strategy_config, backtest_config, result_sink)
         
-        self.logger.info(f"Parallel backtesting completed: {len([r for r in results.values() if r.success])} successful tasks")
+        self.logger.info(f"Parallel backtesting completed: {self._successful_tasks(results, result_sink)} successful tasks")
         return results
     
+    def run_portfolio_backtesting(self,
+                                  symbols: List[str],
+                                  timeframe: str,
+                                  start_date: datetime,
+                                  end_date: datetime,
+                                  strategy_config: UnifiedStrategyConfig = None,
+                                  backtest_config: BacktestConfig = None) -> PortfolioResult:
+        """Backtest all symbols together against one shared capital pool"""
+        self.logger.info(f"Starting portfolio backtest for {len(symbols)} symbols on {timeframe}")
+        
+        backtester = PortfolioBacktester(self.db_handler, backtest_config)
+        return backtester.run(symbols, timeframe, start_date, end_date, strategy_config)
+    
     def run_parallel_optimization(self,
                                 symbols: List[str],
                                 timeframes: List[str],
                                 start_date: datetime,
                                 end_date: datetime,
                                 param_ranges: Dict[str, List[Any]],
-                                strategy_config: UnifiedStrategyConfig = None) -> Dict[str, ParallelResult]:
+                                strategy_config: UnifiedStrategyConfig = None,
+                                result_sink: Optional[ParquetResultSink] = None) -> Dict[str, ParallelResult]:
         """Run parallel optimization across multiple symbols and timeframes"""
         
         self.logger.info(f"Starting parallel optimization for {len(symbols)} symbols across {len(timeframes)} timeframes")
@@ -157,175 +327,241 @@ class ParallelEngine:
                 tasks.append(task)
         
         # Run parallel processing
-        results = self._run_parallel_tasks(tasks, self._optimization_worker)
+        results = self._run_parallel_tasks(tasks, _optimization_worker, strategy_config, result_sink=result_sink)
         
-        self.logger.info(f"Parallel optimization completed: {len([r for r in results.values() if r.success])} successful tasks")
+        self.logger.info(f"Parallel optimization completed: {self._successful_tasks(results, result_sink)} successful tasks")
         return results
     
-    def _run_parallel_tasks(self, tasks: List[ParallelTask], worker_func: Callable) -> Dict[str, ParallelResult]:
-        """Execute tasks in parallel using ProcessPoolExecutor"""
+    def _run_parallel_tasks(self, 
+                            tasks: List[ParallelTask], 
+                            worker_func: Callable[[ParallelTask], ParallelResult],
+                            strategy_config: UnifiedStrategyConfig = None,
+                            backtest_config: BacktestConfig = None,
+                            result_sink: Optional[ParquetResultSink] = None) -> Dict[str, ParallelResult]:
+        """Execute tasks in a process pool, costliest first, with workers holding one bar source and engine set.
+
+        With a ``result_sink`` results are streamed to it as they complete and
+        only failures are returned; tasks the sink already holds are skipped.
+        Backtest rows built by the workers are stored either way.
+        """
         results = {}
+        records = []
+        if result_sink is not None:
+            completed = result_sink.start([task.task_id for task in tasks])
+            if completed:
+                tasks = [task for task in tasks if task.task_id not in completed]
+                self.logger.info(f"Resuming run: {len(completed)} tasks already completed, {len(tasks)} remaining")
+        if not tasks:
+            return results
+        costs = self._estimate_costs(tasks)
         
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_task = {executor.submit(worker_func, task): task for task in tasks}
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
-                try:
-                    result = future.result()
-                    results[task.task_id] = result
-                except Exception as e:
-                    self.logger.error(f"Error processing task {task.task_id}: {str(e)}")
-                    results[task.task_id] = ParallelResult(
-                        task_id=task.task_id,
-                        success=False,
-                        result=None,
-                        error=str(e)
-                    )
+        def on_result(task: ParallelTask, result: ParallelResult):
+            if result.record is not None:
+                records.append(result.record)
+                result.record = None
+            if result_sink is None:
+                results[result.task_id] = result
+                return
+            result_sink.write(task, result)
+            if not result.success:
+                results[result.task_id] = result
+        
+        try:
+            self._dispatch(tasks, worker_func, strategy_config, backtest_config, costs, on_result)
+        finally:
+            if result_sink is not None:
+                result_sink.flush()
+            self._store_results(records)
         
         return results
     
-    def _screening_worker(self, task: ParallelTask) -> ParallelResult:
-        """Worker function for screening tasks"""
-        import time
-        start_time = time.time()
+    def _dispatch(self,
+                  tasks: List[ParallelTask],
+                  worker_func: Callable[[ParallelTask], ParallelResult],
+                  strategy_config: UnifiedStrategyConfig,
+                  backtest_config: BacktestConfig,
+                  costs: List[float],
+                  on_result: Callable[[ParallelTask, ParallelResult], None]):
+        """Run the pool against the configured bar source"""
+        if self.coordinator_address:
+            # Local socket workers read the same file, so release it as for the pool
+            with self._released_connection():
+                self._execute_distributed(tasks, strategy_config, backtest_config, costs, on_result)
+        elif self.use_shared_memory:
+            # One bulk query in the parent; workers attach views instead of opening DuckDB
+            with SharedBarStore.from_database(
+                self.db_handler,
+                sorted({task.symbol for task in tasks}),
+                sorted({task.timeframe for task in tasks}),
+                min(task.start_date for task in tasks),
+                max(task.end_date for task in tasks)
+            ) as store:
+                self._execute_pool(tasks, worker_func, (self.db_path, strategy_config, backtest_config, store.handle, self.payload_dir, self.compact_results), costs, on_result)
+        else:
+            # DuckDB allows no other process on a file held open for writing, so
+            # the parent releases its connection while workers read
+            with self._released_connection():
+                self._execute_pool(tasks, worker_func, (self.db_path, strategy_config, backtest_config, None, self.payload_dir, self.compact_results), costs, on_result)
+    
+    def _estimate_costs(self, tasks: List[ParallelTask]) -> List[float]:
+        """Relative task costs: bars to process, times the grid size for optimizations"""
+        row_counts = self.db_handler.get_row_counts(
+            sorted({task.symbol for task in tasks}),
+            sorted({task.timeframe for task in tasks}),
+            min(task.start_date for task in tasks),
+            max(task.end_date for task in tasks)
+        )
         
-        try:
-            # Initialize components
-            db_handler = DuckDBHandler(self.db_path)
-            strategy_config = task.parameters.get('strategy_config')
-            strategy_engine = UnifiedStrategyEngine(strategy_config)
-            
-            # Load data
-            data = db_handler.get_bars(task.symbol, task.timeframe, task.start_date, task.end_date)
-            if data.empty:
-                raise ValueError(f"No data found for {task.symbol} {task.timeframe}")
-            
-            # Run analysis
-            analysis_results = strategy_engine.run_comprehensive_analysis(data)
-            
-            # Get latest signals
-            latest_signals = strategy_engine.get_latest_signals(data, lookback_periods=10)
-            
-            result = {
-                'symbol': task.symbol,
-                'timeframe': task.timeframe,
-                'analysis_results': analysis_results,
-                'latest_signals': latest_signals,
-                'data_points': len(data)
-            }
-            
-            processing_time = time.time() - start_time
-            
-            return ParallelResult(
-                task_id=task.task_id,
-                success=True,
-                result=result,
-                processing_time=processing_time
-            )
-            
-        except Exception as e:
-            processing_time = time.time() - start_time
-            return ParallelResult(
-                task_id=task.task_id,
-                success=False,
-                result=None,
-                error=str(e),
-                processing_time=processing_time
-            )
+        costs = []
+        for task in tasks:
+            cost = float(max(row_counts.get((task.symbol, task.timeframe), 0), 1))
+            if task.task_type == 'optimization':
+                param_ranges = task.parameters.get('param_ranges') or {}
+                cost *= int(np.prod([len(values) for values in param_ranges.values()])) if param_ranges else 1
+            costs.append(cost)
+        return costs
     
-    def _backtesting_worker(self, task: ParallelTask) -> ParallelResult:
-        """Worker function for backtesting tasks"""
-        import time
+    def _execute_pool(self,
+                      tasks: List[ParallelTask],
+                      worker_func: Callable[[ParallelTask], ParallelResult],
+                      initargs: Tuple,
+                      costs: List[float],
+                      on_result: Callable[[ParallelTask, ParallelResult], None]):
+        """Run tasks longest-first in a pool initialized with ``initargs``, handing each result to ``on_result``"""
+        # Several batches per worker keep the tail balanced
+        plan = plan_batches(costs, self.batch_cost, min_batches=4 * self.max_workers)
+        batches = [[tasks[k] for k in batch] for batch in plan]
+        durations = []
         start_time = time.time()
         
-        try:
-            # Initialize components
-            db_handler = DuckDBHandler(self.db_path)
-            strategy_config = task.parameters.get('strategy_config')
-            backtest_config = task.parameters.get('backtest_config')
-            
-            backtest_engine = BacktestEngine(db_handler, backtest_config)
-            
-            # Run backtest
-            result = backtest_engine.run_backtest(
-                task.symbol,
-                task.timeframe,
-                task.start_date,
-                task.end_date,
-                strategy_config
-            )
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=_init_parallel_worker,
+                                 initargs=initargs) as executor:
+            # Submit in LPT order; idle workers pull the next batch from the shared queue
+            future_to_batch = {executor.submit(_batch_worker, worker_func, batch): batch for batch in batches}
             
-            processing_time = time.time() - start_time
-            
-            return ParallelResult(
-                task_id=task.task_id,
-                success=True,
-                result=result,
-                processing_time=processing_time
-            )
-            
-        except Exception as e:
-            processing_time = time.time() - start_time
-            return ParallelResult(
-                task_id=task.task_id,
-                success=False,
-                result=None,
-                error=str(e),
-                processing_time=processing_time
-            )
+            # Collect results as they complete
+            for future in as_completed(future_to_batch):
+                batch = {task.task_id: task for task in future_to_batch[future]}
+                try:
+                    for result in future.result():
+                        durations.append(result.processing_time)
+                        on_result(batch[result.task_id], result)
+                except Exception as e:
+                    for task in batch.values():
+                        self.logger.error(f"Error processing task {task.task_id}: {str(e)}")
+                        on_result(task, ParallelResult(
+                            task_id=task.task_id,
+                            success=False,
+                            result=None,
+                            error=str(e)
+                        ))
+        
+        self.last_schedule = schedule_report(
+            time.time() - start_time,
+            durations,
+            min(self.max_workers, len(batches)),
+            len(batches)
+        )
+        self.logger.info(f"Makespan {self.last_schedule['makespan']:.2f}s vs lower bound "
+                         f"{self.last_schedule['lower_bound']:.2f}s ({self.last_schedule['efficiency']:.0%} efficient)")
     
-    def _optimization_worker(self, task: ParallelTask) -> ParallelResult:
-        """Worker function for optimization tasks"""
-        import time
+    def _execute_distributed(self,
+                             tasks: List[ParallelTask],
+                             strategy_config: UnifiedStrategyConfig,
+                             backtest_config: BacktestConfig,
+                             costs: List[float],
+                             on_result: Callable[[ParallelTask, ParallelResult], None]):
+        """Serve tasks longest-first from a coordinator; workers on any host pull them"""
+        from core.multiprocessing.distributed import TaskCoordinator, run_worker
+        
+        coordinator = TaskCoordinator(
+            self.coordinator_address,
+            {'db_path': self.db_path, 'strategy_config': strategy_config, 'backtest_config': backtest_config,
+             'payload_dir': self.payload_dir, 'compact_results': self.compact_results},
+            on_result=on_result,
+            authkey=self.authkey
+        )
+        coordinator.submit([tasks[k] for k in np.argsort(-np.asarray(costs), kind='stable')])
         start_time = time.time()
+        coordinator.start()
         
+        workers = [mp.Process(target=run_worker, args=(coordinator.address,), kwargs={'authkey': coordinator.authkey}, daemon=True)
+                   for _ in range(self.local_workers)]
+        for worker in workers:
+            worker.start()
         try:
-            # Initialize components
-            db_handler = DuckDBHandler(self.db_path)
-            strategy_config = task.parameters.get('strategy_config')
-            param_ranges = task.parameters.get('param_ranges', {})
-            
-            backtest_engine = BacktestEngine(db_handler)
-            
-            # Run optimization
-            result = backtest_engine.run_optimization(
-                task.symbol,
-                task.timeframe,
-                task.start_date,
-                task.end_date,
-                param_ranges
-            )
-            
-            processing_time = time.time() - start_time
-            
-            return ParallelResult(
-                task_id=task.task_id,
-                success=True,
-                result=result,
-                processing_time=processing_time
-            )
-            
-        except Exception as e:
-            processing_time = time.time() - start_time
-            return ParallelResult(
-                task_id=task.task_id,
-                success=False,
-                result=None,
-                error=str(e),
-                processing_time=processing_time
+            coordinator.wait()
+        finally:
+            coordinator.close()
+            for worker in workers:
+                worker.join(timeout=10)
+        
+        self.last_schedule = schedule_report(
+            time.time() - start_time,
+            coordinator.durations,
+            max(len(coordinator.workers_seen), 1),
+            len(tasks)
+        )
+        self.logger.info(f"Distributed run finished on {len(coordinator.workers_seen)} workers in "
+                         f"{self.last_schedule['makespan']:.2f}s ({self.last_schedule['efficiency']:.0%} efficient)")
+    
+    def load_payload(self, result: ParallelResult) -> Any:
+        """Full result of a task; only the summary when it was compacted without a ``payload_dir``"""
+        if result.payload_key is None:
+            return result.result
+        return PayloadStore(self.payload_dir).get(result.payload_key)
+    
+    def _store_results(self, records: List[Dict[str, Any]]):
+        """Persist worker-built backtest_results rows from the parent, which holds the only writable connection"""
+        for record in records:
+            try:
+                self.db_handler.store_backtest_result(record)
+            except Exception as e:
+                self.logger.error(f"Error storing backtest result: {str(e)}")
+    
+    def load_sink_results(self, result_sink: ParquetResultSink) -> Dict[str, ParallelResult]:
+        """Every task recorded in a sink as a ParallelResult, with its summary as the result"""
+        results = {}
+        for row in result_sink.read().itertuples(index=False):
+            success = bool(row.success)
+            results[row.task_id] = ParallelResult(
+                task_id=row.task_id,
+                success=success,
+                result=json.loads(row.summary) if success else None,
+                error=row.error if isinstance(row.error, str) else None,
+                processing_time=float(row.processing_time),
+                payload_key=row.payload_key if isinstance(row.payload_key, str) else None,
+                telemetry=json.loads(row.telemetry) or None
             )
+        return results
+    
+    def _successful_tasks(self, results: Dict[str, ParallelResult], result_sink: Optional[ParquetResultSink]) -> int:
+        """Successful task count of a run; sink runs return only failures, so count the sink"""
+        if result_sink is None:
+            return len([r for r in results.values() if r.success])
+        return int(result_sink.read()['success'].astype(bool).sum())
     
-    def aggregate_results(self, results: Dict[str, ParallelResult]) -> Dict[str, Any]:
-        """Aggregate results from parallel processing"""
+    @contextmanager
+    def _released_connection(self):
+        """Close the parent's DuckDB connection for the duration of a pool run"""
+        self.db_handler.close()
+        try:
+            yield
+        finally:
+            self.db_handler.connect()
+    
+    def aggregate_results(self, results: Dict[str, ParallelResult],
+                          result_sink: Optional[ParquetResultSink] = None) -> Dict[str, Any]:
+        """Aggregate results from parallel processing (read back from ``result_sink`` when given)"""
+        if result_sink is not None:
+            results = self.load_sink_results(result_sink)
         aggregated = {
             'total_tasks': len(results),
             'successful_tasks': len([r for r in results.values() if r.success]),
             'failed_tasks': len([r for r in results.values() if not r.success]),
             'total_processing_time': sum(r.processing_time for r in results.values()),
-            'avg_processing_time': np.mean([r.processing_time for r in results.values()]),
+            'avg_processing_time': np.mean([r.processing_time for r in results.values()]) if results else 0.0,
             'results_by_type': {},
             'errors': []
         }
@@ -349,56 +585,47 @@ class ParallelEngine:
         
         return aggregated
     
-    def generate_performance_report(self, results: Dict[str, ParallelResult]) -> Dict[str, Any]:
-        """Generate comprehensive performance report"""
+    def generate_performance_report(self, results: Dict[str, ParallelResult],
+                                    result_sink: Optional[ParquetResultSink] = None) -> Dict[str, Any]:
+        """Generate comprehensive performance report (from ``result_sink`` when given)"""
+        if result_sink is not None:
+            results = self.load_sink_results(result_sink)
+        successful_tasks = len([r for r in results.values() if r.success])
         report = {
             'summary': {
                 'total_tasks': len(results),
-                'successful_tasks': len([r for r in results.values() if r.success]),
-                'success_rate': len([r for r in results.values() if r.success]) / len(results),
+                'successful_tasks': successful_tasks,
+                'success_rate': successful_tasks / len(results) if results else 0.0,
                 'total_processing_time': sum(r.processing_time for r in results.values()),
-                'avg_processing_time': np.mean([r.processing_time for r in results.values()])
+                'avg_processing_time': np.mean([r.processing_time for r in results.values()]) if results else 0.0
             },
+            'scheduling': self.last_schedule,
+            'telemetry': summarize_telemetry({task_id: r.telemetry for task_id, r in results.items()}),
             'backtest_results': [],
             'screening_results': [],
             'optimization_results': []
         }
         
-        # Process backtest results
-        backtest_results = [r for r in results.values() if r.success and 'backtest' in r.task_id]
-        for result in backtest_results:
-            if hasattr(result.result, 'total_trades'):
-                report['backtest_results'].append({
-                    'symbol': result.result.symbol,
-                    'timeframe': result.result.timeframe,
-                    'total_trades': result.result.total_trades,
-                    'win_rate': result.result.win_rate,
-                    'total_return': result.result.total_return,
-                    'sharpe_ratio': result.result.sharpe_ratio,
-                    'max_drawdown': result.result.max_drawdown
-                })
-        
-        # Process screening results
-        screening_results = [r for r in results.values() if r.success and 'screening' in r.task_id]
-        for result in screening_results:
-            if isinstance(result.result, dict) and 'latest_signals' in result.result:
-                signal_count = sum(len(signals) for signals in result.result['latest_signals'].values())
+        # Full results and worker summaries reduce to the same records
+        for result in results.values():
+            if not result.success:
+                continue
+            summary = summarize_result(result.result, include_signals=False)
+            if 'backtest' in result.task_id and summary:
+                report['backtest_results'].append(summary)
+            elif 'screening' in result.task_id and 'signal_count' in summary:
                 report['screening_results'].append({
-                    'symbol': result.result['symbol'],
-                    'timeframe': result.result['timeframe'],
-                    'signal_count': signal_count,
-                    'data_points': result.result['data_points']
+                    'symbol': summary['symbol'],
+                    'timeframe': summary['timeframe'],
+                    'signal_count': summary['signal_count'],
+                    'data_points': summary['data_points']
                 })
-        
-        # Process optimization results
-        optimization_results = [r for r in results.values() if r.success and 'optimization' in r.task_id]
-        for result in optimization_results:
-            if isinstance(result.result, dict) and 'best_params' in result.result:
+            elif 'optimization' in result.task_id and 'best_params' in summary:
                 report['optimization_results'].append({
-                    'symbol': result.result['best_params'].get('symbol', 'unknown'),
-                    'timeframe': result.result['best_params'].get('timeframe', 'unknown'),
-                    'best_score': result.result['best_score'],
-                    'total_combinations': result.result['total_combinations']
+                    'symbol': summary['symbol'] or summary['best_params'].get('symbol', 'unknown'),
+                    'timeframe': summary['timeframe'] or summary['best_params'].get('timeframe', 'unknown'),
+                    'best_score': summary['best_score'],
+                    'total_combinations': summary['total_combinations']
                 })
         
         return report
@@ -417,7 +644,11 @@ class ParallelEngine:
                 
                 # Handle result serialization
                 if result.success and result.result is not None:
-                    if hasattr(result.result, '__dict__'):
+                    if result.payload_key is not None:
+                        serializable_results[task_id]['payload_key'] = result.payload_key
+                    if isinstance(result.result, dict):
+                        serializable_results[task_id]['result'] = result.result
+                    elif hasattr(result.result, '__dict__'):
                         serializable_results[task_id]['result'] = result.result.__dict__
                     else:
                         serializable_results[task_id]['result'] = str(result.result)
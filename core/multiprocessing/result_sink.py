@@ -0,0 +1,198 @@
+from typing import Dict, List, Optional, Any, Set
+import pandas as pd
+import duckdb
+import logging
+import json
+import os
+import pickle
+import re
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SINK_COLUMNS = ['task_id', 'task_type', 'symbol', 'timeframe', 'success', 'error',
+                'processing_time', 'completed_at', 'payload_key', 'summary', 'telemetry']
+
+BACKTEST_FIELDS = ('symbol', 'timeframe', 'total_trades', 'win_rate', 'total_return', 'sharpe_ratio', 'max_drawdown')
+
+def summarize_result(result: Any, include_signals: bool = True) -> Dict[str, Any]:
+    """Compact record of a task result: counts, headline metrics and latest signals.
+
+    Accepts full results as well as records it produced, and is stable under
+    re-summarizing, so callers need not know which one they hold.
+    """
+    if result is None:
+        return {}
+    if isinstance(result, dict) and 'best_params' in result:
+        best = result.get('best_result')
+        best_metrics = _backtest_metrics(best) if best is not None else result.get('best_metrics')
+        return {
+            'symbol': (best_metrics or {}).get('symbol', result.get('symbol')),
+            'timeframe': (best_metrics or {}).get('timeframe', result.get('timeframe')),
+            'best_params': result['best_params'],
+            'best_score': result['best_score'],
+            'total_combinations': result.get('total_combinations'),
+            'evaluated_combinations': result.get('evaluated_combinations'),
+            'best_metrics': best_metrics
+        }
+    if isinstance(result, dict) and 'latest_signals' in result:
+        latest_signals = result['latest_signals']
+        signal_counts = {name: _count_signals(signals) for name, signals in latest_signals.items()}
+        summary = {
+            'symbol': result.get('symbol'),
+            'timeframe': result.get('timeframe'),
+            'data_points': result.get('data_points', 0),
+            'signal_counts': signal_counts,
+            'signal_count': sum(signal_counts.values())
+        }
+        if include_signals:
+            summary['latest_signals'] = latest_signals
+        return summary
+    if hasattr(result, 'total_trades') or (isinstance(result, dict) and 'total_trades' in result):
+        return _backtest_metrics(result)
+    return {}
+
+def _backtest_metrics(result: Any) -> Dict[str, Any]:
+    if isinstance(result, dict):
+        return {name: result.get(name) for name in BACKTEST_FIELDS}
+    return {name: getattr(result, name, None) for name in BACKTEST_FIELDS}
+
+def _count_signals(signals: Any) -> int:
+    if isinstance(signals, dict):
+        return sum(len(values) for values in signals.values())
+    return len(signals)
+
+class PayloadStore:
+    """Full task payloads on disk, one compressed pickle per key.
+
+    Workers write here and return only a summary plus the key, so large
+    results never cross the process boundary. The directory must be shared
+    when workers run on other hosts.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def put(self, key: str, payload: Any) -> str:
+        """Store a payload and return the key to load it by"""
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', key) + '.pkl.z'
+        tmp_path = self.directory / f".{name}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 1))
+        os.replace(tmp_path, self.directory / name)
+        return name
+
+    def get(self, key: str) -> Any:
+        with open(self.directory / key, 'rb') as f:
+            return pickle.loads(zlib.decompress(f.read()))
+
+class ParquetResultSink:
+    """Append-only result store for long parallel runs.
+
+    Completed tasks are buffered and flushed as numbered Parquet parts, so
+    the parent keeps at most ``flush_rows`` results in memory. A manifest,
+    rewritten atomically after every part, lists the durable parts; tasks
+    found there with success are skipped when a run is resumed.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, directory: str, flush_rows: int = 500):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.flush_rows = max(int(flush_rows), 1)
+        self.logger = logger
+        self._buffer: List[Dict[str, Any]] = []
+        self._conn = duckdb.connect()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        path = self.directory / self.MANIFEST
+        if path.exists():
+            with open(path) as f:
+                return json.load(f)
+        return {'version': 1, 'planned_tasks': 0, 'parts': [], 'rows': 0, 'updated_at': None}
+
+    def _write_manifest(self):
+        """Replace the manifest atomically so a crash never leaves it half-written"""
+        self.manifest['updated_at'] = datetime.now().isoformat()
+        path = self.directory / self.MANIFEST
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def start(self, task_ids: List[str]) -> Set[str]:
+        """Record the planned run and return task ids already completed successfully"""
+        self.manifest['planned_tasks'] = max(self.manifest.get('planned_tasks', 0), len(task_ids))
+        self._write_manifest()
+        return self.completed_task_ids()
+
+    def completed_task_ids(self) -> Set[str]:
+        """Successful task ids in durable parts"""
+        parts = self._part_paths()
+        if not parts:
+            return set()
+        rows = self._conn.execute(
+            "SELECT DISTINCT task_id FROM read_parquet(?, union_by_name = true) WHERE success", [parts]
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def write(self, task: Any, result: Any):
+        """Buffer one ParallelResult, flushing a part when the buffer is full"""
+        self._buffer.append({
+            'task_id': result.task_id,
+            'task_type': getattr(task, 'task_type', None),
+            'symbol': getattr(task, 'symbol', None),
+            'timeframe': getattr(task, 'timeframe', None),
+            'success': bool(result.success),
+            'error': result.error,
+            'processing_time': float(result.processing_time),
+            'completed_at': pd.Timestamp.now(),
+            'payload_key': getattr(result, 'payload_key', None),
+            'summary': json.dumps(summarize_result(result.result, include_signals=False) if result.success else {}, default=str),
+            'telemetry': json.dumps(getattr(result, 'telemetry', None) or {})
+        })
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """Write buffered results as the next Parquet part"""
+        if not self._buffer:
+            return
+        frame = pd.DataFrame(self._buffer, columns=SINK_COLUMNS)
+        name = f"part-{len(self.manifest['parts']):05d}.parquet"
+        self._conn.register('sink_batch', frame)
+        try:
+            self._conn.execute(f"COPY sink_batch TO '{self.directory / name}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+        finally:
+            self._conn.unregister('sink_batch')
+
+        self.manifest['parts'].append(name)
+        self.manifest['rows'] += len(frame)
+        self._write_manifest()
+        self._buffer = []
+        self.logger.debug(f"Flushed {len(frame)} results to {name}")
+
+    def read(self) -> pd.DataFrame:
+        """Latest row per task across all durable parts"""
+        parts = self._part_paths()
+        if not parts:
+            return pd.DataFrame(columns=SINK_COLUMNS)
+        return self._conn.execute("""
+            SELECT DISTINCT ON (task_id) *
+            FROM read_parquet(?, union_by_name = true)
+            ORDER BY task_id, completed_at DESC
+        """, [parts]).df()
+
+    def _part_paths(self) -> List[str]:
+        return [str(self.directory / name) for name in self.manifest['parts']]
+
+    def close(self):
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,58 @@
+from typing import Dict, List, Any, Sequence
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+def plan_batches(costs: Sequence[float], batch_cost: float, min_batches: int = 1) -> List[List[int]]:
+    """Longest-processing-time-first submission plan.
+
+    Items are ordered by decreasing cost; items cheaper than ``batch_cost``
+    are packed together up to ``batch_cost`` per batch so tiny tasks
+    share one round trip. The threshold is capped at the total cost divided
+    by ``min_batches`` so packing does not leave workers idle. Returns
+    batches of item positions, costliest first.
+    """
+    costs = np.asarray(costs, dtype=float)
+    order = np.argsort(-costs, kind='stable')
+    if len(costs):
+        batch_cost = min(batch_cost, costs.sum() / max(min_batches, 1))
+
+    batches = []
+    pending: List[int] = []
+    pending_cost = 0.0
+    for k in order.tolist():
+        if costs[k] >= batch_cost:
+            batches.append([k])
+            continue
+        if pending and pending_cost + costs[k] > batch_cost:
+            batches.append(pending)
+            pending, pending_cost = [], 0.0
+        pending.append(k)
+        pending_cost += costs[k]
+    if pending:
+        batches.append(pending)
+
+    # Keep LPT order across single tasks and packed batches
+    batch_costs = [costs[batch].sum() for batch in batches]
+    return [batches[i] for i in np.argsort(-np.array(batch_costs), kind='stable')]
+
+def makespan_lower_bound(durations: Sequence[float], workers: int) -> float:
+    """No schedule on ``workers`` workers can finish sooner than this"""
+    durations = np.asarray(durations, dtype=float)
+    if len(durations) == 0:
+        return 0.0
+    return float(max(durations.sum() / max(workers, 1), durations.max()))
+
+def schedule_report(makespan: float, durations: Sequence[float], workers: int, n_batches: int) -> Dict[str, Any]:
+    """Measured makespan against the ideal lower bound"""
+    lower_bound = makespan_lower_bound(durations, workers)
+    return {
+        'workers': workers,
+        'tasks': len(durations),
+        'batches': n_batches,
+        'makespan': makespan,
+        'lower_bound': lower_bound,
+        'efficiency': lower_bound / makespan if makespan > 0 else 1.0,
+        'busy_time': float(np.sum(durations))
+    }
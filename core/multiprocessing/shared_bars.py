@@ -0,0 +1,165 @@
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Any, Tuple
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field
+import logging
+from datetime import datetime
+
+from core.data_engine.duckdb_handler import DuckDBHandler
+from core.telemetry import record_load
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+@dataclass
+class SharedBarsHandle:
+    """Picklable description of bars published in shared memory.
+
+    Every column is one block holding all series back to back; ``offsets``
+    maps (symbol, timeframe) to its [start, stop) row range.
+    """
+    blocks: Dict[str, str]  # Column -> shared memory block name
+    dtypes: Dict[str, str]
+    n_rows: int
+    offsets: Dict[Tuple[str, str], Tuple[int, int]] = field(default_factory=dict)
+
+class SharedBarStore:
+    """Parent side: loads bars in one query and owns the shared memory blocks"""
+
+    def __init__(self):
+        self.handle: Optional[SharedBarsHandle] = None
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.logger = logger
+
+    @classmethod
+    def from_database(cls,
+                      db_handler: DuckDBHandler,
+                      symbols: List[str],
+                      timeframes: List[str],
+                      start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None) -> 'SharedBarStore':
+        """Publish every requested (symbol, timeframe) series with a single bulk query"""
+        query = f"""
+            SELECT symbol, timeframe, {', '.join(BAR_COLUMNS)}
+            FROM {db_handler.bars_source}
+            WHERE symbol IN ({', '.join('?' * len(symbols))})
+              AND timeframe IN ({', '.join('?' * len(timeframes))})
+        """
+        params: List[Any] = list(symbols) + list(timeframes)
+        range_filter, range_params = db_handler._range_filter(start_date, end_date)
+        query += range_filter
+        params += range_params
+        query += " ORDER BY symbol, timeframe, timestamp"
+
+        columns = db_handler.conn.execute(query, params).fetchnumpy()
+        store = cls()
+        store._publish(columns)
+        return store
+
+    def _publish(self, columns: Dict[str, np.ndarray]):
+        """Copy columns into shared memory and index series boundaries"""
+        symbol = np.asarray(columns['symbol'], dtype=object)
+        timeframe = np.asarray(columns['timeframe'], dtype=object)
+        n_rows = len(symbol)
+
+        # Rows are sorted by (symbol, timeframe): series start where either key changes
+        offsets = {}
+        if n_rows:
+            changes = np.flatnonzero((symbol[1:] != symbol[:-1]) | (timeframe[1:] != timeframe[:-1])) + 1
+            starts = np.concatenate(([0], changes))
+            stops = np.concatenate((changes, [n_rows]))
+            offsets = {(symbol[a], timeframe[a]): (int(a), int(b)) for a, b in zip(starts, stops)}
+
+        blocks, dtypes = {}, {}
+        try:
+            for name in BAR_COLUMNS:
+                values = np.ascontiguousarray(columns[name])
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                self._blocks.append(block)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+                blocks[name] = block.name
+                dtypes[name] = values.dtype.str
+        except Exception:
+            self.close()
+            raise
+
+        self.handle = SharedBarsHandle(blocks=blocks, dtypes=dtypes, n_rows=n_rows, offsets=offsets)
+        total_bytes = sum(block.size for block in self._blocks)
+        self.logger.info(f"Published {len(offsets)} bar series ({n_rows} rows, {total_bytes / 1e6:.1f} MB) to shared memory")
+
+    def close(self):
+        """Release and unlink the blocks (call after workers are done)"""
+        for block in self._blocks:
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class SharedBarReader:
+    """Worker side: zero-copy views over a SharedBarsHandle.
+
+    Exposes ``get_bars`` with the DuckDBHandler signature, so engines can use
+    it in place of a database connection.
+    """
+
+    def __init__(self, handle: SharedBarsHandle):
+        self.handle = handle
+        self.logger = logger
+        self._blocks = []
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, block_name in handle.blocks.items():
+            block = _attach(block_name)
+            self._blocks.append(block)
+            self.columns[name] = np.ndarray((handle.n_rows,), dtype=np.dtype(handle.dtypes[name]), buffer=block.buf)
+
+    def get_bars(self, symbol: str, timeframe: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """Bars of one series as a DataFrame over shared memory (read-only)"""
+        span = self.handle.offsets.get((symbol, timeframe))
+        if span is None:
+            return pd.DataFrame()
+
+        a, b = span
+        timestamps = self.columns['timestamp'][a:b]
+        if start:
+            a += int(np.searchsorted(timestamps, np.datetime64(pd.Timestamp(start).tz_localize(None), 'ns'), side='left'))
+        if end:
+            b = span[0] + int(np.searchsorted(timestamps, np.datetime64(pd.Timestamp(end).tz_localize(None), 'ns'), side='right'))
+        if b <= a:
+            return pd.DataFrame()
+
+        views = {}
+        for name in BAR_COLUMNS[1:]:
+            view = self.columns[name][a:b]
+            view.flags.writeable = False
+            views[name] = view
+        index = pd.DatetimeIndex(self.columns['timestamp'][a:b], name='timestamp')
+        bars = pd.DataFrame(views, index=index, copy=False)
+        record_load(bars)
+        return bars
+
+    def close(self):
+        self.columns = {}
+        for block in self._blocks:
+            block.close()
+        self._blocks = []
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a block owned by the parent.
+
+    Pool workers share the parent's resource tracker, so attaching must not
+    unregister the block; on Python 3.13+ tracking is skipped entirely.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
@@ -0,0 +1,304 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field, replace
+import logging
+import time
+from datetime import datetime
+
+from core.ta_engine.unified_strategy_engine import UnifiedStrategyConfig
+from core.ta_engine.analysis_cache import AnalysisCache, AnalysisCacheConfig, StageCache
+from core.ta_engine.config_fingerprint import apply_overrides
+from core.backtesting.backtest_engine import BacktestEngine, BacktestConfig, BacktestResult
+from core.backtesting.batch_simulator import BATCH_PARAMETERS
+from core.optimization.search import SearchConfig
+from core.multiprocessing.parallel_engine import ParallelEngine, ParallelResult
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class WalkForwardConfig:
+    """Configuration for walk-forward optimization"""
+    train_bars: int = 2000
+    test_bars: int = 500
+    step_bars: int = None  # Defaults to test_bars (back-to-back test windows)
+    anchored: bool = False  # Anchored folds always train from the first bar
+    search: SearchConfig = None
+    backtest_config: BacktestConfig = None
+    analysis_cache_dir: Optional[str] = None  # Shared on-disk analysis cache for all workers
+
+    def __post_init__(self):
+        if self.step_bars is None:
+            self.step_bars = self.test_bars
+        if self.search is None:
+            self.search = SearchConfig()
+        if self.backtest_config is None:
+            self.backtest_config = BacktestConfig()
+
+@dataclass
+class WalkForwardFold:
+    """Train/test bar ranges of one fold (positions are inclusive-exclusive)"""
+    fold_id: int
+    train_start: int
+    train_end: int
+    test_end: int
+
+    @property
+    def cost(self) -> int:
+        """Relative optimization cost, dominated by the training window"""
+        return self.train_end - self.train_start
+
+@dataclass
+class WalkForwardResult:
+    """Stitched out-of-sample outcome of a walk-forward run"""
+    symbol: str
+    timeframe: str
+    folds: List[Dict[str, Any]]
+    oos_equity: pd.Series
+    total_return: float
+    max_drawdown: float
+    total_trades: int
+    win_rate: float
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+def make_folds(n_bars: int,
+               train_bars: int,
+               test_bars: int,
+               step_bars: Optional[int] = None,
+               anchored: bool = False) -> List[WalkForwardFold]:
+    """Rolling or anchored train/test folds over ``n_bars`` bars"""
+    step_bars = step_bars or test_bars
+    if train_bars <= 0 or test_bars <= 0 or step_bars <= 0:
+        raise ValueError("train_bars, test_bars and step_bars must be positive")
+
+    folds = []
+    train_end = train_bars
+    while train_end < n_bars:
+        folds.append(WalkForwardFold(
+            fold_id=len(folds),
+            train_start=0 if anchored else train_end - train_bars,
+            train_end=train_end,
+            test_end=min(train_end + test_bars, n_bars)
+        ))
+        train_end += step_bars
+    return folds
+
+# Per-process state set by the pool initializer, so bars ship once per worker
+_worker_state: Dict[str, Any] = {}
+
+def _init_walk_forward_worker(data: pd.DataFrame, config: WalkForwardConfig):
+    """Pool initializer: keep bars, an engine and a stage cache for every fold this worker runs"""
+    analysis_cache = None
+    if config.analysis_cache_dir:
+        analysis_cache = AnalysisCache(AnalysisCacheConfig(cache_dir=config.analysis_cache_dir))
+
+    _worker_state['data'] = data
+    _worker_state['config'] = config
+    _worker_state['engine'] = BacktestEngine(None, config.backtest_config, analysis_cache=analysis_cache)
+    _worker_state['stage_cache'] = StageCache()
+
+def _walk_forward_fold_worker(fold: WalkForwardFold,
+                              symbol: str,
+                              timeframe: str,
+                              param_ranges: Dict[str, List[Any]]) -> ParallelResult:
+    """Optimize on the fold's training window, then trade its test window"""
+    start_time = time.time()
+    task_id = f"fold_{fold.fold_id}"
+
+    try:
+        data = _worker_state['data']
+        config = _worker_state['config']
+        engine = _worker_state['engine']
+        stage_cache = _worker_state['stage_cache']
+
+        train = data.iloc[fold.train_start:fold.train_end]
+        optimization = engine.run_optimization(
+            symbol, timeframe, train.index[0], train.index[-1], param_ranges,
+            search=config.search, data=train, stage_cache=stage_cache, store_results=False
+        )
+        best_params = optimization['best_params']
+        if best_params is None:
+            raise ValueError("No parameter combination could be evaluated")
+
+        # Out-of-sample: analysis sees the training history, trades only the test bars
+        risk_params = {k: v for k, v in best_params.items() if k in BATCH_PARAMETERS}
+        strategy_config = apply_overrides(
+            UnifiedStrategyConfig(), {k: v for k, v in best_params.items() if k not in BATCH_PARAMETERS}
+        )
+        test_engine = BacktestEngine(None, replace(config.backtest_config, **risk_params), engine.analysis_cache)
+        oos = test_engine.run_backtest_on_data(
+            data.iloc[fold.train_start:fold.test_end], symbol, timeframe, strategy_config,
+            trade_start=data.index[fold.train_end],
+            stop_loss_pct=risk_params.get('stop_loss_pct'),
+            take_profit_pct=risk_params.get('take_profit_pct'),
+            stage_cache=stage_cache
+        )
+
+        return ParallelResult(
+            task_id=task_id,
+            success=True,
+            result={
+                'fold': fold,
+                'best_params': best_params,
+                'in_sample_score': optimization['best_score'],
+                'oos_result': oos
+            },
+            processing_time=time.time() - start_time
+        )
+
+    except Exception as e:
+        return ParallelResult(
+            task_id=task_id,
+            success=False,
+            result=None,
+            error=str(e),
+            processing_time=time.time() - start_time
+        )
+
+class WalkForwardEngine:
+    """Walk-forward optimization with folds run concurrently in a process pool"""
+
+    def __init__(self, parallel_engine: ParallelEngine, config: WalkForwardConfig = None):
+        self.parallel_engine = parallel_engine
+        self.config = config or WalkForwardConfig()
+        self.logger = logger
+
+    def run(self,
+            symbol: str,
+            timeframe: str,
+            start_date: datetime,
+            end_date: datetime,
+            param_ranges: Dict[str, List[Any]]) -> WalkForwardResult:
+        """Optimize each fold in-sample and stitch the out-of-sample equity curves"""
+        data = self.parallel_engine.db_handler.get_bars(symbol, timeframe, start_date, end_date)
+        if data.empty:
+            raise ValueError(f"No data found for {symbol} {timeframe}")
+
+        folds = make_folds(len(data), self.config.train_bars, self.config.test_bars,
+                           self.config.step_bars, self.config.anchored)
+        if not folds:
+            raise ValueError(f"Need more than {self.config.train_bars} bars for walk-forward, got {len(data)}")
+
+        self.logger.info(f"Running {len(folds)} walk-forward folds for {symbol} {timeframe}")
+        results = self._run_folds(data, folds, symbol, timeframe, param_ranges)
+        return self._stitch(symbol, timeframe, folds, results)
+
+    def _run_folds(self,
+                   data: pd.DataFrame,
+                   folds: List[WalkForwardFold],
+                   symbol: str,
+                   timeframe: str,
+                   param_ranges: Dict[str, List[Any]]) -> Dict[int, ParallelResult]:
+        """Submit folds longest-first so uneven fold costs still fill every worker"""
+        results = {}
+        ordered = sorted(folds, key=lambda fold: fold.cost, reverse=True)
+        max_workers = min(self.parallel_engine.max_workers, len(folds))
+
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_walk_forward_worker,
+                                 initargs=(data, self.config)) as executor:
+            future_to_fold = {
+                executor.submit(_walk_forward_fold_worker, fold, symbol, timeframe, param_ranges): fold
+                for fold in ordered
+            }
+
+            for future in as_completed(future_to_fold):
+                fold = future_to_fold[future]
+                try:
+                    results[fold.fold_id] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error processing fold {fold.fold_id}: {str(e)}")
+                    results[fold.fold_id] = ParallelResult(
+                        task_id=f"fold_{fold.fold_id}",
+                        success=False,
+                        result=None,
+                        error=str(e)
+                    )
+
+        return results
+
+    def _stitch(self,
+                symbol: str,
+                timeframe: str,
+                folds: List[WalkForwardFold],
+                results: Dict[int, ParallelResult]) -> WalkForwardResult:
+        """Chain test-window equity curves by compounding each fold's return.
+
+        When test windows overlap, each fold contributes only the bars after
+        the previous fold's last one, compounded from its own equity at that
+        point, and only the trades it entered there.
+        """
+        capital = self.config.backtest_config.initial_capital
+        segments = []
+        fold_summaries = []
+        errors = []
+        total_trades = 0
+        winning_trades = 0
+        last_timestamp = None
+
+        for fold in folds:
+            result = results.get(fold.fold_id)
+            if result is None or not result.success:
+                errors.append({'fold_id': fold.fold_id, 'error': result.error if result else 'missing'})
+                continue
+
+            oos: BacktestResult = result.result['oos_result']
+            curve = oos.equity_curve
+            base = curve.iloc[0]
+            completed = oos.ledger.completed
+            if last_timestamp is not None:
+                # Overlapping test windows count once: continue from this fold's equity at the trim point
+                before = curve[curve.index <= last_timestamp]
+                if len(before):
+                    base = before.iloc[-1]
+                curve = curve[curve.index > last_timestamp]
+                completed = completed[oos.ledger.index[completed['entry_idx']] > last_timestamp]
+            if curve.empty:
+                continue
+
+            scaled = curve / base * capital
+            capital = float(scaled.iloc[-1])
+            last_timestamp = curve.index[-1]
+            segments.append(scaled)
+
+            total_trades += len(completed)
+            winning_trades += int((completed['pnl'] > 0).sum())
+            fold_summaries.append({
+                'fold_id': fold.fold_id,
+                'train_bars': fold.train_end - fold.train_start,
+                'best_params': result.result['best_params'],
+                'in_sample_score': result.result['in_sample_score'],
+                'oos_total_return': oos.total_return,
+                'oos_sharpe_ratio': oos.sharpe_ratio,
+                'oos_max_drawdown': oos.max_drawdown,
+                'oos_trades': oos.total_trades,
+                'test_start': oos.start_date,
+                'test_end': oos.end_date,
+                'processing_time': result.processing_time
+            })
+
+        oos_equity = pd.concat(segments) if segments else pd.Series(dtype=float)
+        if len(oos_equity):
+            equity = oos_equity.to_numpy(dtype=float)
+            peak = np.maximum.accumulate(equity)
+            max_drawdown = float(((equity - peak) / peak).min())
+            total_return = float(equity[-1] / self.config.backtest_config.initial_capital - 1)
+        else:
+            max_drawdown = 0.0
+            total_return = 0.0
+
+        for error in errors:
+            self.logger.warning(f"Walk-forward fold {error['fold_id']} failed: {error['error']}")
+
+        return WalkForwardResult(
+            symbol=symbol,
+            timeframe=timeframe,
+            folds=fold_summaries,
+            oos_equity=oos_equity,
+            total_return=total_return,
+            max_drawdown=max_drawdown,
+            total_trades=total_trades,
+            win_rate=winning_trades / total_trades if total_trades else 0.0,
+            errors=errors
+        )
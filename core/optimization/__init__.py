@@ -1,4 +1,5 @@
 # Make optimization directory a Python package
 from .flag_pattern_optimizer import FlagPatternOptimizer
+from .search import SearchConfig, SearchResult, create_search_strategy
 
-__all__ = ['FlagPatternOptimizer'] 
\ No newline at end of file
+__all__ = ['FlagPatternOptimizer', 'SearchConfig', 'SearchResult', 'create_search_strategy']
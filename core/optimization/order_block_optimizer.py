@@ -1,14 +1,17 @@
 import pandas as pd
 import numpy as np
 import vectorbt as vbt
+from typing import Optional
 from core.ta_engine.patterns.order_block import OrderBlockDetector, OrderBlockConfig
 from core.data_engine.sql_database import SQLDatabaseHandler
+from core.optimization.search import SearchConfig, create_search_strategy, data_slice_length
 
 class OrderBlockOptimizer:
     """Optimizer for Order Block pattern detection strategy"""
     
     def __init__(self, db: SQLDatabaseHandler):
         self.db = db
+        self.last_search = None
     
     def generate_param_space(self) -> dict:
         """Generate parameter space for optimization"""
@@ -22,8 +25,18 @@ class OrderBlockOptimizer:
             'min_confidence': [0.3, 0.4, 0.5, 0.6, 0.7]           # Confidence threshold
         }
     
-    def run_optimization(self, symbol: str, timeframe: str, start_date: str, end_date: str):
-        """Run optimization for the given symbol and time range"""
+    def run_optimization(self, 
+                         symbol: str, 
+                         timeframe: str, 
+                         start_date: str, 
+                         end_date: str,
+                         search: Optional[SearchConfig] = None):
+        """Run optimization for the given symbol and time range.
+        
+        ``search`` selects the search strategy (exhaustive grid by default);
+        random, successive-halving and TPE searches evaluate a fraction of the
+        grid. Parameter sets evaluated on the full range are stored.
+        """
         # Get data
         df = self.db.get_bars(symbol, timeframe, start_date, end_date)
         
@@ -36,96 +49,70 @@ class OrderBlockOptimizer:
             end_date=end_date
         )
         
-        # Generate parameter combinations
-        param_space = self.generate_param_space()
+        def objective(params: dict, fraction: float) -> float:
+            window = df.iloc[:data_slice_length(len(df), fraction)]
+            metrics = self._run_single_backtest(window, params)
+            
+            # Only full-range evaluations are comparable across parameter sets
+            if fraction >= 1.0:
+                self.db.store_parameter_set(run_id=run_id, parameters=params, metrics=metrics)
+            return metrics['sharpe_ratio']
         
-        # Test each parameter combination
-        for min_imbalance in param_space['min_imbalance']:
-            for max_age_bars in param_space['max_age_bars']:
-                for min_volume_ratio in param_space['min_volume_ratio']:
-                    for min_candle_size in param_space['min_candle_size']:
-                        for max_candle_size in param_space['max_candle_size']:
-                            for lookback_period in param_space['lookback_period']:
-                                for min_confidence in param_space['min_confidence']:
-                                    # Create config
-                                    config = OrderBlockConfig(
-                                        min_imbalance=min_imbalance,
-                                        max_age_bars=max_age_bars,
-                                        min_volume_ratio=min_volume_ratio,
-                                        min_candle_size=min_candle_size,
-                                        max_candle_size=max_candle_size,
-                                        lookback_period=lookback_period,
-                                        min_confidence=min_confidence
-                                    )
-                                    
-                                    # Run backtest with this config
-                                    detector = OrderBlockDetector(config)
-                                    entry_signals = pd.Series(0, index=df.index)
-                                    exit_signals = pd.Series(0, index=df.index)
-                                    
-                                    for i in range(len(df)):
-                                        data = {
-                                            'High': df['high'].values,
-                                            'Low': df['low'].values,
-                                            'Close': df['close'].values,
-                                            'Volume': df['volume'].values,
-                                            'timestamp': df.index.values
-                                        }
-                                        pattern = detector.detect(data, i)
-                                        if pattern:
-                                            if pattern.pattern_type == 'BULLISH_ORDER_BLOCK':
-                                                entry_signals.iloc[i] = 1
-                                                # Exit after N bars
-                                                exit_idx = min(i + 5, len(df) - 1)
-                                                exit_signals.iloc[exit_idx] = 1
-                                            elif pattern.pattern_type == 'BEARISH_ORDER_BLOCK':
-                                                entry_signals.iloc[i] = -1
-                                                # Exit after N bars
-                                                exit_idx = min(i + 5, len(df) - 1)
-                                                exit_signals.iloc[exit_idx] = 1
-                                    
-                                    # Run vectorbt backtest
-                                    portfolio = vbt.Portfolio.from_signals(
-                                        close=df['close'],
-                                        entries=entry_signals == 1,
-                                        exits=exit_signals == 1,
-                                        short_entries=entry_signals == -1,
-                                        short_exits=exit_signals == 1,
-                                        size=0.1,  # Use 10% of portfolio per trade
-                                        size_type='percent',
-                                        init_cash=100000,
-                                        fees=0.001,
-                                        freq='1D'
-                                    )
-                                    
-                                    # Calculate metrics
-                                    total_return = portfolio.total_return()
-                                    sharpe_ratio = portfolio.sharpe_ratio()
-                                    sortino_ratio = portfolio.sortino_ratio()
-                                    max_drawdown = portfolio.max_drawdown()
-                                    
-                                    # Store parameters and results
-                                    self.db.store_parameter_set(
-                                        run_id=run_id,
-                                        parameters={
-                                            'min_imbalance': min_imbalance,
-                                            'max_age_bars': max_age_bars,
-                                            'min_volume_ratio': min_volume_ratio,
-                                            'min_candle_size': min_candle_size,
-                                            'max_candle_size': max_candle_size,
-                                            'lookback_period': lookback_period,
-                                            'min_confidence': min_confidence
-                                        },
-                                        metrics={
-                                            'total_return': total_return,
-                                            'sharpe_ratio': sharpe_ratio,
-                                            'sortino_ratio': sortino_ratio,
-                                            'max_drawdown': max_drawdown
-                                        }
-                                    )
+        search_result = create_search_strategy(search).run(self.generate_param_space(), objective)
+        self.last_search = search_result
         
         return run_id
     
+    def _run_single_backtest(self, df: pd.DataFrame, params: dict) -> dict:
+        """Backtest one parameter set and return its metrics"""
+        # Run backtest with this config
+        detector = OrderBlockDetector(OrderBlockConfig(**params))
+        entry_signals = pd.Series(0, index=df.index)
+        exit_signals = pd.Series(0, index=df.index)
+        
+        data = {
+            'High': df['high'].values,
+            'Low': df['low'].values,
+            'Close': df['close'].values,
+            'Volume': df['volume'].values,
+            'timestamp': df.index.values
+        }
+        for i in range(len(df)):
+            pattern = detector.detect(data, i)
+            if pattern:
+                if pattern.pattern_type == 'BULLISH_ORDER_BLOCK':
+                    entry_signals.iloc[i] = 1
+                    # Exit after N bars
+                    exit_idx = min(i + 5, len(df) - 1)
+                    exit_signals.iloc[exit_idx] = 1
+                elif pattern.pattern_type == 'BEARISH_ORDER_BLOCK':
+                    entry_signals.iloc[i] = -1
+                    # Exit after N bars
+                    exit_idx = min(i + 5, len(df) - 1)
+                    exit_signals.iloc[exit_idx] = 1
+        
+        # Run vectorbt backtest
+        portfolio = vbt.Portfolio.from_signals(
+            close=df['close'],
+            entries=entry_signals == 1,
+            exits=exit_signals == 1,
+            short_entries=entry_signals == -1,
+            short_exits=exit_signals == 1,
+            size=0.1,  # Use 10% of portfolio per trade
+            size_type='percent',
+            init_cash=100000,
+            fees=0.001,
+            freq='1D'
+        )
+        
+        # Calculate metrics
+        return {
+            'total_return': portfolio.total_return(),
+            'sharpe_ratio': portfolio.sharpe_ratio(),
+            'sortino_ratio': portfolio.sortino_ratio(),
+            'max_drawdown': portfolio.max_drawdown()
+        }
+    
     def get_best_parameters(self, run_id: int) -> dict:
         """Get the best performing parameters from an optimization run"""
         return self.db.get_best_parameters(run_id) 
\ No newline at end of file
@@ -0,0 +1,303 @@
+import numpy as np
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from dataclasses import dataclass, field
+import itertools
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+# objective(params, fraction) -> score; fraction is the share of the data to evaluate on
+Objective = Callable[[Dict[str, Any], float], float]
+
+@dataclass
+class SearchConfig:
+    """Configuration for parameter search strategies"""
+    method: str = "grid"  # grid, random, halving or tpe
+    max_trials: int = 100  # Full-data evaluations for random/tpe, initial configs for halving
+    seed: Optional[int] = None
+
+    # Successive halving
+    halving_eta: int = 3  # Keep the top 1/eta configs at each rung
+    min_fraction: float = 0.25  # Data share used by the first rung
+
+    # TPE sampler
+    n_startup_trials: int = 10  # Random trials before modelling
+    gamma: float = 0.25  # Share of trials treated as "good"
+    n_candidates: int = 24  # Candidates scored per suggestion
+
+    # Early stopping (shared by all methods)
+    patience: Optional[int] = None  # Stop after N full-data trials without improvement
+    min_improvement: float = 0.0
+    target_score: Optional[float] = None  # Stop once a trial reaches this score
+
+@dataclass
+class Trial:
+    """One objective evaluation"""
+    number: int
+    params: Dict[str, Any]
+    score: float
+    fraction: float = 1.0
+
+@dataclass
+class SearchResult:
+    """Outcome of a parameter search"""
+    best_params: Optional[Dict[str, Any]]
+    best_score: float
+    trials: List[Trial] = field(default_factory=list)
+    space_size: int = 0
+    stopped_early: bool = False
+
+    @property
+    def n_evaluations(self) -> int:
+        return len(self.trials)
+
+    @property
+    def full_evaluations(self) -> int:
+        return sum(1 for trial in self.trials if trial.fraction >= 1.0)
+
+class EarlyStopping:
+    """Patience and target-score stopping rule applied to full-data trials"""
+
+    def __init__(self, config: SearchConfig):
+        self.config = config
+        self.best = float('-inf')
+        self.stale = 0
+
+    def update(self, score: float) -> bool:
+        """Record a score; returns True when the search should stop"""
+        if score > self.best + self.config.min_improvement:
+            self.best = score
+            self.stale = 0
+        else:
+            self.stale += 1
+
+        if self.config.target_score is not None and score >= self.config.target_score:
+            return True
+        return self.config.patience is not None and self.stale >= self.config.patience
+
+class ParameterSpace:
+    """Discrete parameter grid addressed by mixed-radix combo indices"""
+
+    def __init__(self, param_space: Dict[str, List[Any]]):
+        self.names = list(param_space.keys())
+        self.values = [list(values) for values in param_space.values()]
+        self.sizes = [len(values) for values in self.values]
+
+    def __len__(self) -> int:
+        return int(np.prod(self.sizes)) if self.sizes else 1
+
+    def decode(self, index: int) -> Tuple[int, ...]:
+        """Per-parameter value positions for a combo index (last parameter varies fastest)"""
+        positions = []
+        for size in reversed(self.sizes):
+            index, position = divmod(index, size)
+            positions.append(position)
+        return tuple(reversed(positions))
+
+    def encode(self, positions: Tuple[int, ...]) -> int:
+        index = 0
+        for position, size in zip(positions, self.sizes):
+            index = index * size + position
+        return index
+
+    def params(self, positions: Tuple[int, ...]) -> Dict[str, Any]:
+        return {name: values[p] for name, values, p in zip(self.names, self.values, positions)}
+
+    def sample(self, rng: np.random.Generator, n: int) -> List[Tuple[int, ...]]:
+        """Distinct random combos without enumerating the grid"""
+        indices = rng.choice(len(self), size=min(n, len(self)), replace=False)
+        return [self.decode(int(i)) for i in indices]
+
+class SearchStrategy:
+    """Base class: evaluates an objective over a ParameterSpace"""
+
+    def __init__(self, config: SearchConfig = None):
+        self.config = config or SearchConfig()
+        self.logger = logger
+        self.rng = np.random.default_rng(self.config.seed)
+
+    def run(self, param_space: Dict[str, List[Any]], objective: Objective) -> SearchResult:
+        space = ParameterSpace(param_space)
+        result = SearchResult(best_params=None, best_score=float('-inf'), space_size=len(space))
+        self._search(space, objective, result)
+        self.logger.info(
+            f"{type(self).__name__} finished: {result.full_evaluations} full evaluations "
+            f"({result.n_evaluations} total) of {result.space_size} combinations, best score {result.best_score:.4f}"
+        )
+        return result
+
+    def _search(self, space: ParameterSpace, objective: Objective, result: SearchResult):
+        raise NotImplementedError
+
+    def _evaluate(self,
+                  space: ParameterSpace,
+                  positions: Tuple[int, ...],
+                  objective: Objective,
+                  result: SearchResult,
+                  fraction: float = 1.0) -> float:
+        """Call the objective, treating errors and NaN as the worst score"""
+        params = space.params(positions)
+        try:
+            score = float(objective(params, fraction))
+        except Exception as e:
+            self.logger.warning(f"Error with parameters {params}: {str(e)}")
+            score = float('-inf')
+        if math.isnan(score):
+            score = float('-inf')
+
+        result.trials.append(Trial(number=len(result.trials), params=params, score=score, fraction=fraction))
+        if fraction >= 1.0 and (result.best_params is None or score > result.best_score):
+            result.best_score = score
+            result.best_params = params
+        return score
+
+    def _run_full(self,
+                  space: ParameterSpace,
+                  candidates,
+                  objective: Objective,
+                  result: SearchResult):
+        """Evaluate candidates on all data until exhausted or early stopping triggers"""
+        stopping = EarlyStopping(self.config)
+        for positions in candidates:
+            score = self._evaluate(space, positions, objective, result)
+            if stopping.update(score):
+                result.stopped_early = True
+                break
+
+class GridSearch(SearchStrategy):
+    """Exhaustive search in itertools.product order"""
+
+    def _search(self, space: ParameterSpace, objective: Objective, result: SearchResult):
+        self._run_full(space, itertools.product(*(range(size) for size in space.sizes)), objective, result)
+
+class RandomSearch(SearchStrategy):
+    """Uniform sampling of distinct combos"""
+
+    def _search(self, space: ParameterSpace, objective: Objective, result: SearchResult):
+        self._run_full(space, space.sample(self.rng, self.config.max_trials), objective, result)
+
+class SuccessiveHalving(SearchStrategy):
+    """Successive halving over growing data slices.
+
+    Starts ``max_trials`` random configs on ``min_fraction`` of the data and
+    keeps the top 1/eta at each rung while the slice grows by eta, so only
+    the survivors are evaluated on the full data.
+    """
+
+    def _search(self, space: ParameterSpace, objective: Objective, result: SearchResult):
+        eta = max(int(self.config.halving_eta), 2)
+        survivors = space.sample(self.rng, self.config.max_trials)
+
+        fractions = []
+        fraction = min(max(self.config.min_fraction, 0.0), 1.0)
+        while fraction < 1.0 and fraction > 0:
+            fractions.append(fraction)
+            fraction *= eta
+
+        for fraction in fractions:
+            if len(survivors) <= 1:
+                break
+            scores = np.array([self._evaluate(space, p, objective, result, fraction) for p in survivors])
+            keep = max(1, len(survivors) // eta)
+            order = np.argsort(-scores, kind='stable')[:keep]
+            survivors = [survivors[k] for k in order]
+            self.logger.debug(f"Halving rung at {fraction:.0%} of data kept {keep} configs")
+
+        self._run_full(space, survivors, objective, result)
+
+class TPESearch(SearchStrategy):
+    """Tree-structured Parzen estimator over the discrete grid.
+
+    After ``n_startup_trials`` random trials, completed trials are split into
+    the top ``gamma`` share and the rest. Per-parameter categorical densities
+    (smoothed over neighbouring values) are fitted to each group, and the
+    candidate with the highest good/bad density ratio is evaluated next.
+    """
+
+    def _search(self, space: ParameterSpace, objective: Objective, result: SearchResult):
+        n_trials = min(self.config.max_trials, len(space))
+        stopping = EarlyStopping(self.config)
+        seen = set()
+        history: List[Tuple[Tuple[int, ...], float]] = []
+
+        startup = space.sample(self.rng, min(self.config.n_startup_trials, n_trials))
+        while len(history) < n_trials:
+            if startup:
+                positions = startup.pop(0)
+            else:
+                positions = self._suggest(space, history, seen)
+                if positions is None:
+                    break
+            seen.add(space.encode(positions))
+
+            score = self._evaluate(space, positions, objective, result)
+            history.append((positions, score))
+            if stopping.update(score):
+                result.stopped_early = True
+                break
+
+    def _suggest(self,
+                 space: ParameterSpace,
+                 history: List[Tuple[Tuple[int, ...], float]],
+                 seen: set) -> Optional[Tuple[int, ...]]:
+        """Pick the unseen candidate maximizing l(x)/g(x)"""
+        if len(seen) >= len(space):
+            return None
+
+        positions = np.array([p for p, _ in history])
+        scores = np.array([s for _, s in history])
+        n_good = max(1, int(math.ceil(self.config.gamma * len(history))))
+        order = np.argsort(-scores, kind='stable')
+        good, bad = positions[order[:n_good]], positions[order[n_good:]]
+
+        good_density = [self._density(good[:, d], size) for d, size in enumerate(space.sizes)]
+        bad_density = [self._density(bad[:, d], size) for d, size in enumerate(space.sizes)]
+
+        # Sample candidates from the good densities and rank by log-ratio
+        n = self.config.n_candidates
+        candidates = np.column_stack([
+            self.rng.choice(size, size=n, p=good_density[d]) for d, size in enumerate(space.sizes)
+        ])
+        ratio = np.zeros(n)
+        for d in range(len(space.sizes)):
+            ratio += np.log(good_density[d][candidates[:, d]]) - np.log(bad_density[d][candidates[:, d]])
+
+        for k in np.argsort(-ratio, kind='stable'):
+            candidate = tuple(int(v) for v in candidates[k])
+            if space.encode(candidate) not in seen:
+                return candidate
+
+        # Every candidate was already tried; fall back to an unseen random combo
+        while True:
+            candidate = space.decode(int(self.rng.integers(len(space))))
+            if space.encode(candidate) not in seen:
+                return candidate
+
+    @staticmethod
+    def _density(observed: np.ndarray, size: int) -> np.ndarray:
+        """Categorical density with a uniform prior, spread to adjacent values"""
+        counts = np.bincount(observed, minlength=size).astype(float) if len(observed) else np.zeros(size)
+        smoothed = counts.copy()
+        smoothed[1:] += 0.5 * counts[:-1]
+        smoothed[:-1] += 0.5 * counts[1:]
+        smoothed += 1.0
+        return smoothed / smoothed.sum()
+
+SEARCH_STRATEGIES = {
+    'grid': GridSearch,
+    'random': RandomSearch,
+    'halving': SuccessiveHalving,
+    'tpe': TPESearch
+}
+
+def create_search_strategy(config: SearchConfig = None) -> SearchStrategy:
+    """Instantiate the strategy named by ``config.method``"""
+    config = config or SearchConfig()
+    if config.method not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search method '{config.method}', expected one of {sorted(SEARCH_STRATEGIES)}")
+    return SEARCH_STRATEGIES[config.method](config)
+
+def data_slice_length(n_rows: int, fraction: float) -> int:
+    """Number of leading rows used for a data fraction"""
+    return max(1, min(n_rows, int(math.ceil(n_rows * fraction))))
@@ -186,8 +186,7 @@ class RealTimeSignalProcessor:
             end_date = datetime.now(timezone.utc)
             start_date = end_date - timedelta(hours=24)
             
-            data = await asyncio.to_thread(
-                self.db_handler.get_bars,
+            data = await self.db_handler.async_api().get_bars(
                 symbol,
                 timeframe,
                 start_date,
@@ -468,10 +467,7 @@ class RealTimeSignalProcessor:
                 'metadata': signal.metadata
             }
             
-            await asyncio.to_thread(
-                self.db_handler.store_pattern_match,
-                signal_data
-            )
+            await self.db_handler.async_api().store_pattern_match(signal_data)
             
         except Exception as e:
             self.logger.error(f"Error storing signal: {str(e)}")
@@ -506,15 +502,12 @@ class RealTimeSignalProcessor:
         """Get list of symbol/timeframe combinations to process"""
         try:
             # Get all available symbols from database
-            symbols = await asyncio.to_thread(self.db_handler.get_available_symbols)
+            symbols = await self.db_handler.async_api().get_available_symbols()
             
             # For each symbol, get available timeframes
             symbol_timeframes = []
             for symbol in symbols:
-                timeframes = await asyncio.to_thread(
-                    self.db_handler.get_available_timeframes,
-                    symbol
-                )
+                timeframes = await self.db_handler.async_api().get_available_timeframes(symbol)
                 
                 for timeframe in timeframes:
                     # Only process intraday timeframes for real-time signals
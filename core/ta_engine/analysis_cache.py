@@ -0,0 +1,408 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Any, Callable
+from dataclasses import dataclass, is_dataclass, fields
+from collections import OrderedDict
+from datetime import datetime, date, timedelta
+from enum import Enum
+from pathlib import Path
+import importlib
+import hashlib
+import json
+import logging
+import re
+import os
+import threading
+
+from .config_fingerprint import fingerprint, canonicalize
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class AnalysisCacheConfig:
+    """Configuration for the analysis result cache"""
+    max_entries: int = 64  # In-memory LRU capacity
+    cache_dir: Optional[str] = "data/analysis_cache"  # None disables the disk tier
+    compress: bool = True
+
+def config_digest(config: Any) -> str:
+    """Stable content hash of a (possibly nested) strategy config"""
+    if is_dataclass(config):
+        return fingerprint(config).digest
+    return hashlib.sha1(repr(canonicalize(config)).encode('utf-8')).hexdigest()
+
+def data_digest(data: pd.DataFrame) -> str:
+    """Cheap fingerprint of a bar range: first/last timestamp and row count"""
+    if data.empty:
+        return "empty"
+    return f"{data.index[0]!s}|{data.index[-1]!s}|{len(data)}"
+
+# Only classes defined in these packages are rebuilt from the disk tier
+_TRUSTED_PACKAGES = ('core.',)
+
+def _encode(value: Any) -> Any:
+    """Turn an analysis result into JSON-safe data with type tags"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item() if not isinstance(value, np.datetime64) else _encode(pd.Timestamp(value))
+    if isinstance(value, pd.Timestamp) or isinstance(value, datetime):
+        stamp = pd.Timestamp(value)
+        return {'__ts__': stamp.value if stamp.tz is None else stamp.tz_convert('UTC').value,
+                'tz': str(stamp.tz) if stamp.tz is not None else None}
+    if isinstance(value, (pd.Timedelta, timedelta)):
+        return {'__td__': pd.Timedelta(value).value}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, Enum):
+        return {'__enum__': _class_path(type(value)), 'value': _encode(value.value)}
+    if is_dataclass(value) and not isinstance(value, type):
+        return {'__dataclass__': _class_path(type(value)),
+                'fields': {f.name: _encode(getattr(value, f.name)) for f in fields(value)}}
+    if isinstance(value, pd.Series):
+        return {'__series__': _encode(value.to_numpy()), 'index': _encode(value.index), 'name': _encode(value.name)}
+    if isinstance(value, pd.DataFrame):
+        return {'__frame__': [[_encode(col), _encode(value[col].to_numpy())] for col in value.columns],
+                'index': _encode(value.index)}
+    if isinstance(value, pd.DatetimeIndex):
+        return {'__dtindex__': value.asi8.tolist(), 'unit': value.unit, 'freq': value.freqstr,
+                'tz': str(value.tz) if value.tz is not None else None, 'name': _encode(value.name)}
+    if isinstance(value, pd.Index):
+        return {'__index__': _encode(value.to_numpy()), 'name': _encode(value.name)}
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in 'biuf':
+            return {'__array__': value.tolist(), 'dtype': value.dtype.str}
+        return {'__list__': [_encode(item) for item in value.tolist()]}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(item) for item in value]}
+    if isinstance(value, (list, set)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and not key.startswith('__') for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+        return {'__dict__': [[_encode(key), _encode(item)] for key, item in value.items()]}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+def _decode(value: Any) -> Any:
+    """Inverse of ``_encode``; only trusted dataclasses and enums are rebuilt"""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if '__ts__' in value:
+        stamp = pd.Timestamp(value['__ts__'])
+        return stamp.tz_localize('UTC').tz_convert(value['tz']) if value['tz'] else stamp
+    if '__td__' in value:
+        return pd.Timedelta(value['__td__'])
+    if '__date__' in value:
+        return date.fromisoformat(value['__date__'])
+    if '__enum__' in value:
+        return _trusted_class(value['__enum__'], Enum)(_decode(value['value']))
+    if '__dataclass__' in value:
+        cls = _trusted_class(value['__dataclass__'])
+        if not is_dataclass(cls):
+            raise TypeError(f"{value['__dataclass__']} is not a dataclass")
+        instance = object.__new__(cls)
+        for name, item in value['fields'].items():
+            object.__setattr__(instance, name, _decode(item))
+        return instance
+    if '__series__' in value:
+        return pd.Series(_decode(value['__series__']), index=_decode(value['index']), name=_decode(value['name']))
+    if '__frame__' in value:
+        return pd.DataFrame({_decode(col): _decode(values) for col, values in value['__frame__']},
+                            index=_decode(value['index']))
+    if '__dtindex__' in value:
+        index = pd.DatetimeIndex(np.asarray(value['__dtindex__'], dtype=f"datetime64[{value['unit']}]"), name=_decode(value['name']))
+        if value['tz']:
+            index = index.tz_localize('UTC').tz_convert(value['tz'])
+        return pd.DatetimeIndex(index, freq=value['freq']) if value['freq'] else index
+    if '__index__' in value:
+        return pd.Index(_decode(value['__index__']), name=_decode(value['name']))
+    if '__array__' in value:
+        return np.asarray(value['__array__'], dtype=np.dtype(value['dtype']))
+    if '__list__' in value:
+        return np.asarray([_decode(item) for item in value['__list__']], dtype=object)
+    if '__tuple__' in value:
+        return tuple(_decode(item) for item in value['__tuple__'])
+    if '__dict__' in value:
+        return {_decode(key): _decode(item) for key, item in value['__dict__']}
+    return {key: _decode(item) for key, item in value.items()}
+
+def _class_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+def _trusted_class(path: str, base: type = object) -> type:
+    """Resolve ``module:QualName`` to a class from a trusted package, never a function"""
+    module_name, _, qualname = path.partition(':')
+    if not module_name.startswith(_TRUSTED_PACKAGES) or not qualname:
+        raise TypeError(f"Refusing to load {path} from the analysis cache")
+    target = importlib.import_module(module_name)
+    for part in qualname.split('.'):
+        target = getattr(target, part)
+    if not isinstance(target, type) or not issubclass(target, base):
+        raise TypeError(f"Refusing to load {path} from the analysis cache")
+    return target
+
+class AnalysisCache:
+    """Content-addressed cache for UnifiedStrategyEngine analysis results.
+
+    Two tiers: a bounded in-memory LRU and an optional on-disk NPZ tier
+    shared by every process pointing at the same ``cache_dir``. Keys embed
+    the bar range and config hash, so appended bars miss naturally; rewrites
+    of existing bars are handled by ``invalidate``, which ``attach`` wires to
+    ``DuckDBHandler.store_bars``. Returned results are shared and must be
+    treated as read-only.
+    """
+
+    def __init__(self, config: AnalysisCacheConfig = None):
+        self.config = config or AnalysisCacheConfig()
+        self.logger = logger
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {
+            'hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+
+        self.cache_dir = Path(self.config.cache_dir) if self.config.cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _series_prefix(symbol: str, timeframe: str) -> str:
+        """File-name safe prefix shared by every key of a symbol/timeframe"""
+        return re.sub(r'[^A-Za-z0-9.-]', '-', f"{symbol}_{timeframe}")
+
+    def make_key(self, symbol: str, timeframe: str, data: pd.DataFrame, strategy_config: Any) -> str:
+        """Build the cache key for an analysis input"""
+        content = f"{symbol}|{timeframe}|{data_digest(data)}|{config_digest(strategy_config)}"
+        digest = hashlib.sha1(content.encode('utf-8')).hexdigest()[:24]
+        return f"{self._series_prefix(symbol, timeframe)}_{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a result in memory, then on disk"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._memory[key]
+
+        results = self._load_from_disk(key)
+
+        with self._lock:
+            if results is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['disk_hits'] += 1
+            self._remember(key, results)
+            return results
+
+    def put(self, key: str, results: Dict[str, Any]):
+        """Store a result in both tiers"""
+        with self._lock:
+            self._remember(key, results)
+            self._stats['stores'] += 1
+
+        self._save_to_disk(key, results)
+
+    def get_or_compute(self,
+                      symbol: str,
+                      timeframe: str,
+                      data: pd.DataFrame,
+                      strategy_config: Any,
+                      compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the cached analysis for these inputs, computing it on a miss"""
+        key = self.make_key(symbol, timeframe, data, strategy_config)
+        results = self.get(key)
+        if results is not None:
+            return results
+
+        results = compute()
+        self.put(key, results)
+        return results
+
+    def invalidate(self, symbol: str, timeframe: str) -> int:
+        """Drop every cached result for a symbol/timeframe from both tiers"""
+        removed = 0
+        prefix = self._series_prefix(symbol, timeframe) + "_"
+
+        with self._lock:
+            for key in [k for k in self._memory if k.startswith(prefix)]:
+                del self._memory[key]
+                removed += 1
+
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob(f"{prefix}*.npz"):
+                try:
+                    path.unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+
+        with self._lock:
+            self._stats['invalidations'] += 1
+
+        if removed:
+            self.logger.debug(f"Invalidated {removed} cached analyses for {symbol} {timeframe}")
+        return removed
+
+    def attach(self, db_handler) -> None:
+        """Invalidate entries whenever the handler writes bars for a series"""
+        db_handler.add_write_listener(self.invalidate)
+
+    def clear(self):
+        """Remove everything from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob("*.npz"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._memory)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def _remember(self, key: str, results: Dict[str, Any]):
+        """Insert into the LRU, evicting the least recently used entries"""
+        self._memory[key] = results
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.config.max_entries:
+            self._memory.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def _save_to_disk(self, key: str, results: Dict[str, Any]):
+        """Write numeric indicator columns as arrays, everything else as tagged JSON"""
+        if self.cache_dir is None:
+            return
+
+        try:
+            arrays = {}
+            indicator_names = []
+            series_names = []
+            remainder = dict(results)
+            indicators = results.get('indicators') or {}
+            passthrough = {}
+            index = None
+
+            for name, values in indicators.items():
+                if (isinstance(values, pd.Series) and np.issubdtype(values.dtype, np.number)
+                        and (index is None or values.index.equals(index))):
+                    index = values.index if index is None else index
+                    arrays[f"ind_{len(indicator_names)}"] = values.to_numpy()
+                    indicator_names.append(name)
+                    series_names.append(values.name)
+                else:
+                    passthrough[name] = values
+
+            remainder['indicators'] = passthrough
+            meta = {
+                'indicator_names': indicator_names,
+                'series_names': _encode(series_names),
+                'index': _encode(index),
+                'remainder': _encode(remainder)
+            }
+            arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+
+            path = self._path_for(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                if self.config.compress:
+                    np.savez_compressed(f, **arrays)
+                else:
+                    np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+
+        except Exception as e:
+            self.logger.warning(f"Failed to write analysis cache entry {key}: {str(e)}")
+
+    def _load_from_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        """Rebuild a result dict from its NPZ file"""
+        if self.cache_dir is None:
+            return None
+
+        path = self._path_for(key)
+        if not path.exists():
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                meta = json.loads(archive['meta'].tobytes().decode('utf-8'))
+                index = _decode(meta['index'])
+                indicators = {
+                    name: pd.Series(archive[f"ind_{i}"], index=index, name=series_name)
+                    for i, (name, series_name) in enumerate(zip(meta['indicator_names'], _decode(meta['series_names'])))
+                }
+
+            results = _decode(meta['remainder'])
+            indicators.update(results['indicators'])
+            results['indicators'] = indicators
+            return results
+
+        except Exception as e:
+            self.logger.warning(f"Failed to read analysis cache entry {key}: {str(e)}")
+            return None
+
+class StageCache:
+    """In-memory memo of individual pipeline stage outputs.
+
+    Entries are keyed by the bar range and ``ConfigFingerprint.stage_key``,
+    so configs that differ only in one detector's section share every other
+    stage's output. Intended to be scoped to one batch of runs over the same
+    bars (e.g. an optimization); outputs are shared and must be treated as
+    read-only.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.logger = logger
+
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._stage_stats: Dict[str, Dict[str, int]] = {}
+
+    def get_or_compute(self,
+                      stage: str,
+                      stage_key: str,
+                      data: pd.DataFrame,
+                      compute: Callable[[], Any]) -> Any:
+        """Return the memoized stage output, computing it on a miss"""
+        key = f"{data_digest(data)}|{stage_key}"
+        with self._lock:
+            counters = self._stage_stats.setdefault(stage, {'hits': 0, 'misses': 0})
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                counters['hits'] += 1
+                return self._memory[key]
+            counters['misses'] += 1
+
+        output = compute()
+
+        with self._lock:
+            self._memory[key] = output
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return output
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._stage_stats.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-stage hit/miss counters"""
+        with self._lock:
+            return {stage: dict(counters) for stage, counters in self._stage_stats.items()}
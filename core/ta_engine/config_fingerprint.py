@@ -0,0 +1,160 @@
+import numpy as np
+from typing import Dict, List, Optional, Any, Tuple, Iterable
+from dataclasses import dataclass, fields, is_dataclass
+import hashlib
+import copy
+
+# UnifiedStrategyConfig fields read by each pipeline stage
+STAGE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    'indicators': ('indicator_config',),
+    'flag_patterns': ('flag_config',),
+    'order_blocks': ('order_block_config',),
+    'fvg_patterns': ('fvg_config',),
+    'choch_patterns': ('choch_config',),
+    'swing_patterns': ('swing_config',),
+    'rsi_divergences': ('divergence_config',),
+    'stock_screener': ('stock_screener_window', 'stock_screener_n_pips'),
+    'confluence': ('confluence_threshold', 'min_signals_for_confluence', 'confluence_tolerance_bars'),
+}
+
+# Stages whose outputs feed another stage
+STAGE_UPSTREAM: Dict[str, Tuple[str, ...]] = {
+    'confluence': ('flag_patterns', 'order_blocks', 'fvg_patterns', 'choch_patterns',
+                   'swing_patterns', 'rsi_divergences'),
+}
+
+def canonicalize(value: Any) -> Any:
+    """Convert a config value into an immutable, hashable canonical form"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return ('dataclass', type(value).__name__,
+                tuple((f.name, canonicalize(getattr(value, f.name))) for f in fields(value)))
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((str(k), canonicalize(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return tuple(canonicalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return ('set', tuple(sorted(canonicalize(v) for v in value)))
+    if isinstance(value, np.ndarray):
+        return tuple(canonicalize(v) for v in value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value == 0.0:
+        return 0.0  # -0.0 and 0.0 hash alike
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+def _digest(canonical: Any) -> str:
+    return hashlib.sha1(repr(canonical).encode('utf-8')).hexdigest()
+
+@dataclass(frozen=True)
+class ConfigFingerprint:
+    """Frozen canonical snapshot of a strategy config with per-section hashes"""
+    digest: str
+    sections: Tuple[Tuple[str, str], ...]
+    canonical: Tuple[Tuple[str, Any], ...]
+
+    def section_digest(self, name: str) -> Optional[str]:
+        """Hash of a single top-level field"""
+        return dict(self.sections).get(name)
+
+    def stage_key(self, stage: str) -> str:
+        """Hash of the config subset a pipeline stage reads, including its upstream stages"""
+        section_map = dict(self.sections)
+        parts = tuple((name, section_map.get(name)) for name in STAGE_DEPENDENCIES[stage])
+        upstream = tuple(self.stage_key(name) for name in STAGE_UPSTREAM.get(stage, ()))
+        return _digest((stage, parts, upstream))
+
+    def changed_sections(self, other: 'ConfigFingerprint') -> List[str]:
+        """Top-level fields whose hashes differ"""
+        mine, theirs = dict(self.sections), dict(other.sections)
+        return [name for name in mine.keys() | theirs.keys() if mine.get(name) != theirs.get(name)]
+
+    def diff(self, other: 'ConfigFingerprint') -> Dict[str, Tuple[Any, Any]]:
+        """Dotted-path parameter changes, only descending into sections that differ"""
+        changed = {}
+        mine, theirs = dict(self.canonical), dict(other.canonical)
+        for name in self.changed_sections(other):
+            left = _flatten_canonical(mine.get(name), name)
+            right = _flatten_canonical(theirs.get(name), name)
+            for path in left.keys() | right.keys():
+                if left.get(path) != right.get(path):
+                    changed[path] = (left.get(path), right.get(path))
+        return changed
+
+def _flatten_canonical(canonical: Any, path: str) -> Dict[str, Any]:
+    """Expand a canonical dataclass tuple back into dotted leaves"""
+    if isinstance(canonical, tuple) and len(canonical) == 3 and canonical[0] == 'dataclass':
+        flat = {}
+        for name, value in canonical[2]:
+            flat.update(_flatten_canonical(value, f"{path}.{name}"))
+        return flat
+    return {path: canonical}
+
+def fingerprint(config: Any) -> ConfigFingerprint:
+    """Compute the canonical fingerprint of a dataclass config"""
+    canonical = tuple((f.name, canonicalize(getattr(config, f.name))) for f in fields(config))
+    sections = tuple((name, _digest(value)) for name, value in canonical)
+    return ConfigFingerprint(
+        digest=_digest((type(config).__name__, sections)),
+        sections=sections,
+        canonical=canonical
+    )
+
+def affected_stages(changed_paths: Iterable[str]) -> List[str]:
+    """Pipeline stages that must be recomputed when these parameters change"""
+    changed_sections = {path.split('.', 1)[0] for path in changed_paths}
+
+    stages = {stage for stage, deps in STAGE_DEPENDENCIES.items() if changed_sections & set(deps)}
+    for stage, upstream in STAGE_UPSTREAM.items():
+        if stages & set(upstream):
+            stages.add(stage)
+
+    return [stage for stage in STAGE_DEPENDENCIES if stage in stages]
+
+def has_path(config: Any, path: str) -> bool:
+    """Whether a dotted parameter path exists on the config"""
+    target = config
+    for name in path.split('.'):
+        if not hasattr(target, name):
+            return False
+        target = getattr(target, name)
+    return True
+
+def apply_overrides(config: Any, overrides: Dict[str, Any]) -> Any:
+    """Return a copy of the config with dotted-path overrides applied.
+
+    Plain names resolve against the top level first, then against the nested
+    section that owns a field of that name (e.g. ``min_pole_height`` ->
+    ``flag_config.min_pole_height``). Unknown names, and names several
+    sections share, raise ``ValueError``.
+    """
+    updated = copy.deepcopy(config)
+
+    for key, value in overrides.items():
+        if isinstance(value, np.generic):
+            value = value.item()
+
+        *parents, leaf = resolve_parameter_path(updated, key).split('.')
+        target = updated
+        for name in parents:
+            target = getattr(target, name)
+        setattr(target, leaf, value)
+
+    return updated
+
+def resolve_parameter_path(config: Any, name: str) -> str:
+    """Dotted path a parameter name refers to; raises ValueError if unknown or ambiguous"""
+    if has_path(config, name):
+        return name
+
+    owners = [
+        f.name for f in fields(config)
+        if is_dataclass(getattr(config, f.name)) and hasattr(getattr(config, f.name), name)
+    ]
+    if not owners:
+        raise ValueError(f"Unknown strategy parameter {name}")
+    if len(owners) > 1:
+        candidates = ', '.join(f"{owner}.{name}" for owner in owners)
+        raise ValueError(f"Ambiguous strategy parameter {name}: use one of {candidates}")
+    return f"{owners[0]}.{name}"
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Sequence
+
+BULLISH = 1
+BEARISH = -1
+NEUTRAL = 0
+
+DIRECTION_CODES = {'bullish': BULLISH, 'bearish': BEARISH, 'neutral': NEUTRAL}
+DIRECTION_NAMES = {code: name for name, code in DIRECTION_CODES.items()}
+
+# Slack for comparing window means computed from prefix sums against the threshold
+_THRESHOLD_EPS = 1e-9
+
+def bar_positions(index: pd.Index, timestamps: Sequence) -> np.ndarray:
+    """Map signal timestamps onto bar positions of the data index"""
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    timestamps = pd.Index(timestamps)
+    if index.is_unique:
+        positions = index.get_indexer(timestamps).astype(np.int64)
+        missing = positions < 0
+        if missing.any():
+            # Timestamps between bars snap to the next bar
+            positions[missing] = index.searchsorted(timestamps[missing])
+        return positions
+
+    return index.searchsorted(timestamps).astype(np.int64)
+
+def _window_means(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Mean of values[start:end] for every window using prefix sums (NaN-propagating)"""
+    nan_mask = np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(nan_mask, 0.0, values))))
+    nans = np.concatenate(([0], np.cumsum(nan_mask)))
+
+    counts = ends - starts
+    means = (sums[ends] - sums[starts]) / np.maximum(counts, 1)
+    return np.where(nans[ends] - nans[starts] > 0, np.nan, means)
+
+def find_confluence_windows(positions: np.ndarray,
+                            directions: np.ndarray,
+                            confidence: np.ndarray,
+                            entry_price: np.ndarray,
+                            stop_loss: np.ndarray,
+                            take_profit: np.ndarray,
+                            tolerance_bars: int = 0,
+                            min_signals: int = 2,
+                            threshold: float = 0.6) -> Dict[str, np.ndarray]:
+    """Find confluence windows with a sorted merge over flat signal arrays.
+
+    For every bar that carries a directional signal, the window covers all
+    signals of the same direction in ``[bar - tolerance_bars, bar]``, so a
+    confluence only fires once its latest contributing signal has printed.
+    With ``tolerance_bars=0`` this reduces to grouping by exact bar.
+
+    Returns column arrays, one row per confluence. The members of row ``k``
+    are ``order[start[k]:end[k]]`` (indices into the input arrays).
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    directions = np.asarray(directions, dtype=np.int8)
+    confidence = np.asarray(confidence, dtype=float)
+    prices = {
+        'entry_price': np.asarray(entry_price, dtype=float),
+        'stop_loss': np.asarray(stop_loss, dtype=float),
+        'take_profit': np.asarray(take_profit, dtype=float)
+    }
+    tolerance_bars = max(int(tolerance_bars), 0)
+
+    # Sort once by (position, direction) so each direction is a contiguous sorted run
+    order = np.lexsort((positions, -directions))
+    sorted_positions = positions[order]
+    sorted_directions = directions[order]
+
+    columns = {key: [] for key in ['direction', 'position', 'start', 'end', 'count', 'strength',
+                                   'entry_price', 'stop_loss', 'take_profit']}
+
+    for direction in (BULLISH, BEARISH):
+        run_start, run_end = np.searchsorted(-sorted_directions, [-direction, -direction + 1])
+        if run_end - run_start == 0:
+            continue
+
+        run_positions = sorted_positions[run_start:run_end]
+        anchors = np.unique(run_positions)
+
+        # Two pointers per anchor: first signal inside the window and one past the last
+        starts = np.searchsorted(run_positions, anchors - tolerance_bars, side='left')
+        ends = np.searchsorted(run_positions, anchors, side='right')
+        counts = ends - starts
+
+        run_order = order[run_start:run_end]
+        strength = _window_means(confidence[run_order], starts, ends)
+
+        keep = (counts >= min_signals) & (strength >= threshold - _THRESHOLD_EPS)
+        if not keep.any():
+            continue
+
+        columns['direction'].append(np.full(keep.sum(), direction, dtype=np.int8))
+        columns['position'].append(anchors[keep])
+        columns['start'].append(starts[keep] + run_start)
+        columns['end'].append(ends[keep] + run_start)
+        columns['count'].append(counts[keep])
+        columns['strength'].append(strength[keep])
+        for key, values in prices.items():
+            columns[key].append(_window_means(values[run_order], starts[keep], ends[keep]))
+
+    dtypes = {'direction': np.int8, 'position': np.int64, 'start': np.int64, 'end': np.int64, 'count': np.int64}
+    windows = {
+        key: np.concatenate(parts) if parts else np.empty(0, dtype=dtypes.get(key, float))
+        for key, parts in columns.items()
+    }
+
+    # Chronological output, bullish before bearish on the same bar
+    chronological = np.lexsort((-windows['direction'], windows['position']))
+    windows = {key: values[chronological] for key, values in windows.items()}
+    windows['order'] = order
+
+    return windows
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable
 from dataclasses import dataclass
 import logging
 from datetime import datetime
@@ -15,6 +15,10 @@ from .patterns.choch_detector import CHoCHDetector, CHoCHConfig
 from .patterns.swing_detector import SwingDetector, SwingConfig
 from .divergences.rsi_divergence import RSIDivergenceStrategy, DivergenceConfig
 from .indicators import TechnicalIndicatorEngine, IndicatorConfig
+from .confluence import find_confluence_windows, bar_positions, DIRECTION_CODES, DIRECTION_NAMES
+from .analysis_cache import AnalysisCache, StageCache
+from .config_fingerprint import fingerprint
+from ..telemetry import stage
 
 # Import stock_screener strategies
 import sys
@@ -48,6 +52,7 @@ class UnifiedStrategyConfig:
     # Confluence settings
     confluence_threshold: float = 0.6
     min_signals_for_confluence: int = 2
+    confluence_tolerance_bars: int = 0  # Signals up to N bars apart still confluence
     
     def __post_init__(self):
         if self.indicator_config is None:
@@ -80,9 +85,15 @@ class ConfluenceSignal:
 class UnifiedStrategyEngine:
     """Unified strategy engine that combines all detection methods"""
     
-    def __init__(self, config: UnifiedStrategyConfig = None):
+    def __init__(self, 
+                 config: UnifiedStrategyConfig = None, 
+                 cache: Optional[AnalysisCache] = None,
+                 stage_cache: Optional[StageCache] = None):
         self.config = config or UnifiedStrategyConfig()
+        self.cache = cache
+        self.stage_cache = stage_cache
         self.logger = logger
+        self._fingerprint = fingerprint(self.config) if stage_cache is not None else None
         
         # Initialize indicator engine
         self.indicator_engine = TechnicalIndicatorEngine(self.config.indicator_config)
@@ -103,8 +114,21 @@ class UnifiedStrategyEngine:
             n_pips=self.config.stock_screener_n_pips
         )
         
-    def run_comprehensive_analysis(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Run comprehensive analysis with all strategies"""
+    def run_comprehensive_analysis(self, 
+                                   data: pd.DataFrame,
+                                   symbol: Optional[str] = None,
+                                   timeframe: Optional[str] = None) -> Dict[str, Any]:
+        """Run comprehensive analysis with all strategies (cached when symbol/timeframe are given)"""
+        if self.cache is not None and symbol and timeframe:
+            return self.cache.get_or_compute(
+                symbol, timeframe, data, self.config,
+                lambda: self._run_comprehensive_analysis(data)
+            )
+        
+        return self._run_comprehensive_analysis(data)
+    
+    def _run_comprehensive_analysis(self, data: pd.DataFrame) -> Dict[str, Any]:
+        """Run every strategy stage on the data"""
         results = {
             'indicators': {},
             'patterns': {},
@@ -117,7 +141,7 @@ class UnifiedStrategyEngine:
         try:
             # Calculate all technical indicators
             self.logger.info("Calculating technical indicators...")
-            results['indicators'] = self.indicator_engine.calculate_all_indicators(data)
+            results['indicators'] = self._run_stage('indicators', data, self.indicator_engine.calculate_all_indicators)
             
             # Run pattern detection strategies
             self.logger.info("Running pattern detection strategies...")
@@ -129,11 +153,13 @@ class UnifiedStrategyEngine:
             
             # Run stock screener strategies
             self.logger.info("Running stock screener strategies...")
-            results['stock_screener'] = self._run_stock_screener_strategies(data)
+            results['stock_screener'] = self._run_stage('stock_screener', data, self._run_stock_screener_strategies)
             
             # Find confluence signals
             self.logger.info("Finding confluence signals...")
-            results['confluence'] = self._find_confluence_signals(data, results)
+            results['confluence'] = self._run_stage(
+                'confluence', data, lambda stage_data: self._find_confluence_signals(stage_data, results)
+            )
             
             # Generate summary
             results['summary'] = self._generate_analysis_summary(results)
@@ -146,29 +172,38 @@ class UnifiedStrategyEngine:
         
         return results
     
+    def _run_stage(self, name: str, data: pd.DataFrame, compute: Callable[[pd.DataFrame], Any]) -> Any:
+        """Run one pipeline stage, reusing a memoized output for the same stage inputs"""
+        with stage(name):
+            if self.stage_cache is None:
+                return compute(data)
+            return self.stage_cache.get_or_compute(
+                name, self._fingerprint.stage_key(name), data, lambda: compute(data)
+            )
+    
     def _run_pattern_detection(self, data: pd.DataFrame) -> Dict[str, List[DetectionResult]]:
         """Run all pattern detection strategies"""
         patterns = {}
         
         try:
             # Flag patterns
-            patterns['flag_patterns'] = self.flag_detector.detect(data)
+            patterns['flag_patterns'] = self._run_stage('flag_patterns', data, self.flag_detector.detect)
             self.logger.debug(f"Found {len(patterns['flag_patterns'])} flag patterns")
             
             # Order blocks
-            patterns['order_blocks'] = self.order_block_detector.detect(data)
+            patterns['order_blocks'] = self._run_stage('order_blocks', data, self.order_block_detector.detect)
             self.logger.debug(f"Found {len(patterns['order_blocks'])} order blocks")
             
             # Fair value gaps
-            patterns['fvg_patterns'] = self.fvg_detector.detect(data)
+            patterns['fvg_patterns'] = self._run_stage('fvg_patterns', data, self.fvg_detector.detect)
             self.logger.debug(f"Found {len(patterns['fvg_patterns'])} FVG patterns")
             
             # Change of character
-            patterns['choch_patterns'] = self.choch_detector.detect(data)
+            patterns['choch_patterns'] = self._run_stage('choch_patterns', data, self.choch_detector.detect)
             self.logger.debug(f"Found {len(patterns['choch_patterns'])} CHoCH patterns")
             
             # Swing points
-            patterns['swing_patterns'] = self.swing_detector.detect(data)
+            patterns['swing_patterns'] = self._run_stage('swing_patterns', data, self.swing_detector.detect)
             self.logger.debug(f"Found {len(patterns['swing_patterns'])} swing patterns")
             
         except Exception as e:
@@ -183,7 +218,7 @@ class UnifiedStrategyEngine:
         
         try:
             # RSI divergence
-            divergences['rsi_divergences'] = self.divergence_detector.detect(data)
+            divergences['rsi_divergences'] = self._run_stage('rsi_divergences', data, self.divergence_detector.detect)
             self.logger.debug(f"Found {len(divergences['rsi_divergences'])} RSI divergences")
             
         except Exception as e:
@@ -226,70 +261,73 @@ class UnifiedStrategyEngine:
         confluence_signals = []
         
         try:
-            # Collect all signals by timestamp
-            signal_map = {}
+            # Flatten pattern and divergence signals into column lists
+            timestamps, categories, pattern_types = [], [], []
+            confidence, entry_prices, stop_losses, take_profits = [], [], [], []
             
-            # Add pattern signals
-            for pattern_type, patterns in results['patterns'].items():
-                for pattern in patterns:
-                    timestamp = pattern.timestamp
-                    if timestamp not in signal_map:
-                        signal_map[timestamp] = {'bullish': [], 'bearish': [], 'neutral': []}
-                    
-                    signal_type = self._classify_signal_type(pattern.pattern_type)
-                    signal_map[timestamp][signal_type].append({
-                        'type': pattern_type,
-                        'pattern': pattern.pattern_type,
-                        'confidence': pattern.confidence,
-                        'entry_price': pattern.entry_price,
-                        'stop_loss': pattern.stop_loss,
-                        'take_profit': pattern.take_profit
-                    })
+            for group in ('patterns', 'divergences'):
+                for category, detections in results[group].items():
+                    for detection in detections:
+                        timestamps.append(detection.timestamp)
+                        categories.append(category)
+                        pattern_types.append(detection.pattern_type)
+                        confidence.append(detection.confidence)
+                        entry_prices.append(detection.entry_price)
+                        stop_losses.append(detection.stop_loss)
+                        take_profits.append(detection.take_profit)
             
-            # Add divergence signals
-            for divergence_type, divergences in results['divergences'].items():
-                for divergence in divergences:
-                    timestamp = divergence.timestamp
-                    if timestamp not in signal_map:
-                        signal_map[timestamp] = {'bullish': [], 'bearish': [], 'neutral': []}
-                    
-                    signal_type = self._classify_signal_type(divergence.pattern_type)
-                    signal_map[timestamp][signal_type].append({
-                        'type': divergence_type,
-                        'pattern': divergence.pattern_type,
-                        'confidence': divergence.confidence,
-                        'entry_price': divergence.entry_price,
-                        'stop_loss': divergence.stop_loss,
-                        'take_profit': divergence.take_profit
-                    })
+            if not timestamps:
+                self.logger.info("Found 0 confluence signals")
+                return confluence_signals
             
-            # Find confluence points
-            for timestamp, signals in signal_map.items():
-                for signal_type in ['bullish', 'bearish']:
-                    if len(signals[signal_type]) >= self.config.min_signals_for_confluence:
-                        # Calculate confluence strength
-                        total_confidence = sum(s['confidence'] for s in signals[signal_type])
-                        avg_confidence = total_confidence / len(signals[signal_type])
-                        
-                        if avg_confidence >= self.config.confluence_threshold:
-                            # Calculate average entry, stop, and target
-                            avg_entry = np.mean([s['entry_price'] for s in signals[signal_type]])
-                            avg_stop = np.mean([s['stop_loss'] for s in signals[signal_type]])
-                            avg_target = np.mean([s['take_profit'] for s in signals[signal_type]])
-                            
-                            confluence_signals.append(ConfluenceSignal(
-                                timestamp=timestamp,
-                                signal_type=signal_type,
-                                strength=avg_confidence,
-                                signals=[s['pattern'] for s in signals[signal_type]],
-                                entry_price=avg_entry,
-                                stop_loss=avg_stop,
-                                take_profit=avg_target,
-                                metadata={
-                                    'signal_count': len(signals[signal_type]),
-                                    'individual_signals': signals[signal_type]
-                                }
-                            ))
+            # Classify each distinct pattern type once
+            direction_by_type = {
+                pattern_type: DIRECTION_CODES[self._classify_signal_type(pattern_type)]
+                for pattern_type in set(pattern_types)
+            }
+            directions = np.array([direction_by_type[p] for p in pattern_types], dtype=np.int8)
+            
+            windows = find_confluence_windows(
+                positions=bar_positions(data.index, timestamps),
+                directions=directions,
+                confidence=np.array(confidence, dtype=float),
+                entry_price=np.array(entry_prices, dtype=float),
+                stop_loss=np.array(stop_losses, dtype=float),
+                take_profit=np.array(take_profits, dtype=float),
+                tolerance_bars=self.config.confluence_tolerance_bars,
+                min_signals=self.config.min_signals_for_confluence,
+                threshold=self.config.confluence_threshold
+            )
+            
+            # Materialize ConfluenceSignal objects only for the windows that passed
+            order = windows['order']
+            for k in range(len(windows['position'])):
+                members = order[windows['start'][k]:windows['end'][k]]
+                individual_signals = [
+                    {
+                        'type': categories[m],
+                        'pattern': pattern_types[m],
+                        'confidence': confidence[m],
+                        'entry_price': entry_prices[m],
+                        'stop_loss': stop_losses[m],
+                        'take_profit': take_profits[m]
+                    }
+                    for m in members
+                ]
+                
+                confluence_signals.append(ConfluenceSignal(
+                    timestamp=timestamps[members[-1]],
+                    signal_type=DIRECTION_NAMES[int(windows['direction'][k])],
+                    strength=float(windows['strength'][k]),
+                    signals=[s['pattern'] for s in individual_signals],
+                    entry_price=float(windows['entry_price'][k]),
+                    stop_loss=float(windows['stop_loss'][k]),
+                    take_profit=float(windows['take_profit'][k]),
+                    metadata={
+                        'signal_count': int(windows['count'][k]),
+                        'individual_signals': individual_signals
+                    }
+                ))
             
             self.logger.info(f"Found {len(confluence_signals)} confluence signals")
             
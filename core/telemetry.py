@@ -0,0 +1,156 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Any, Callable
+from contextlib import contextmanager
+from functools import wraps
+import logging
+import os
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+# Telemetry of the task running in this process; stages record into it when set
+_active: Optional['TaskTelemetry'] = None
+
+class TaskTelemetry:
+    """Resource usage of one task: CPU time, RSS growth, bars loaded and stage wall times.
+
+    Used as a context manager around the task. Stages are leaf timings
+    recorded with ``stage``/``timed`` from anywhere in the call tree;
+    repeated stages (e.g. one per optimization combo) accumulate.
+    Pool workers run many tasks, so memory is reported as the task's RSS
+    growth; ``process_peak_rss_mb`` is the worker's lifetime high-water mark.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.bytes_loaded = 0
+        self.bars_loaded = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.rss_growth_mb = 0.0  # RSS at task end minus RSS at task start
+        self.process_peak_rss_mb = 0.0  # Peak RSS of the process so far, not of this task
+        self._previous = None
+
+    def __enter__(self):
+        global _active
+        self._previous, _active = _active, self
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._rss_start = _current_rss_mb()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+        self.wall_time = time.perf_counter() - self._wall_start
+        self.cpu_time = time.process_time() - self._cpu_start
+        self.rss_growth_mb = _current_rss_mb() - self._rss_start
+        self.process_peak_rss_mb = _peak_rss_mb()
+        _active = self._previous
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'rss_growth_mb': self.rss_growth_mb,
+            'process_peak_rss_mb': self.process_peak_rss_mb,
+            'bytes_loaded': self.bytes_loaded,
+            'bars_loaded': self.bars_loaded,
+            'stages': dict(self.stages)
+        }
+
+@contextmanager
+def stage(name: str):
+    """Time a block as stage ``name`` of the active task (no-op without one)"""
+    telemetry = _active
+    if telemetry is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        telemetry.stages[name] = telemetry.stages.get(name, 0.0) + time.perf_counter() - start
+
+def timed(name: str) -> Callable:
+    """Decorator form of ``stage``"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_load(data: Any):
+    """Count bars and bytes loaded by the active task (a DataFrame or a dict of NumPy columns)"""
+    if _active is None:
+        return
+    if isinstance(data, dict):
+        _active.bars_loaded += len(next(iter(data.values()), ()))
+        _active.bytes_loaded += int(sum(values.nbytes for values in data.values()))
+    elif not data.empty:
+        _active.bars_loaded += len(data)
+        _active.bytes_loaded += int(data.memory_usage(index=True).sum())
+
+def _current_rss_mb() -> float:
+    """Resident set size now, from /proc (0 where unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024.0)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+def _peak_rss_mb() -> float:
+    """Process high-water mark (ru_maxrss is in KB on Linux)"""
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def summarize_telemetry(records: Dict[str, Dict[str, Any]], top: int = 5) -> Dict[str, Any]:
+    """Percentiles across tasks per resource and per stage, plus the slowest tasks.
+
+    ``records`` maps task ids to ``TaskTelemetry.as_dict()`` output.
+    """
+    records = {task_id: record for task_id, record in records.items() if record}
+    if not records:
+        return {'tasks': 0}
+
+    def distribution(values: List[float]) -> Dict[str, float]:
+        values = np.asarray(values, dtype=float)
+        summary = {f"p{q}": float(np.percentile(values, q)) for q in PERCENTILES}
+        summary.update(max=float(values.max()), total=float(values.sum()))
+        return summary
+
+    stage_names = sorted({name for record in records.values() for name in record['stages']})
+    stage_totals = {name: sum(record['stages'].get(name, 0.0) for record in records.values()) for name in stage_names}
+    all_stages = sum(stage_totals.values()) or 1.0
+
+    stages = {}
+    for name in stage_names:
+        stages[name] = distribution([record['stages'][name] for record in records.values() if name in record['stages']])
+        stages[name]['share'] = stage_totals[name] / all_stages
+
+    slowest = sorted(records.items(), key=lambda item: item[1]['wall_time'], reverse=True)[:top]
+    return {
+        'tasks': len(records),
+        'wall_time': distribution([record['wall_time'] for record in records.values()]),
+        'cpu_time': distribution([record['cpu_time'] for record in records.values()]),
+        'rss_growth_mb': distribution([record['rss_growth_mb'] for record in records.values()]),
+        'process_peak_rss_mb': distribution([record['process_peak_rss_mb'] for record in records.values()]),
+        'bytes_loaded': distribution([record['bytes_loaded'] for record in records.values()]),
+        'bars_loaded': distribution([record['bars_loaded'] for record in records.values()]),
+        'stages': stages,
+        'slowest_tasks': [
+            {'task_id': task_id, 'wall_time': record['wall_time'],
+             'top_stage': max(record['stages'], key=record['stages'].get) if record['stages'] else None}
+            for task_id, record in slowest
+        ]
+    }
@@ -15,7 +15,7 @@ This application provides a complete trading screener with:
 Usage:
     python main.py --mode screening --symbols AAPL,MSFT,GOOGL --timeframes 1h,4h
     python main.py --mode backtesting --symbols AAPL --timeframes 1h --start-date 2023-01-01
-    python main.py --mode optimization --symbols AAPL --timeframes 1h --param-ranges '{"rsi_period": [10,14,20]}'
+    python main.py --mode optimization --symbols AAPL --timeframes 1h --param-ranges '{"indicator_config.rsi_period": [10,14,20]}'
 """
 
 import argparse
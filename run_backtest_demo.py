@@ -195,7 +195,7 @@ def run_optimization_demo():
         
         # Define parameter ranges for optimization
         param_ranges = {
-            'rsi_period': [10, 14, 20],
+            'indicator_config.rsi_period': [10, 14, 20],
             'macd_fast': [8, 12, 16],
             'min_signal_strength': [0.4, 0.6, 0.8]
         }
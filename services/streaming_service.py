@@ -24,7 +24,8 @@ class StreamingService:
         self.config = self._load_config(config_path)
         
         # Initialize database
-        self.db_handler = DuckDBHandler(self.config.get('database_path', 'trading_data.duckdb'))
+        self.db_handler = DuckDBHandler(self.config.get('database_path', 'trading_data.duckdb'),
+                                        archive_dir=self.config.get('archive_dir'))
         
         # Initialize components
         self._initialize_components()
@@ -70,7 +71,9 @@ class StreamingService:
         
         # Initialize components
         self.stream_handler = AlpacaStreamHandler(stream_config, self.db_handler)
-        self.update_scheduler = DataUpdateScheduler(self.db_handler)
+        self.update_scheduler = DataUpdateScheduler(
+            self.db_handler, UpdateConfig(archive_keep_months=self.config.get('archive_keep_months'))
+        )
         self.signal_processor = RealTimeSignalProcessor(self.db_handler)
         
         # Alert manager configuration
@@ -0,0 +1,152 @@
+import sys
+import os
+import json
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List
+import pytest
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.ta_engine.analysis_cache import AnalysisCache, AnalysisCacheConfig, StageCache
+from core.data_engine.duckdb_handler import DuckDBHandler
+from core.ta_engine.config_fingerprint import fingerprint
+
+@dataclass
+class InnerConfig:
+    period: int = 14
+    levels: List[float] = field(default_factory=lambda: [30.0, 70.0])
+
+@dataclass
+class OuterConfig:
+    inner: InnerConfig = field(default_factory=InnerConfig)
+    threshold: float = 0.6
+
+def create_bars(n: int = 50) -> pd.DataFrame:
+    index = pd.date_range('2024-01-01', periods=n, freq='1h')
+    close = np.linspace(100, 110, n)
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': np.full(n, 1000)
+    }, index=index)
+
+def fake_analysis(data: pd.DataFrame) -> dict:
+    return {
+        'indicators': {
+            'rsi': pd.Series(np.linspace(0, 100, len(data)), index=data.index, name='RSI'),
+            'flags': ['not', 'a', 'series']
+        },
+        'patterns': {'flag_patterns': [{'timestamp': data.index[5], 'confidence': 0.7}]},
+        'confluence': [],
+        'summary': {'total_patterns': 1}
+    }
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnalysisCache(AnalysisCacheConfig(max_entries=2, cache_dir=str(tmp_path / 'cache')))
+
+def test_memory_hit_and_config_sensitivity(cache):
+    """Identical inputs hit, a changed nested parameter misses"""
+    data = create_bars()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return fake_analysis(data)
+
+    first = cache.get_or_compute('AAPL', '1h', data, OuterConfig(), compute)
+    second = cache.get_or_compute('AAPL', '1h', data, OuterConfig(), compute)
+    assert first is second
+    assert len(calls) == 1
+
+    cache.get_or_compute('AAPL', '1h', data, OuterConfig(inner=InnerConfig(period=21)), compute)
+    assert len(calls) == 2
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+
+def test_lru_eviction_falls_back_to_disk(cache):
+    """Evicted entries are served from the NPZ tier with indicators intact"""
+    data = create_bars()
+    keys = []
+    for symbol in ['AAPL', 'MSFT', 'NVDA']:
+        cache.get_or_compute(symbol, '1h', data, OuterConfig(), lambda: fake_analysis(data))
+        keys.append(cache.make_key(symbol, '1h', data, OuterConfig()))
+
+    assert cache.stats()['evictions'] == 1
+
+    restored = cache.get(keys[0])
+    assert restored is not None
+    assert cache.stats()['disk_hits'] == 1
+    pd.testing.assert_series_equal(restored['indicators']['rsi'], fake_analysis(data)['indicators']['rsi'])
+    assert restored['indicators']['flags'] == ['not', 'a', 'series']
+    assert restored['summary'] == {'total_patterns': 1}
+
+def test_disk_tier_rebuilds_results_without_pickle(cache):
+    """Dataclasses and tz-aware indexes round-trip as JSON; foreign classes are refused"""
+    data = create_bars().tz_localize('UTC')
+    results = fake_analysis(data)
+    results['patterns']['flag_patterns'][0]['metadata'] = {'bars': (3, 7), 'levels': np.array([1.5, 2.5])}
+    results['fingerprint'] = fingerprint(OuterConfig())  # Frozen dataclass from core
+    cache.put('AAPL_1h_test', results)
+    cache._memory.clear()
+
+    restored = cache.get('AAPL_1h_test')
+    pd.testing.assert_series_equal(restored['indicators']['rsi'], results['indicators']['rsi'])
+    flag = restored['patterns']['flag_patterns'][0]
+    assert flag['timestamp'] == data.index[5] and flag['metadata']['bars'] == (3, 7)
+    np.testing.assert_array_equal(flag['metadata']['levels'], [1.5, 2.5])
+    assert restored['fingerprint'] == results['fingerprint']
+
+    meta = json.dumps({'indicator_names': [], 'series_names': [], 'index': None,
+                       'remainder': {'indicators': {}, 'x': {'__dataclass__': 'os:system', 'fields': {}}}})
+    np.savez(cache._path_for('AAPL_1h_evil'), meta=np.frombuffer(meta.encode('utf-8'), dtype=np.uint8))
+    assert cache.get('AAPL_1h_evil') is None
+
+def test_new_bars_change_the_key(cache):
+    """Appending bars produces a different key"""
+    data = create_bars(50)
+    assert cache.make_key('AAPL', '1h', data, OuterConfig()) != cache.make_key('AAPL', '1h', create_bars(51), OuterConfig())
+
+def test_store_bars_invalidates(cache):
+    """Writing bars through an attached handler drops that series from both tiers"""
+    data = create_bars()
+    db_handler = DuckDBHandler(':memory:')
+    cache.attach(db_handler)
+
+    cache.get_or_compute('AAPL', '1h', data, OuterConfig(), lambda: fake_analysis(data))
+    cache.get_or_compute('MSFT', '1h', data, OuterConfig(), lambda: fake_analysis(data))
+
+    db_handler.store_bars('AAPL', '1h', data)
+
+    assert cache.get(cache.make_key('AAPL', '1h', data, OuterConfig())) is None
+    assert cache.get(cache.make_key('MSFT', '1h', data, OuterConfig())) is not None
+    assert cache.stats()['invalidations'] == 1
+    db_handler.close()
+
+def test_stage_cache_reuses_matching_stage_inputs():
+    """Stage outputs are shared by key and failures are not memoized"""
+    stage_cache = StageCache(max_entries=2)
+    data = create_bars()
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    assert stage_cache.get_or_compute('indicators', 'k1', data, lambda: compute(1)) == 1
+    assert stage_cache.get_or_compute('indicators', 'k1', data, lambda: compute(2)) == 1
+    assert stage_cache.get_or_compute('indicators', 'k1', create_bars(60), lambda: compute(3)) == 3
+    assert calls == [1, 3]
+
+    with pytest.raises(ValueError):
+        stage_cache.get_or_compute('flag_patterns', 'k2', data, lambda: (_ for _ in ()).throw(ValueError()))
+    assert stage_cache.get_or_compute('flag_patterns', 'k2', data, lambda: compute(4)) == 4
+
+    assert stage_cache.stats() == {
+        'indicators': {'hits': 1, 'misses': 2},
+        'flag_patterns': {'hits': 0, 'misses': 2}
+    }
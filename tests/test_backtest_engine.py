@@ -0,0 +1,110 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+import pickle
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.backtesting.backtest_engine import BacktestEngine, BacktestConfig, SignalType
+from core.backtesting.trade_ledger import ExitReason
+from core.ta_engine.unified_strategy_engine import UnifiedStrategyConfig
+
+def create_bars(closes) -> pd.DataFrame:
+    index = pd.date_range('2024-01-01', periods=len(closes), freq='1h')
+    return pd.DataFrame({'close': closes}, index=index)
+
+def signal(timestamp, price, target, stop=None, signal_type=SignalType.BULLISH):
+    return {
+        'timestamp': timestamp,
+        'signal_type': signal_type,
+        'strength': 0.9,
+        'entry_price': price,
+        'stop_loss': price * 0.5 if stop is None else stop,
+        'take_profit': target,
+        'pattern_type': 'TEST'
+    }
+
+def test_capacity_compounding_and_equity():
+    """Full slots skip signals, exits compound into later sizes, equity marks open positions"""
+    data = create_bars([100.0, 100.0, 100.0, 110.0, 110.0, 120.0, 110.0, 110.0])
+    signals = [signal(data.index[0], 100.0, 110.0), signal(data.index[1], 100.0, 110.0),
+               signal(data.index[2], 100.0, 110.0), signal(data.index[4], 110.0, 121.0)]
+    engine = BacktestEngine(None, BacktestConfig(max_positions=2, position_size_pct=0.5, max_hold_period=10))
+
+    ledger, equity = engine._execute_trades(data, signals)
+
+    # The bar-2 signal finds both slots taken; both targets fill at bar 3 before the bar-4 entry
+    assert ledger['entry_idx'].tolist() == [0, 1, 4]
+    assert ledger['exit_idx'].tolist() == [3, 3, 7]
+    assert np.allclose(ledger['pnl'], [5000.0, 5000.0, 0.0])
+    assert np.allclose(ledger['size'], [50000.0, 50000.0, 0.5 * 110000.0])
+    assert ledger['exit_reason'].tolist() == [ExitReason.TAKE_PROFIT, ExitReason.TAKE_PROFIT, ExitReason.END_OF_DATA]
+    assert np.allclose(equity.to_numpy(), [100000.0, 100000.0, 100000.0, 110000.0, 110000.0, 115000.0, 110000.0, 110000.0])
+
+def test_max_hold_and_end_of_data_exits():
+    """Untouched levels exit at the close after max_hold bars, or at the last bar"""
+    data = create_bars([100.0, 101.0, 102.0, 103.0, 104.0, 105.0])
+    signals = [signal(data.index[0], 100.0, 200.0),
+               signal(data.index[1], 101.0, 50.0, stop=202.0, signal_type=SignalType.BEARISH),
+               signal(data.index[5], 105.0, 200.0)]
+    engine = BacktestEngine(None, BacktestConfig(max_positions=5, position_size_pct=0.1, max_hold_period=2))
+
+    ledger, equity = engine._execute_trades(data, signals)
+
+    assert ledger['exit_idx'].tolist() == [2, 3, 5]
+    assert ledger['exit_reason'].tolist() == [ExitReason.MAX_HOLD, ExitReason.MAX_HOLD, ExitReason.END_OF_DATA]
+    assert np.allclose(ledger['exit_price'], [102.0, 103.0, 105.0])
+    assert np.isclose(ledger['pnl'][1], -10000.0 * 2.0 / 101.0)  # Short loses as price rises
+    assert np.isclose(ledger['pnl'][2], 0.0)
+    assert np.isclose(equity.iloc[-1], 100000.0 + ledger['pnl'].sum())
+
+    engine.config.max_hold_period = 50
+    ledger, _ = engine._execute_trades(data, signals[:1])
+    assert ledger['exit_idx'].tolist() == [5]
+    assert ledger['exit_reason'].tolist() == [ExitReason.END_OF_DATA]
+
+def test_trailing_stop_gap_fill_and_tie_break():
+    """Exits follow resolve_exits: trailed stops, gap fills at the open and the configured tie-break"""
+    data = pd.DataFrame({'open': [100.0, 101.0, 103.0, 100.0, 100.0],
+                         'high': [100.0, 110.0, 106.0, 111.0, 100.0],
+                         'low': [100.0, 101.0, 102.0, 89.0, 100.0],
+                         'close': [100.0, 108.0, 105.0, 100.0, 100.0]},
+                        index=pd.date_range('2024-01-01', periods=5, freq='1h'))
+    engine = BacktestEngine(None, BacktestConfig(max_positions=2, max_hold_period=10,
+                                                 trailing_stop=True, trailing_stop_pct=0.05))
+
+    # Stop trails to 110 * 0.95 after bar 1; bar 2 opens below it and fills at the open
+    ledger, _ = engine._execute_trades(data, [signal(data.index[0], 100.0, 200.0, stop=90.0)])
+    assert ledger['exit_idx'].tolist() == [2]
+    assert ledger['exit_reason'].tolist() == [ExitReason.STOP_LOSS]
+    assert np.isclose(ledger['exit_price'][0], 103.0)
+    assert np.isclose(ledger['stop_loss'][0], 104.5)
+
+    # Bar 3 touches both levels of an untrailed position
+    engine.config.trailing_stop = False
+    for tie_break, (fill, reason) in {'stop': (90.0, ExitReason.STOP_LOSS),
+                                      'target': (110.0, ExitReason.TAKE_PROFIT),
+                                      'open': (90.0, ExitReason.STOP_LOSS)}.items():
+        engine.config.intrabar_tie_break = tie_break
+        ledger, _ = engine._execute_trades(data, [signal(data.index[2], 105.0, 110.0, stop=90.0)])
+        assert ledger['exit_idx'].tolist() == [3]
+        assert np.isclose(ledger['exit_price'][0], fill)
+        assert ledger['exit_reason'].tolist() == [reason]
+
+def test_result_trades_are_built_once_and_not_pickled():
+    """Trade objects are cached on the result but results pickle as the ledger alone"""
+    data = create_bars([100.0, 100.0, 110.0, 110.0])
+    engine = BacktestEngine(None, BacktestConfig(max_hold_period=10))
+    result = engine._backtest_signals(data, [signal(data.index[0], 100.0, 110.0)], 'TEST', '1h',
+                                      data.index[0], data.index[-1], UnifiedStrategyConfig())
+
+    trades = result.trades
+    assert result.trades is trades
+    assert [t.exit_time for t in trades] == [data.index[2]]
+
+    restored = pickle.loads(pickle.dumps(result))
+    assert 'trades' not in restored.__dict__
+    assert [t.pnl for t in restored.trades] == [t.pnl for t in trades]
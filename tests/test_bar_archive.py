@@ -0,0 +1,65 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.data_engine.duckdb_handler import DuckDBHandler
+
+def create_bars(start, end):
+    index = pd.date_range(start, end, freq='1h', inclusive='left')
+    close = np.arange(len(index), dtype=float) + 100
+    return pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+                         'volume': np.arange(len(index))}, index=index)
+
+def test_closed_months_move_to_partitioned_archive(tmp_path):
+    """Archived bars read back unchanged through the view; only needed partitions are scanned"""
+    db_path = str(tmp_path / 'bars.duckdb')
+    handler = DuckDBHandler(db_path, archive_dir=str(tmp_path / 'archive'))
+    for symbol in ('AAA', 'BBB'):
+        handler.store_bars(symbol, '1h', create_bars('2023-11-01', '2024-03-15'))
+    before = handler.get_bars('AAA', '1h')
+
+    moved = handler.archive_closed_months(keep_months=1, now=pd.Timestamp('2024-03-15', tz='UTC'))
+    assert moved == 2 * len(before.loc[:'2024-01-31 23:00'])
+    assert handler.conn.execute("SELECT MIN(timestamp) FROM price_bars").fetchone()[0] == pd.Timestamp('2024-02-01')
+    partitions = sorted(p.relative_to(tmp_path / 'archive').parent.as_posix() for p in (tmp_path / 'archive').rglob('*.parquet'))
+    assert partitions == ['symbol=AAA/timeframe=1h/year=2023', 'symbol=AAA/timeframe=1h/year=2024',
+                          'symbol=BBB/timeframe=1h/year=2023', 'symbol=BBB/timeframe=1h/year=2024']
+
+    pd.testing.assert_frame_equal(handler.get_bars('AAA', '1h'), before, check_index_type=False)
+    plan = handler.conn.execute("EXPLAIN ANALYZE SELECT * FROM price_bars_all WHERE symbol = 'AAA' AND year = 2023").fetchall()[0][1]
+    assert 'Total Files Read: 1' in plan
+    handler.close()
+
+    # Readers of the same database pick up the view without any archive settings
+    reader = DuckDBHandler(db_path, read_only=True)
+    window = reader.get_bars_many(['AAA', 'BBB'], '1h', pd.Timestamp('2024-01-31 20:00'), pd.Timestamp('2024-02-01 03:00'))
+    assert len(window['BBB']['close']) == 8
+    assert reader.get_row_counts(['AAA'], ['1h']) == {('AAA', '1h'): len(before)}
+    reader.close()
+
+def test_restored_bars_shadow_archive_and_rearchive_merges(tmp_path):
+    """Bars re-stored into an archived month replace the archived rows, then merge into their partition"""
+    handler = DuckDBHandler(str(tmp_path / 'bars.duckdb'), archive_dir=str(tmp_path / 'archive'))
+    handler.store_bars('AAA', '1h', create_bars('2024-01-01', '2024-03-15'))
+    now = pd.Timestamp('2024-03-15', tz='UTC')
+    handler.archive_closed_months(keep_months=1, now=now)
+    before = handler.get_bars('AAA', '1h')
+
+    revised = create_bars('2024-01-10', '2024-01-12') * 2
+    handler.store_bars('AAA', '1h', revised)
+    bars = handler.get_bars('AAA', '1h')
+    assert len(bars) == len(before) and bars.index.is_unique
+    assert np.allclose(bars.loc[revised.index, 'close'], revised['close'])
+    assert handler.get_row_counts(['AAA'], ['1h']) == {('AAA', '1h'): len(before)}
+
+    assert handler.archive_closed_months(keep_months=1, now=now) == len(revised)
+    assert handler.conn.execute("SELECT MIN(timestamp) FROM price_bars").fetchone()[0] == pd.Timestamp('2024-02-01')
+    assert len(list((tmp_path / 'archive').rglob('*.parquet'))) == 1
+    assert not list((tmp_path / 'archive').rglob('*.replaced'))
+    pd.testing.assert_frame_equal(handler.get_bars('AAA', '1h'), bars, check_index_type=False)
+    handler.close()
@@ -0,0 +1,77 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+import pytest
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.data_engine.duckdb_handler import DuckDBHandler
+
+def create_bars(n, start='2024-01-01', scale=1.0):
+    close = (np.arange(n, dtype=float) + 100) * scale
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Volume': np.arange(n) * 10}, index=pd.date_range(start, periods=n, freq='1min'))
+
+def test_store_bars_upserts_from_index_or_column():
+    """Index or timestamp column, any column case, tz-aware converted to UTC, last duplicate wins"""
+    handler = DuckDBHandler(':memory:')
+    handler.store_bars('AAA', '1m', create_bars(100))
+
+    update = create_bars(10, start='2024-01-01 00:50', scale=2.0).reset_index(names='timestamp')
+    update.columns = [col.lower() for col in update.columns]
+    update['timestamp'] = update['timestamp'].dt.tz_localize('UTC').dt.tz_convert('US/Eastern')
+    update = pd.concat([update.assign(close=-1.0).iloc[:1], update])  # Repeated key: the later row wins
+    handler.store_bars('AAA', '1m', update)
+
+    bars = handler.get_bars('AAA', '1m')
+    assert len(bars) == 100
+    assert bars.loc['2024-01-01 00:50', 'close'] == 200.0
+    assert bars.loc['2024-01-01 00:49', 'close'] == 149.0
+
+    with pytest.raises(Exception):
+        handler.store_bars('AAA', '1m', create_bars(5), upsert=False)
+    with pytest.raises(ValueError):
+        handler.store_bars('AAA', '1m', create_bars(5).drop(columns=['Volume']))
+
+def test_bulk_load_merges_through_staging():
+    """Later batches win; without upsert existing rows are kept"""
+    handler = DuckDBHandler(':memory:')
+    handler.store_bars('AAA', '1m', create_bars(50))
+    written = []
+    handler.add_write_listener(lambda symbol, timeframe: written.append((symbol, timeframe)))
+
+    staged = handler.bulk_load_bars([
+        ('AAA', '1m', create_bars(100, scale=2.0)),
+        ('BBB', '1m', create_bars(20)),
+        ('AAA', '1m', create_bars(10, start='2024-01-01 00:05', scale=3.0))
+    ])
+    assert staged == 130
+    assert written == [('AAA', '1m'), ('BBB', '1m')]
+    aaa = handler.get_bars('AAA', '1m')
+    assert len(aaa) == 100 and len(handler.get_bars('BBB', '1m')) == 20
+    assert aaa['close'].iloc[[0, 5, 15]].tolist() == [200.0, 300.0, 230.0]
+
+    handler.bulk_load_bars([('AAA', '1m', create_bars(120))], upsert=False)
+    aaa = handler.get_bars('AAA', '1m')
+    assert len(aaa) == 120
+    assert aaa['close'].iloc[[0, 110]].tolist() == [200.0, 210.0]
+
+def test_get_bars_many_returns_views_and_aligned_panel():
+    """One query serves every symbol, as per-symbol columns or a time x symbol panel"""
+    handler = DuckDBHandler(':memory:')
+    handler.store_bars('AAA', '1m', create_bars(50))
+    handler.store_bars('BBB', '1m', create_bars(30, start='2024-01-01 00:40'))
+
+    series = handler.get_bars_many(['BBB', 'AAA', 'ZZZ'], '1m', start=pd.Timestamp('2024-01-01 00:10'))
+    assert list(series) == ['BBB', 'AAA']
+    expected = handler.get_bars('AAA', '1m', start=pd.Timestamp('2024-01-01 00:10'))
+    np.testing.assert_array_equal(series['AAA']['close'], expected['close'].to_numpy())
+    assert series['AAA']['close'].base is series['BBB']['close'].base
+
+    panel = handler.get_bars_many(['AAA', 'BBB'], '1m', panel=True)
+    assert panel['close'].shape == (70, 2)
+    assert panel['close']['BBB'].isna().sum() == 40
+    assert panel['close'].loc['2024-01-01 00:45', 'BBB'] == 105.0
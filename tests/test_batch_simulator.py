@@ -0,0 +1,133 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+from types import SimpleNamespace
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+import core.backtesting.batch_simulator as batch_simulator
+from core.backtesting.batch_simulator import simulate_batch, prepare_signal_arrays, resolve_exits, exit_price_arrays, ExitReason
+
+def create_config(**overrides):
+    settings = dict(initial_capital=100000.0, position_size_pct=0.1, max_positions=5,
+                    stop_loss_pct=0.02, take_profit_pct=0.04, trailing_stop=False,
+                    trailing_stop_pct=0.01, min_signal_strength=0.6, max_hold_period=50,
+                    intrabar_tie_break='stop')
+    settings.update(overrides)
+    return SimpleNamespace(**settings)
+
+def create_signals(index, close, n=40, seed=3):
+    rng = np.random.default_rng(seed)
+    signals = []
+    for i in np.sort(rng.choice(len(index) - 1, n, replace=False)):
+        bullish = rng.random() < 0.5
+        side = 1 if bullish else -1
+        signals.append({
+            'timestamp': index[i],
+            'signal_type': 'bullish' if bullish else 'bearish',
+            'strength': float(rng.uniform(0.4, 1.0)),
+            'entry_price': float(close[i]),
+            'stop_loss': float(close[i] * (1 - side * 0.02)),
+            'take_profit': float(close[i] * (1 + side * 0.03))
+        })
+    return signals
+
+def create_market(n=400, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    index = pd.date_range('2024-01-01', periods=n, freq='1h')
+    return index, close
+
+def test_prepare_signal_arrays_filters_and_sorts():
+    """Neutral and off-bar signals are dropped, the rest sorted by bar"""
+    index, close = create_market(10)
+    signals = [
+        {'timestamp': index[5], 'signal_type': 'bullish', 'strength': 0.9,
+         'entry_price': 1.0, 'stop_loss': 0.9, 'take_profit': 1.1},
+        {'timestamp': index[2], 'signal_type': 'neutral', 'strength': 0.9,
+         'entry_price': 1.0, 'stop_loss': 0.9, 'take_profit': 1.1},
+        {'timestamp': pd.Timestamp('2030-01-01'), 'signal_type': 'bearish', 'strength': 0.9,
+         'entry_price': 1.0, 'stop_loss': 1.1, 'take_profit': 0.9},
+        {'timestamp': index[1], 'signal_type': 'bearish', 'strength': 0.7,
+         'entry_price': 1.0, 'stop_loss': 1.1, 'take_profit': 0.9}
+    ]
+    arrays = prepare_signal_arrays(index, signals)
+    assert arrays['bar'].tolist() == [1, 5]
+    assert arrays['signal_index'].tolist() == [3, 0]
+    assert arrays['side'].tolist() == [-1, 1]
+
+def test_one_row_per_combo_and_strength_filter():
+    """Stricter filters never take more trades, and grid columns are echoed"""
+    index, close = create_market()
+    arrays = prepare_signal_arrays(index, create_signals(index, close))
+    combos = {'min_signal_strength': [0.4, 0.7, 1.1], 'max_hold_period': [10, 10, 10]}
+
+    metrics = simulate_batch(close, arrays, combos, create_config())
+
+    assert len(metrics) == 3
+    assert metrics['min_signal_strength'].tolist() == [0.4, 0.7, 1.1]
+    assert metrics['total_trades'].is_monotonic_decreasing
+    assert metrics['total_trades'].iloc[-1] == 0
+    assert metrics['total_return'].iloc[-1] == 0.0
+
+def test_chunking_does_not_change_results(monkeypatch):
+    """Memory-bounded chunks produce the same metrics as a single pass"""
+    index, close = create_market()
+    arrays = prepare_signal_arrays(index, create_signals(index, close))
+    grid = pd.MultiIndex.from_product([[0.01, 0.03], [0.02, 0.06], [5, 30], [1, 3]]).to_frame(index=False).to_numpy()
+    combos = {
+        'stop_loss_pct': grid[:, 0],
+        'take_profit_pct': grid[:, 1],
+        'max_hold_period': grid[:, 2].astype(int),
+        'max_positions': grid[:, 3].astype(int)
+    }
+    config = create_config(trailing_stop=True)
+
+    whole = simulate_batch(close, arrays, combos, config)
+    max_hold = np.array([5, 30, 10000])
+    exits = resolve_exits(close, arrays, max_hold, None, None, config, with_stops=True)
+    monkeypatch.setattr(batch_simulator, '_SCAN_BUDGET', 1)
+    chunked = simulate_batch(close, arrays, combos, config)
+
+    pd.testing.assert_frame_equal(whole, chunked)
+    assert (whole['total_trades'] > 0).all()
+
+    # Signal blocks of one reproduce the full scan, which is capped at the end of the data
+    monkeypatch.setattr(batch_simulator, '_SCAN_BUDGET', 3 * 100)
+    for full, blocked in zip(exits, resolve_exits(close, arrays, max_hold, None, None, config, with_stops=True)):
+        np.testing.assert_array_equal(full, blocked)
+
+def test_intrabar_tie_break_and_gap_fill():
+    """High/low hits resolve by tie-break; a bar gapping through the stop fills at its open"""
+    index = pd.date_range('2024-01-01', periods=5, freq='1h')
+    data = pd.DataFrame({
+        'open':  [100.0, 100.0, 102.0, 100.0, 100.0],
+        'high':  [100.0, 100.5, 104.5, 100.0, 100.0],
+        'low':   [100.0, 99.5, 97.5, 100.0, 100.0],
+        'close': [100.0, 100.0, 100.0, 100.0, 100.0]
+    }, index=index)
+    arrays = prepare_signal_arrays(index, [{'timestamp': index[0], 'signal_type': 'bullish', 'strength': 1.0,
+                                            'entry_price': 100.0, 'stop_loss': 98.0, 'take_profit': 104.0}])
+    max_hold = np.array([4])
+
+    # Closes never reach either level
+    _, _, reason = resolve_exits(exit_price_arrays(data, intrabar=False), arrays, max_hold, None, None, create_config())
+    assert reason[0, 0] == ExitReason.MAX_HOLD
+
+    prices = exit_price_arrays(data)
+    expected = {'stop': (98.0, ExitReason.STOP_LOSS), 'target': (104.0, ExitReason.TAKE_PROFIT),
+                'open': (104.0, ExitReason.TAKE_PROFIT)}  # Open 102 is nearer the target
+    for tie_break, (fill, exit_reason) in expected.items():
+        exit_bar, exit_price, reason = resolve_exits(prices, arrays, max_hold, None, None,
+                                                     create_config(intrabar_tie_break=tie_break))
+        assert exit_bar[0, 0] == 2
+        assert exit_price[0, 0] == fill
+        assert reason[0, 0] == exit_reason
+
+    gapped = data.assign(open=[100.0, 100.0, 96.0, 100.0, 100.0])
+    _, exit_price, reason = resolve_exits(exit_price_arrays(gapped), arrays, max_hold, None, None, create_config())
+    assert exit_price[0, 0] == 96.0
+    assert reason[0, 0] == ExitReason.STOP_LOSS
@@ -0,0 +1,87 @@
+import sys
+import os
+import numpy as np
+import pytest
+from dataclasses import dataclass, field
+from typing import List
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.ta_engine.config_fingerprint import fingerprint, apply_overrides, affected_stages
+
+@dataclass
+class IndicatorSection:
+    rsi_period: int = 14
+    sma_periods: List[int] = field(default_factory=lambda: [20, 50, 200])
+
+@dataclass
+class FlagSection:
+    min_pole_height: float = 0.01
+    min_confidence: float = 0.5
+
+@dataclass
+class StrategySection:
+    indicator_config: IndicatorSection = field(default_factory=IndicatorSection)
+    flag_config: FlagSection = field(default_factory=FlagSection)
+    confluence_threshold: float = 0.6
+
+def test_equal_configs_share_fingerprint():
+    """Fingerprints depend on content, not identity or numpy scalar types"""
+    a = StrategySection()
+    b = StrategySection(flag_config=FlagSection(min_pole_height=np.float64(0.01)))
+    assert fingerprint(a) == fingerprint(b)
+    assert hash(fingerprint(a)) == hash(fingerprint(b))
+
+def test_diff_and_stage_keys():
+    """Diff reports dotted paths and only the touched stage key changes"""
+    base = fingerprint(StrategySection())
+    changed = fingerprint(StrategySection(flag_config=FlagSection(min_pole_height=0.02)))
+
+    assert base.digest != changed.digest
+    assert base.diff(changed) == {'flag_config.min_pole_height': (0.01, 0.02)}
+    assert base.stage_key('indicators') == changed.stage_key('indicators')
+    assert base.stage_key('flag_patterns') != changed.stage_key('flag_patterns')
+    assert base.stage_key('confluence') != changed.stage_key('confluence')
+
+def test_affected_stages_propagate_downstream():
+    """Detector changes also invalidate confluence, confluence changes nothing upstream"""
+    assert affected_stages(['flag_config.min_pole_height']) == ['flag_patterns', 'confluence']
+    assert affected_stages(['confluence_threshold']) == ['confluence']
+    assert affected_stages(['indicator_config.rsi_period']) == ['indicators']
+
+def test_apply_overrides_copies():
+    """Overrides never mutate the base config and resolve bare nested names"""
+    base = StrategySection()
+    updated = apply_overrides(base, {
+        'flag_config.min_confidence': 0.7,
+        'rsi_period': np.int64(21)
+    })
+
+    assert base.flag_config.min_confidence == 0.5
+    assert base.indicator_config.rsi_period == 14
+    assert updated.flag_config.min_confidence == 0.7
+    assert updated.indicator_config.rsi_period == 21
+    assert type(updated.indicator_config.rsi_period) is int
+
+@dataclass
+class DivergenceSection:
+    rsi_period: int = 14
+
+@dataclass
+class SharedNameSection(StrategySection):
+    divergence_config: DivergenceSection = field(default_factory=DivergenceSection)
+
+def test_apply_overrides_rejects_unknown_and_ambiguous_names():
+    """Names no section owns, or several sections share, raise instead of being dropped"""
+    with pytest.raises(ValueError, match='Unknown strategy parameter not_a_parameter'):
+        apply_overrides(StrategySection(), {'not_a_parameter': 1})
+
+    with pytest.raises(ValueError, match='indicator_config.rsi_period, divergence_config.rsi_period'):
+        apply_overrides(SharedNameSection(), {'rsi_period': 21})
+
+    updated = apply_overrides(SharedNameSection(), {'divergence_config.rsi_period': 21, 'min_pole_height': 0.02})
+    assert updated.divergence_config.rsi_period == 21
+    assert updated.indicator_config.rsi_period == 14
+    assert updated.flag_config.min_pole_height == 0.02
@@ -0,0 +1,88 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+import pytest
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.ta_engine.confluence import find_confluence_windows, bar_positions, BULLISH, BEARISH, NEUTRAL
+
+def make_signals(rows):
+    """Build flat signal arrays from (position, direction, confidence, entry, stop, target) rows"""
+    columns = list(zip(*rows))
+    return {
+        'positions': np.array(columns[0]),
+        'directions': np.array(columns[1]),
+        'confidence': np.array(columns[2], dtype=float),
+        'entry_price': np.array(columns[3], dtype=float),
+        'stop_loss': np.array(columns[4], dtype=float),
+        'take_profit': np.array(columns[5], dtype=float)
+    }
+
+def test_exact_bar_grouping():
+    """Without tolerance only signals on the same bar confluence"""
+    signals = make_signals([
+        (10, BULLISH, 0.8, 100, 98, 104),
+        (10, BULLISH, 0.6, 102, 99, 106),
+        (11, BULLISH, 0.9, 101, 99, 105),
+        (10, BEARISH, 0.9, 100, 102, 96),
+        (10, NEUTRAL, 0.9, 100, 100, 100)
+    ])
+    windows = find_confluence_windows(**signals, tolerance_bars=0, min_signals=2, threshold=0.6)
+
+    assert len(windows['position']) == 1
+    assert windows['position'][0] == 10
+    assert windows['direction'][0] == BULLISH
+    assert windows['strength'][0] == pytest.approx(0.7)
+    assert windows['entry_price'][0] == pytest.approx(101)
+    assert windows['stop_loss'][0] == pytest.approx(98.5)
+    assert windows['take_profit'][0] == pytest.approx(105)
+
+    members = windows['order'][windows['start'][0]:windows['end'][0]]
+    assert sorted(members.tolist()) == [0, 1]
+
+def test_tolerance_window_is_trailing():
+    """Signals one bar apart confluence on the later bar only"""
+    signals = make_signals([
+        (20, BEARISH, 0.7, 50, 51, 48),
+        (21, BEARISH, 0.9, 49, 50, 47),
+        (25, BEARISH, 0.9, 45, 46, 43)
+    ])
+    windows = find_confluence_windows(**signals, tolerance_bars=1, min_signals=2, threshold=0.6)
+
+    assert windows['position'].tolist() == [21]
+    assert windows['count'].tolist() == [2]
+    assert windows['strength'][0] == pytest.approx(0.8)
+
+def test_threshold_and_nan_prices():
+    """Weak windows are dropped and missing prices only affect their own window"""
+    signals = make_signals([
+        (5, BULLISH, 0.5, 10, np.nan, 12),
+        (5, BULLISH, 0.5, 10, 9, 12),
+        (8, BULLISH, 0.9, 11, 10, 13),
+        (8, BULLISH, 0.7, 13, 12, 15)
+    ])
+    windows = find_confluence_windows(**signals, tolerance_bars=0, min_signals=2, threshold=0.6)
+    assert windows['position'].tolist() == [8]
+    assert windows['stop_loss'][0] == pytest.approx(11)
+
+    windows = find_confluence_windows(**signals, tolerance_bars=0, min_signals=2, threshold=0.5)
+    assert windows['position'].tolist() == [5, 8]
+    assert np.isnan(windows['stop_loss'][0])
+    assert windows['stop_loss'][1] == pytest.approx(11)
+
+def test_empty_input():
+    """No signals produce empty columns"""
+    empty = np.array([])
+    windows = find_confluence_windows(empty, empty, empty, empty, empty, empty)
+    assert len(windows['position']) == 0
+    assert len(windows['order']) == 0
+
+def test_bar_positions():
+    """Timestamps map to bar positions, off-grid timestamps snap forward"""
+    index = pd.date_range('2024-01-01', periods=5, freq='1h')
+    timestamps = [index[3], index[0], index[1] + pd.Timedelta(minutes=30)]
+    assert bar_positions(index, timestamps).tolist() == [3, 0, 2]
@@ -0,0 +1,72 @@
+import sys
+import os
+import asyncio
+import threading
+import pandas as pd
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.data_engine.duckdb_handler import DuckDBHandler
+
+def create_bars(n, start='2024-01-01'):
+    close = np.arange(n, dtype=float) + 100
+    return pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+                         'volume': np.arange(n) * 10}, index=pd.date_range(start, periods=n, freq='1min'))
+
+def test_threads_read_and_write_through_own_cursors():
+    """Concurrent writers are serialized and readers see one shared database"""
+    handler = DuckDBHandler(':memory:')
+    errors = []
+
+    def work(i):
+        try:
+            handler.store_bars(f"S{i}", '1m', create_bars(200))
+            assert len(handler.get_bars(f"S{i}", '1m')) == 200
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert handler.get_available_symbols() == [f"S{i}" for i in range(8)]
+    assert handler._pool.open_cursors == 0  # Cursors of exited threads are closed
+
+    # Long-lived threads keep theirs until they exit
+    ready, done = threading.Barrier(3), threading.Event()
+
+    def hold():
+        handler.get_available_symbols()
+        ready.wait()
+        done.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    assert handler._pool.open_cursors == 2
+    done.set()
+    for thread in threads:
+        thread.join()
+    assert handler._pool.open_cursors == 0
+    handler.close()
+
+def test_async_api_queues_writes_and_pools_reads():
+    """Async writes complete in order on one writer; reads run on the reader pool"""
+    handler = DuckDBHandler(':memory:')
+    api = handler.async_api(max_readers=2)
+
+    async def run():
+        await asyncio.gather(*(api.store_bars('AAA', '1m', create_bars(10, start=f"2024-01-0{day}"))
+                               for day in range(1, 6)))
+        return await asyncio.gather(api.get_bars('AAA', '1m'), api.get_available_timeframes('AAA'))
+
+    bars, timeframes = asyncio.run(run())
+    assert len(bars) == 50 and timeframes == ['1m']
+    handler.close()
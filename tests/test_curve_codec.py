@@ -0,0 +1,46 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.data_engine.curve_codec import encode_curves, decode_curves
+from core.data_engine.duckdb_handler import DuckDBHandler
+
+def create_curve(n=5000, freq='1min'):
+    index = pd.date_range('2024-01-01', periods=n, freq=freq)
+    return pd.Series(100000 * np.cumprod(1 + np.random.default_rng(2).normal(0, 1e-3, n)), index=index)
+
+def test_round_trip_and_downsampled_view():
+    """Regular and irregular indexes survive at float32 precision; small views come from the overview"""
+    equity = create_curve()
+    drawdown = equity / equity.cummax() - 1
+    irregular = equity.iloc[np.sort(np.random.default_rng(0).choice(len(equity), 700, replace=False))]
+
+    for curves in ({'equity': equity, 'drawdown': drawdown}, {'equity': irregular}):
+        decoded = decode_curves(encode_curves(curves))
+        assert decoded.index.equals(curves['equity'].index)
+        for name, curve in curves.items():
+            np.testing.assert_allclose(decoded[name].to_numpy(), curve.to_numpy(), rtol=1e-6)
+
+    view = decode_curves(encode_curves({'equity': equity}), max_points=100)
+    assert len(view) == 100
+    assert view.index[0] == equity.index[0] and view.index[-1] == equity.index[-1]
+
+def test_handler_stores_blobs_and_reads_legacy_json():
+    """Binary rows decode through get_equity_curve; old JSON rows still load"""
+    handler = DuckDBHandler(':memory:')
+    equity = create_curve(2000)
+    record = dict(strategy_name='s', symbol='TEST', timeframe='1m', start_date=equity.index[0],
+                  end_date=equity.index[-1], total_trades=1, winning_trades=1, losing_trades=0, win_rate=1.0,
+                  avg_return=0.01, total_return=0.01, max_drawdown=-0.01, sharpe_ratio=1.0, parameters={})
+
+    handler.store_backtest_result(dict(record, equity_blob=encode_curves({'equity': equity})))
+    handler.store_backtest_result(dict(record, equity_curve={'2024-01-01T00:00:00': 1.0, '2024-01-02T00:00:00': 2.0}))
+
+    assert len(handler.get_equity_curve(1)) == 2000
+    assert len(handler.get_equity_curve(1, max_points=50)) == 50
+    assert handler.get_equity_curve(2)['equity'].tolist() == [1.0, 2.0]
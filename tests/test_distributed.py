@@ -0,0 +1,114 @@
+import sys
+import os
+import socket
+import threading
+import multiprocessing as mp
+from datetime import datetime
+
+import pytest
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.multiprocessing.parallel_engine import ParallelTask, ParallelResult
+from core.multiprocessing.distributed import (
+    TaskCoordinator, run_worker, send_message, recv_message, parse_address, open_session,
+    HELLO, REQUEST, TASK, WELCOME
+)
+
+AUTHKEY = b'test-secret'
+
+def _tasks(n):
+    return [ParallelTask(task_id=f"S{i}_1h_backtest", symbol=f"S{i}", timeframe='1h',
+                         start_date=datetime(2024, 1, 1), end_date=datetime(2024, 6, 1),
+                         task_type='backtesting') for i in range(n)]
+
+def _echo(task):
+    return ParallelResult(task_id=task.task_id, success=True, result={'symbol': task.symbol}, processing_time=0.01)
+
+def test_frames_round_trip_with_compression():
+    """Large payloads are compressed on the wire and decoded transparently"""
+    left, right = socket.socketpair()
+    payload = {'curve': [1.0] * 10000}
+    send_message(left, TASK, payload, AUTHKEY)
+    assert recv_message(right, AUTHKEY) == (TASK, payload)
+    left.close()
+    assert recv_message(right, AUTHKEY) is None
+    assert parse_address('10.0.0.5:7000') == (socket.AF_INET, ('10.0.0.5', 7000))
+    assert parse_address(':7000') == (socket.AF_INET, ('127.0.0.1', 7000))
+    assert parse_address('unix:/tmp/c.sock') == (socket.AF_UNIX, '/tmp/c.sock')
+
+def test_leases_of_dead_and_silent_workers_are_requeued(tmp_path):
+    """Tasks held by a crashed or hung worker finish on a healthy one"""
+    coordinator = TaskCoordinator(f"unix:{tmp_path / 'coord.sock'}", {'db_path': None},
+                                  heartbeat_timeout=0.5, poll_interval=0.05, authkey=AUTHKEY)
+    coordinator.submit(_tasks(4))
+    coordinator.start()
+    family, path = parse_address(coordinator.address)
+
+    # One worker leases a task and dies, another leases one and goes silent
+    crashed = socket.socket(family, socket.SOCK_STREAM)
+    hung = socket.socket(family, socket.SOCK_STREAM)
+    for sock, name in ((crashed, 'crashed'), (hung, 'hung')):
+        sock.connect(path)
+        session = open_session(sock, AUTHKEY)
+        session.send(HELLO, name)
+        assert session.recv()[0] == WELCOME
+        session.send(REQUEST)
+        assert session.recv()[0] == TASK
+    crashed.close()
+
+    worker = threading.Thread(target=run_worker, args=(coordinator.address,),
+                              kwargs={'worker_id': 'healthy', 'task_runner': _echo, 'heartbeat_interval': 0.1,
+                                      'authkey': AUTHKEY})
+    worker.start()
+    try:
+        assert coordinator.wait(timeout=10)
+    finally:
+        hung.close()
+        coordinator.close()
+        worker.join(timeout=5)
+
+    assert sorted(coordinator.results) == [f"S{i}_1h_backtest" for i in range(4)]
+    assert all(result.success for result in coordinator.results.values())
+    assert coordinator.workers_seen == {'crashed', 'hung', 'healthy'}
+
+def test_unauthenticated_peers_are_rejected(tmp_path):
+    """A wrong key fails the handshake and tampered frames are refused before unpickling"""
+    delivered = []
+
+    def on_result(task, result):
+        # Another thread can take the task lock, so on_result runs without it
+        probe = threading.Thread(target=lambda: coordinator.remaining)
+        probe.start()
+        probe.join(timeout=2)
+        delivered.append((task.task_id, probe.is_alive()))
+
+    coordinator = TaskCoordinator(f"unix:{tmp_path / 'coord.sock'}", {'db_path': None}, authkey=AUTHKEY,
+                                  on_result=on_result)
+    coordinator.submit(_tasks(2))
+    coordinator.start()
+    family, path = parse_address(coordinator.address)
+
+    intruder = socket.socket(family, socket.SOCK_STREAM)
+    intruder.connect(path)
+    with pytest.raises((mp.AuthenticationError, ConnectionError)):
+        open_session(intruder, b'wrong-key')
+    intruder.close()
+    assert run_worker(coordinator.address, task_runner=_echo, authkey=b'wrong-key', connect_timeout=1) == 0
+
+    left, right = socket.socketpair()
+    send_message(left, TASK, {'symbol': 'S0'}, AUTHKEY)
+    with pytest.raises(mp.AuthenticationError):
+        recv_message(right, b'wrong-key')
+
+    worker = threading.Thread(target=run_worker, args=(coordinator.address,),
+                              kwargs={'task_runner': _echo, 'authkey': AUTHKEY})
+    worker.start()
+    try:
+        assert coordinator.wait(timeout=10)
+    finally:
+        coordinator.close()
+        worker.join(timeout=5)
+    assert sorted(delivered) == [('S0_1h_backtest', False), ('S1_1h_backtest', False)]
@@ -0,0 +1,58 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.backtesting.monte_carlo import MonteCarloConfig, run_monte_carlo, trade_returns_from_ledger
+from core.backtesting.trade_ledger import TradeLedger, PatternVocabulary
+
+def test_shuffle_preserves_final_return():
+    """Permutations reorder trades, so every path ends at the same equity"""
+    returns = np.array([0.02, -0.01, 0.03, -0.04, 0.01, 0.005])
+    result = run_monte_carlo(returns, MonteCarloConfig(n_paths=500, method='shuffle', seed=1))
+
+    expected = np.prod(1 + returns) - 1
+    np.testing.assert_allclose(result.final_returns, expected)
+    assert result.max_drawdowns.min() < result.max_drawdowns.max()
+
+def test_path_statistics_match_a_direct_walk():
+    """Drawdown and recovery agree with a loop over one path"""
+    returns = np.array([0.1, -0.2, 0.05, 0.3, -0.1])
+    result = run_monte_carlo(returns, MonteCarloConfig(n_paths=64, method='bootstrap', seed=7, max_memory_mb=0.001))
+
+    rng = np.random.default_rng(7)
+    picks = rng.integers(0, len(returns), size=(1, len(returns)))[0]
+    equity, peak, worst, since_peak, longest = 1.0, 1.0, 0.0, 0, 0
+    for r in returns[picks]:
+        equity *= 1 + r
+        if equity >= peak:
+            peak, since_peak = equity, 0
+        else:
+            since_peak += 1
+        worst = min(worst, equity / peak - 1)
+        longest = max(longest, since_peak)
+
+    assert np.isclose(result.max_drawdowns[0], worst)
+    assert result.time_to_recovery[0] == longest
+    assert np.isclose(result.final_returns[0], equity - 1)
+
+def test_bands_and_ledger_returns():
+    """Bands are ordered by percentile and ledger returns compound realized equity"""
+    index = pd.date_range('2024-01-01', periods=10, freq='1h')
+    ledger = TradeLedger.from_columns(
+        index, PatternVocabulary(['X']),
+        entry_idx=np.array([0, 3]), exit_idx=np.array([5, 2]),
+        pnl=np.array([-500.0, 1000.0]), exit_reason=np.array([2, 1])
+    )
+    returns = trade_returns_from_ledger(ledger, 10000.0)
+    np.testing.assert_allclose(returns, [0.1, -500.0 / 11000.0])
+
+    result = run_monte_carlo(np.tile(returns, 20), MonteCarloConfig(n_paths=2000, seed=0, initial_capital=10000.0))
+    bands = result.equity_bands.to_numpy()
+    assert (np.diff(bands, axis=1) >= 0).all()
+    assert result.equity_bands.index[-1] == 40
+    assert 0.0 <= result.summary()['probability_of_loss'] <= 1.0
@@ -0,0 +1,62 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+import pytest
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.data_engine.curve_codec import encode_curves
+from core.data_engine.duckdb_handler import DuckDBHandler
+
+def create_handler(n_results=3):
+    handler = DuckDBHandler(':memory:')
+    index = pd.date_range('2024-01-01', periods=1000, freq='1h')
+    for i in range(n_results):
+        equity = pd.Series(100000 * np.cumprod(1 + np.random.default_rng(i).normal(0, 1e-3, len(index))), index=index)
+        handler.store_backtest_result(dict(
+            strategy_name=f's{i}', symbol='TEST', timeframe='1h', start_date=index[0], end_date=index[-1],
+            total_trades=10, winning_trades=6, losing_trades=4, win_rate=0.6, avg_return=0.01,
+            total_return=0.1 * (i + 1), max_drawdown=-0.05, sharpe_ratio=1.5 if i else None, parameters={},
+            equity_blob=encode_curves({'equity': equity})))
+    return handler
+
+def test_execute_query_returns_frames():
+    """Listed result ids resolve to stored equity curves"""
+    handler = create_handler()
+
+    results = handler.execute_query("SELECT id, strategy_name FROM backtest_results WHERE total_return > ? ORDER BY id", [0.15])
+    assert results['strategy_name'].tolist() == ['s1', 's2']
+    assert len(handler.get_equity_curve(int(results['id'].iloc[0]), max_points=100)) == 100
+
+    with pytest.raises(Exception):
+        handler.execute_query("SELECT * FROM missing_table")
+
+def test_results_endpoint_ids_fetch_equity_curves():
+    """The results listing serializes, and each returned id fetches its equity curve"""
+    pytest.importorskip('fastapi')
+    pytest.importorskip('httpx')
+    pytest.importorskip('vectorbt')
+    from fastapi.testclient import TestClient
+    import app_platform_api_full as api
+
+    api.db_handler = create_handler()
+    try:
+        client = TestClient(api.app)
+        response = client.get('/api/backtest/results')
+        assert response.status_code == 200
+        listing = response.json()
+        assert listing['count'] == 3
+        assert any(row['sharpe_ratio'] is None for row in listing['results'])
+
+        result_id = listing['results'][0]['id']
+        response = client.get(f'/api/backtest/results/{result_id}/equity', params={'points': 50})
+        assert response.status_code == 200
+        assert response.json()['points'] == 50
+
+        assert client.get('/api/strategies/top', params={'limit': 1}).json()['count'] == 1
+        assert client.get('/api/backtest/results/999/equity').status_code == 404
+    finally:
+        api.db_handler = None
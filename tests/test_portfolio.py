@@ -0,0 +1,46 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.backtesting.portfolio import PortfolioBacktester
+from core.backtesting.backtest_engine import BacktestConfig, SignalType
+
+def create_bars(start: str, closes) -> pd.DataFrame:
+    index = pd.date_range(start, periods=len(closes), freq='1h')
+    return pd.DataFrame({'close': closes}, index=index)
+
+def signal(timestamp, price, strength, target):
+    return {
+        'timestamp': timestamp,
+        'signal_type': SignalType.BULLISH,
+        'strength': strength,
+        'entry_price': price,
+        'stop_loss': price * 0.5,
+        'take_profit': target,
+        'pattern_type': 'TEST'
+    }
+
+def test_capacity_and_capital_are_shared_across_symbols():
+    """With one slot the stronger simultaneous signal wins and sizes off pooled capital"""
+    a = create_bars('2024-01-01 00:00', [100.0, 100.0, 110.0, 110.0, 110.0, 110.0])
+    b = create_bars('2024-01-01 01:00', [50.0, 50.0, 50.0, 60.0, 60.0])
+    signals = {
+        'A': [signal(a.index[1], 100.0, 0.7, 110.0)],
+        'B': [signal(b.index[0], 50.0, 0.9, 60.0), signal(b.index[3], 60.0, 0.8, 100.0)]
+    }
+    config = BacktestConfig(max_positions=1, position_size_pct=0.5, max_hold_period=10)
+
+    result = PortfolioBacktester(None, config).run_on_signals({'A': a, 'B': b}, signals, '1h')
+
+    # A and B both signal at 01:00; B is stronger and holds the only slot until 04:00
+    assert [result.symbols[s] for s in result.trade_symbols] == ['B', 'B']
+    assert np.isclose(result.ledger['pnl'][0], 50000.0 * 0.2)
+    assert np.isclose(result.ledger['size'][1], 0.5 * (100000.0 + 10000.0))
+    assert result.per_symbol.loc['A', 'trades'] == 0
+    assert len(result.equity_curve) == 6
+    assert np.isclose(result.equity_curve.iloc[-1], 110000.0)
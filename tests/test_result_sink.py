@@ -0,0 +1,53 @@
+import sys
+import os
+from types import SimpleNamespace
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.multiprocessing.result_sink import ParquetResultSink, PayloadStore, summarize_result
+
+def _result(task_id, success=True):
+    return SimpleNamespace(task_id=task_id, success=success, result={'best_params': {'rsi': 14}, 'best_score': 1.5},
+                           error=None if success else 'boom', processing_time=0.1)
+
+def _task(task_id):
+    return SimpleNamespace(task_id=task_id, task_type='optimization', symbol=task_id.split('_')[0], timeframe='1h')
+
+def test_sink_flushes_parts_and_resumes(tmp_path):
+    """Only flushed parts count as completed; failed tasks are retried"""
+    sink = ParquetResultSink(str(tmp_path), flush_rows=2)
+    assert sink.start(['A_1h', 'B_1h', 'C_1h']) == set()
+    sink.write(_task('A_1h'), _result('A_1h'))
+    sink.write(_task('B_1h'), _result('B_1h', success=False))
+    sink.write(_task('C_1h'), _result('C_1h'))  # Still buffered: lost if the run dies now
+
+    resumed = ParquetResultSink(str(tmp_path))
+    assert resumed.start(['A_1h', 'B_1h', 'C_1h']) == {'A_1h'}
+    resumed.write(_task('B_1h'), _result('B_1h'))
+    resumed.close()
+
+    frame = ParquetResultSink(str(tmp_path)).read()
+    assert list(frame['task_id']) == ['A_1h', 'B_1h']
+    assert frame['success'].all()
+    assert '"best_score": 1.5' in frame['summary'].iloc[0]
+    assert resumed.manifest['parts'] == ['part-00000.parquet', 'part-00001.parquet']
+
+def test_summaries_are_stable_and_payloads_round_trip(tmp_path):
+    """Worker summaries re-summarize to themselves; full payloads load by key"""
+    screening = {'symbol': 'A', 'timeframe': '1h', 'data_points': 500, 'analysis_results': {'rsi': list(range(500))},
+                 'latest_signals': {'patterns': {'flag': [1, 2]}, 'divergences': {}, 'confluence': [3]}}
+    summary = summarize_result(screening)
+    assert 'analysis_results' not in summary
+    assert summary['signal_count'] == 3 and summary['signal_counts'] == {'patterns': 2, 'divergences': 0, 'confluence': 1}
+    assert summarize_result(summary) == summary
+
+    backtest = SimpleNamespace(symbol='A', timeframe='1h', total_trades=4, win_rate=0.5, total_return=0.1,
+                               sharpe_ratio=1.2, max_drawdown=0.05, trades=[object()] * 4)
+    optimization = {'best_params': {'rsi': 14}, 'best_score': 1.2, 'best_result': backtest, 'total_combinations': 9}
+    assert summarize_result(summarize_result(optimization))['best_metrics']['total_trades'] == 4
+
+    store = PayloadStore(str(tmp_path))
+    key = store.put('A_1h_screening', screening)
+    assert store.get(key) == screening
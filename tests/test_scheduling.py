@@ -0,0 +1,28 @@
+import sys
+import os
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.multiprocessing.scheduling import plan_batches, makespan_lower_bound, schedule_report
+
+def test_plan_batches_is_lpt_and_packs_tiny_tasks():
+    """Big tasks go first on their own; tiny ones share batches"""
+    costs = [10, 500000, 20, 3000, 10, 2000, 5]
+    batches = plan_batches(costs, batch_cost=1000)
+
+    assert batches[0] == [1]
+    assert sorted(k for batch in batches for k in batch) == list(range(len(costs)))
+    assert [3] in batches and [5] in batches
+    assert sorted(batches[-1]) == [0, 2, 4, 6]
+
+    # Packing never collapses many equal tasks below the requested batch count
+    assert len(plan_batches([2000] * 12, batch_cost=20000, min_batches=8)) >= 8
+
+def test_makespan_lower_bound():
+    assert makespan_lower_bound([4.0, 1.0, 1.0], workers=4) == 4.0
+    assert makespan_lower_bound([2.0] * 8, workers=4) == 4.0
+    report = schedule_report(5.0, [2.0] * 8, workers=4, n_batches=8)
+    assert np.isclose(report['efficiency'], 0.8)
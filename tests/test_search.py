@@ -0,0 +1,58 @@
+import sys
+import os
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.optimization.search import SearchConfig, create_search_strategy, ParameterSpace
+
+PARAM_SPACE = {
+    'a': list(range(10)),
+    'b': list(range(10)),
+    'c': [0.1, 0.2, 0.3, 0.4]
+}
+
+def objective(params, fraction):
+    """Smooth bowl with its optimum at a=7, b=2, c=0.3; partial data adds noise-free shrinkage"""
+    score = -((params['a'] - 7) ** 2 + (params['b'] - 2) ** 2) - 10 * abs(params['c'] - 0.3)
+    return score * (2 - fraction)
+
+def test_parameter_space_round_trip():
+    """Combo indices decode to positions in product order"""
+    space = ParameterSpace(PARAM_SPACE)
+    assert len(space) == 400
+    assert space.decode(0) == (0, 0, 0)
+    assert space.decode(5) == (0, 1, 1)
+    assert all(space.encode(space.decode(i)) == i for i in range(len(space)))
+
+def test_grid_finds_optimum_and_patience_stops_early():
+    """Grid is exhaustive unless the shared early-stopping rule fires"""
+    result = create_search_strategy(SearchConfig(method='grid')).run(PARAM_SPACE, objective)
+    assert result.best_params == {'a': 7, 'b': 2, 'c': 0.3}
+    assert result.n_evaluations == 400
+
+    stopped = create_search_strategy(SearchConfig(method='grid', patience=20)).run(PARAM_SPACE, objective)
+    assert stopped.stopped_early
+    assert stopped.n_evaluations < 400
+
+def test_sampling_strategies_use_a_fraction_of_the_grid():
+    """Random, halving and TPE stay within budget and get close to the optimum"""
+    for method in ('random', 'halving', 'tpe'):
+        config = SearchConfig(method=method, max_trials=60, seed=1, min_fraction=0.25)
+        result = create_search_strategy(config).run(PARAM_SPACE, objective)
+
+        assert result.full_evaluations <= 60
+        assert result.best_score >= -5, method
+        assert any(t.fraction >= 1.0 for t in result.trials if t.params == result.best_params)
+
+    halving = create_search_strategy(SearchConfig(method='halving', max_trials=27, seed=0, min_fraction=1 / 9)).run(PARAM_SPACE, objective)
+    assert [sum(1 for t in halving.trials if np.isclose(t.fraction, f)) for f in (1 / 9, 1 / 3, 1.0)] == [27, 9, 3]
+
+def test_target_score_stops_tpe():
+    """Reaching the target score ends the search"""
+    config = SearchConfig(method='tpe', max_trials=200, seed=3, target_score=0.0)
+    result = create_search_strategy(config).run(PARAM_SPACE, objective)
+    assert result.stopped_early
+    assert result.best_score == 0.0
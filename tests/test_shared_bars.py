@@ -0,0 +1,42 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.data_engine.duckdb_handler import DuckDBHandler
+from core.multiprocessing.shared_bars import SharedBarStore, SharedBarReader
+
+def create_handler():
+    handler = DuckDBHandler(':memory:')
+    for k, symbol in enumerate(['AAA', 'BBB']):
+        for timeframe, freq, n in (('1h', '1h', 200), ('1d', '1D', 30)):
+            index = pd.date_range('2024-01-01', periods=n, freq=freq)
+            close = np.arange(n, dtype=float) + 100 * k
+            handler.store_bars(symbol, timeframe, pd.DataFrame({
+                'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': np.arange(n)
+            }, index=index))
+    return handler
+
+def test_reader_matches_database_bars():
+    """Shared-memory views return the same frames as DuckDBHandler.get_bars"""
+    handler = create_handler()
+    start, end = pd.Timestamp('2024-01-02'), pd.Timestamp('2024-01-05 12:00')
+
+    with SharedBarStore.from_database(handler, ['AAA', 'BBB', 'CCC'], ['1h', '1d']) as store:
+        assert len(store.handle.offsets) == 4
+        reader = SharedBarReader(store.handle)
+        try:
+            for key in (('AAA', '1h'), ('BBB', '1d')):
+                shared = reader.get_bars(*key, start, end)
+                expected = handler.get_bars(*key, start, end)
+                pd.testing.assert_frame_equal(shared, expected, check_freq=False)
+                assert not shared['close'].to_numpy().flags.writeable
+
+            assert reader.get_bars('AAA', '1h').shape == (200, 5)
+            assert reader.get_bars('CCC', '1h').empty
+        finally:
+            reader.close()
@@ -0,0 +1,67 @@
+import sys
+import os
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.backtesting.streaming_metrics import QuantileSketch, StreamingMetrics
+from core.backtesting.trade_ledger import max_run_length
+
+def test_incremental_updates_match_full_recomputation():
+    """One-at-a-time and chunked updates agree with whole-array statistics"""
+    rng = np.random.default_rng(4)
+    returns = rng.normal(0.001, 0.02, 300)
+    pnl = returns * 10000
+    equity = 100000 * np.cumprod(1 + rng.normal(0, 0.01, 1000))
+
+    single = StreamingMetrics()
+    for value in equity:
+        single.update_equity(value)
+    for p, r in zip(pnl, returns):
+        single.add_trade(p, r)
+
+    chunked = StreamingMetrics()
+    for part in np.array_split(equity, 7):
+        chunked.update_equity_many(part)
+    for p, r in zip(np.array_split(pnl, 9), np.array_split(returns, 9)):
+        chunked.add_trades(p, r)
+
+    peak = np.maximum.accumulate(equity)
+    downside = returns[returns < 0]
+    expected = {
+        'total_trades': 300,
+        'winning_trades': int((pnl > 0).sum()),
+        'total_return': equity[-1] / equity[0] - 1,
+        'max_drawdown': ((equity - peak) / peak).min(),
+        'sharpe_ratio': returns.mean() / returns.std(ddof=1),
+        'sortino_ratio': returns.mean() / downside.std(ddof=1),
+        'var_95': np.percentile(returns, 5),
+        'max_consecutive_losses': max_run_length(pnl < 0)
+    }
+    for metrics in (single.metrics(), chunked.metrics()):
+        for key, value in expected.items():
+            assert np.isclose(metrics[key], value, rtol=1e-9), key
+
+def test_quantile_sketch_tracks_large_streams():
+    """Past the exact buffer the P-square estimate stays close to the true quantile"""
+    rng = np.random.default_rng(0)
+    values = rng.standard_t(4, 100000)
+
+    sketch = QuantileSketch(0.05, exact_size=100)
+    sketch.update_many(values)
+
+    assert sketch.count == len(values)
+    assert abs(sketch.value() - np.percentile(values, 5)) < 0.02
+
+def test_quantile_sketch_small_buffers_at_extreme_quantiles():
+    """Small exact buffers seed strictly increasing markers, so updates never divide by zero"""
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=5000)
+    for quantile in (0.01, 0.05, 0.95, 0.99):
+        for exact_size in (5, 6, 10, 20, 30):
+            sketch = QuantileSketch(quantile, exact_size=exact_size)
+            sketch.update_many(values)
+            assert np.all(np.diff(sketch._positions) > 0)
+            assert abs(sketch.value() - np.percentile(values, quantile * 100)) < 0.5
@@ -0,0 +1,49 @@
+import sys
+import os
+import pandas as pd
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.telemetry import TaskTelemetry, stage, timed, record_load, summarize_telemetry
+
+@timed('detector')
+def _detect(n):
+    return sum(range(n))
+
+def test_stages_accumulate_and_summarize():
+    """Stage times accumulate per task and roll up into percentiles and shares"""
+    records = {}
+    for k, n in enumerate([1000, 100000, 10000]):
+        with TaskTelemetry() as telemetry:
+            record_load(pd.DataFrame({'close': range(n)}))
+            for _ in range(3):
+                _detect(n)
+            with stage('load'):
+                pass
+        records[f"S{k}_1h_backtest"] = telemetry.as_dict()
+
+    _detect(10)  # No active task: not recorded anywhere
+    assert records['S1_1h_backtest']['bars_loaded'] == 100000
+    assert records['S1_1h_backtest']['bytes_loaded'] >= 100000 * 8
+    assert set(records['S0_1h_backtest']['stages']) == {'detector', 'load'}
+
+    # Memory is the task's own growth; the process peak is reported separately
+    with TaskTelemetry() as telemetry:
+        block = b'\x01' * (64 * 1024 * 1024)
+    del block
+    assert telemetry.rss_growth_mb >= 60
+    assert telemetry.process_peak_rss_mb >= telemetry.rss_growth_mb
+    with TaskTelemetry() as telemetry:
+        pass
+    assert telemetry.rss_growth_mb < 60
+
+    report = summarize_telemetry(records)
+    assert report['tasks'] == 3
+    assert report['slowest_tasks'][0] == {'task_id': 'S1_1h_backtest',
+                                          'wall_time': records['S1_1h_backtest']['wall_time'],
+                                          'top_stage': 'detector'}
+    assert report['stages']['detector']['p50'] <= report['stages']['detector']['max']
+    assert abs(sum(s['share'] for s in report['stages'].values()) - 1.0) < 1e-9
+    assert summarize_telemetry({'S0': None}) == {'tasks': 0}
@@ -0,0 +1,59 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.backtesting.trade_ledger import TradeLedger, PatternVocabulary, ExitReason, TRADE_DTYPE, max_run_length
+
+def create_ledger() -> TradeLedger:
+    index = pd.date_range('2024-01-01', periods=10, freq='1h')
+    vocabulary = PatternVocabulary()
+    codes = [vocabulary.intern(label) for label in ['BULLISH_FLAG', 'CONFLUENCE', 'BULLISH_FLAG']]
+    return TradeLedger.from_columns(
+        index,
+        vocabulary,
+        entry_idx=np.array([0, 2, 5]),
+        exit_idx=np.array([1, 4, 9]),
+        entry_price=np.array([100.0, 101.0, 102.0]),
+        exit_price=np.array([102.0, 100.0, 102.0]),
+        side=np.array([1, 1, -1]),
+        pnl=np.array([200.0, -99.0, 0.0]),
+        exit_reason=np.array([ExitReason.TAKE_PROFIT, ExitReason.STOP_LOSS, ExitReason.END_OF_DATA]),
+        pattern_code=np.array(codes)
+    )
+
+def test_vocabulary_interns_labels():
+    """Repeated labels share a code"""
+    vocabulary = PatternVocabulary(['A', 'B'])
+    assert vocabulary.intern('A') == 0
+    assert vocabulary.intern('C') == 2
+    assert len(vocabulary) == 3
+
+def test_ledger_columns_and_frame():
+    """Columns are fixed width and the frame resolves timestamps and labels"""
+    ledger = create_ledger()
+    assert ledger.records.dtype == TRADE_DTYPE
+    assert len(ledger) == 3
+    assert ledger.nbytes == 3 * TRADE_DTYPE.itemsize
+    assert ledger.pattern_types().tolist() == ['BULLISH_FLAG', 'CONFLUENCE', 'BULLISH_FLAG']
+
+    frame = ledger.to_frame()
+    assert frame['exit_time'].iloc[1] == ledger.index[4]
+    assert frame['exit_reason'].tolist() == ['take_profit', 'stop_loss', 'end_of_data']
+
+def test_completed_excludes_open_trades():
+    """Rows still marked OPEN are excluded from completed trades"""
+    ledger = create_ledger()
+    ledger.records['exit_reason'][2] = ExitReason.OPEN
+    assert len(ledger.completed) == 2
+
+def test_max_run_length():
+    """Longest streak of losses"""
+    assert max_run_length(np.array([], dtype=bool)) == 0
+    assert max_run_length(np.array([False, False])) == 0
+    assert max_run_length(np.array([True, True, False, True, True, True, False])) == 3
+    assert max_run_length(np.array([True])) == 1
@@ -0,0 +1,85 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+from types import SimpleNamespace
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.multiprocessing.walk_forward import WalkForwardEngine, WalkForwardConfig, make_folds
+from core.multiprocessing.parallel_engine import ParallelResult
+from core.backtesting.trade_ledger import TradeLedger, PatternVocabulary, ExitReason
+
+def _oos_result(curve, entries=(), pnls=()):
+    """BacktestResult stand-in: a test-window equity curve and trades entered at ``entries`` (timestamps)"""
+    entry_idx = curve.index.get_indexer(pd.DatetimeIndex(list(entries)))
+    ledger = TradeLedger.from_columns(curve.index, PatternVocabulary(), entry_idx=entry_idx, exit_idx=entry_idx,
+                                      pnl=np.asarray(pnls, dtype=float),
+                                      exit_reason=np.full(len(entry_idx), ExitReason.TAKE_PROFIT))
+    return SimpleNamespace(equity_curve=curve, ledger=ledger, total_trades=len(entry_idx),
+                           total_return=curve.iloc[-1] / curve.iloc[0] - 1, sharpe_ratio=0.0, max_drawdown=0.0,
+                           start_date=curve.index[0], end_date=curve.index[-1])
+
+def test_rolling_and_anchored_folds():
+    """Rolling folds slide the training window, anchored folds grow it"""
+    rolling = make_folds(1000, train_bars=400, test_bars=200)
+    assert [(f.train_start, f.train_end, f.test_end) for f in rolling] == [(0, 400, 600), (200, 600, 800), (400, 800, 1000)]
+
+    anchored = make_folds(1000, train_bars=400, test_bars=250, anchored=True)
+    assert [(f.train_start, f.train_end, f.test_end) for f in anchored] == [(0, 400, 650), (0, 650, 900), (0, 900, 1000)]
+    assert [f.cost for f in anchored] == [400, 650, 900]
+
+def test_stitch_compounds_fold_equity():
+    """Each test window continues from the previous window's ending capital"""
+    engine = WalkForwardEngine(parallel_engine=None, config=WalkForwardConfig(train_bars=2, test_bars=2))
+    folds = make_folds(6, train_bars=2, test_bars=2)
+    index = pd.date_range('2024-01-01', periods=6, freq='1h')
+
+    def fold_result(fold, values):
+        curve = pd.Series(values, index=index[fold.train_end:fold.test_end])
+        oos = _oos_result(curve, [curve.index[0]], [1.0])
+        return ParallelResult(task_id=f"fold_{fold.fold_id}", success=True,
+                              result={'best_params': {}, 'in_sample_score': 0.0, 'oos_result': oos})
+
+    results = {
+        0: fold_result(folds[0], [100000.0, 110000.0]),
+        1: fold_result(folds[1], [100000.0, 90000.0])
+    }
+    stitched = engine._stitch('TEST', '1h', folds, results)
+
+    np.testing.assert_allclose(stitched.oos_equity.to_numpy(), [100000.0, 110000.0, 110000.0, 99000.0])
+    assert np.isclose(stitched.total_return, -0.01)
+    assert np.isclose(stitched.max_drawdown, -0.1)
+    assert stitched.total_trades == 2
+
+def test_overlapping_windows_match_one_continuous_run():
+    """With step_bars < test_bars, stitching reproduces a continuous run: overlap bars and trades count once"""
+    n_bars = 400
+    config = WalkForwardConfig(train_bars=100, test_bars=50, step_bars=25)
+    engine = WalkForwardEngine(parallel_engine=None, config=config)
+    folds = make_folds(n_bars, config.train_bars, config.test_bars, config.step_bars)
+    index = pd.date_range('2024-01-01', periods=n_bars, freq='1h')
+
+    rng = np.random.default_rng(7)
+    continuous = pd.Series(100000.0 * np.cumprod(1 + rng.normal(0.0005, 0.01, n_bars)), index=index)
+    trade_bars = np.arange(100, n_bars, 10)
+    trade_pnls = np.where(trade_bars % 20 == 0, 50.0, -30.0)
+
+    # Every fold replays the continuous run over its window, restarted from initial capital
+    results = {}
+    for fold in folds:
+        window = continuous.iloc[fold.train_end:fold.test_end]
+        inside = (trade_bars >= fold.train_end) & (trade_bars < fold.test_end)
+        results[fold.fold_id] = ParallelResult(task_id=f"fold_{fold.fold_id}", success=True, result={
+            'best_params': {}, 'in_sample_score': 0.0,
+            'oos_result': _oos_result(window / window.iloc[0] * 100000.0, index[trade_bars[inside]], trade_pnls[inside])
+        })
+    stitched = engine._stitch('TEST', '1h', folds, results)
+
+    expected = continuous.iloc[100:] / continuous.iloc[100] * 100000.0
+    pd.testing.assert_series_equal(stitched.oos_equity, expected, check_freq=False)
+    assert np.isclose(stitched.total_return, expected.iloc[-1] / 100000.0 - 1)
+    assert stitched.total_trades == len(trade_bars)
+    assert np.isclose(stitched.win_rate, np.mean(trade_pnls > 0))